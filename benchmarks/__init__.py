@@ -0,0 +1,2 @@
+# Mesures de performances de la recherche sur des arborescences synthétiques reproductibles.
+# Exécution depuis la racine du dépôt : python -m benchmarks.run --help
@@ -0,0 +1,66 @@
+import os
+import time
+import shutil
+import subprocess
+from contextlib import contextmanager
+
+#------------------------------------------------------------------------------------------------#
+
+def tk_available():
+    """ Indiquer si une fenêtre Tk peut être créée sur l'affichage courant. """
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+        root.withdraw()
+        root.destroy()
+        return True
+    except Exception:
+        return False
+
+#------------------------------------------------------------------------------------------------#
+
+@contextmanager
+def virtual_display(timeout=10):
+    """
+    Fournir un affichage pour Tk : l'affichage courant s'il est utilisable, sinon un serveur Xvfb
+    démarré pour la durée du bloc.
+
+    Yields:
+    str: La valeur de DISPLAY utilisée, ou None si aucun affichage n'est disponible.
+    """
+    if os.environ.get("DISPLAY") and tk_available():
+        yield os.environ["DISPLAY"]
+        return
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        yield None
+        return
+    # Premier numéro d'affichage libre à partir de :99
+    number = 99
+    while os.path.exists(f"/tmp/.X11-unix/X{number}") or os.path.exists(f"/tmp/.X{number}-lock"):
+        number += 1
+    display = f":{number}"
+    process = subprocess.Popen([xvfb, display, "-screen", "0", "1920x1080x24", "-nolisten", "tcp"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    previous = os.environ.get("DISPLAY")
+    os.environ["DISPLAY"] = display
+    try:
+        deadline = time.monotonic() + timeout
+        while not os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            if process.poll() is not None or time.monotonic() > deadline:
+                yield None
+                return
+            time.sleep(0.05)
+        yield display
+    finally:
+        if previous is None:
+            os.environ.pop("DISPLAY", None)
+        else:
+            os.environ["DISPLAY"] = previous
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+#------------------------------------------------------------------------------------------------#
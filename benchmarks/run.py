@@ -0,0 +1,394 @@
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import platform
+import resource
+import argparse
+import tempfile
+import subprocess
+from contextlib import contextmanager
+from .synthetic_tree import PRESETS, NAME_TERM, CONTENT_TERM, generate_tree
+from .headless import virtual_display
+from searching_tool.engine import ALL_EXTENSIONS, SearchEngine, SearchQuery
+from searching_tool.extractors import content_extensions, file_contains
+
+#------------------------------------------------------------------------------------------------#
+
+# Termes des recherches sur le nom (le premier est placé dans des noms par le générateur)
+NAME_QUERIES = (NAME_TERM, "budget", "facture_1", "ann", "export-2")
+
+# Extensions sans contenu indexé : les recherches sur le nom ne déclenchent pas de lecture de documents
+NAME_EXTENSIONS = tuple(ext for ext in ALL_EXTENSIONS if ext not in content_extensions())
+
+# Fonction de prévisualisation mesurée pour chaque extension
+PREVIEWS = {
+    ".png": "preview_image",
+    ".txt": "preview_text",
+    ".pdf": "preview_pdf",
+    ".docx": "preview_docx",
+    ".py": "preview_code",
+    ".csv": "preview_generic",
+}
+
+# Modules dont le temps d'import est mesuré dans un interpréteur neuf (None : l'interpréteur seul)
+STARTUP_IMPORTS = {
+    "startup.python": None,
+    "startup.engine": "searching_tool",
+    "startup.preview": "searching_tool.preview",
+}
+
+# Écart de médiane toléré avant de signaler une régression (en proportion et en millisecondes)
+DEFAULT_TOLERANCE = 0.2
+NOISE_FLOOR_MS = 1.0
+
+#------------------------------------------------------------------------------------------------#
+
+def percentile(values, q):
+    """ Calculer le centile q (entre 0 et 100) d'une liste de valeurs, par interpolation linéaire. """
+    values = sorted(values)
+    if not values:
+        return None
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+#------------------------------------------------------------------------------------------------#
+
+def reset_peak_rss():
+    """ Remettre à zéro le pic de mémoire résidente du processus (Linux, sinon sans effet). """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+#------------------------------------------------------------------------------------------------#
+
+def peak_rss_kb():
+    """ Obtenir le pic de mémoire résidente (Ko) depuis la dernière remise à zéro. """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+#------------------------------------------------------------------------------------------------#
+
+@contextmanager
+def timer(samples):
+    """ Mesurer la durée du bloc et l'ajouter (en secondes) à la liste samples. """
+    start = time.perf_counter()
+    yield
+    samples.append(time.perf_counter() - start)
+
+#------------------------------------------------------------------------------------------------#
+
+def summarize(samples, items_per_run=None, peak=None):
+    """ Résumer une série de mesures : p50, p95, moyenne (ms), débit (fichiers/s) et pic mémoire. """
+    mean = sum(samples) / len(samples)
+    summary = {
+        "runs": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "mean_ms": round(mean * 1000, 3),
+    }
+    if items_per_run is not None and mean > 0:
+        summary["files_per_sec"] = round(items_per_run / mean, 1)
+    if peak is not None:
+        summary["peak_rss_kb"] = peak
+    return summary
+
+#------------------------------------------------------------------------------------------------#
+
+def consume(results):
+    """ Parcourir tous les résultats d'une recherche et retourner leur nombre. """
+    return sum(1 for _ in results)
+
+#------------------------------------------------------------------------------------------------#
+
+def bench_list_all(tree, index_dir, repeat, cold_repeat, workers):
+    """ Lister toutes les entrées : à froid (construction de l'index comprise) puis à chaud. """
+    results = {}
+    samples = []
+    reset_peak_rss()
+    for _ in range(cold_repeat):
+        shutil.rmtree(index_dir, ignore_errors=True)
+        engine = SearchEngine(tree, index_dir=index_dir, max_workers=workers)
+        with timer(samples):
+            count = consume(engine.search(SearchQuery("", "fichier", ALL_EXTENSIONS, None)))
+        engine.close()
+    results["list_all.cold"] = summarize(samples, count, peak_rss_kb())
+
+    samples = []
+    reset_peak_rss()
+    engine = SearchEngine(tree, index_dir=index_dir, max_workers=workers)
+    for _ in range(repeat):
+        with timer(samples):
+            consume(engine.search(SearchQuery("", "fichier", ALL_EXTENSIONS, None)))
+    engine.close()
+    results["list_all.warm"] = summarize(samples, count, peak_rss_kb())
+    return results
+
+#------------------------------------------------------------------------------------------------#
+
+def bench_search_names(tree, index_dir, repeat, cold_repeat, workers, entries):
+    """ Rechercher sur le nom : à froid (index SQLite seul) puis à chaud (index de trigrammes en mémoire). """
+    results = {}
+    samples = []
+    reset_peak_rss()
+    for i in range(cold_repeat):
+        engine = SearchEngine(tree, index_dir=index_dir, max_workers=workers)
+        query = SearchQuery(NAME_QUERIES[i % len(NAME_QUERIES)], "fichier", NAME_EXTENSIONS)
+        with timer(samples):
+            consume(engine.search(query))
+        engine.close()
+    results["search_names.cold"] = summarize(samples, entries, peak_rss_kb())
+
+    reset_peak_rss()
+    engine = SearchEngine(tree, index_dir=index_dir, max_workers=workers)
+    load = []
+    with timer(load):
+        engine.get_name_index()
+        engine.name_index_thread.join()
+    results["name_index.load"] = summarize(load, entries, peak_rss_kb())
+
+    samples = []
+    reset_peak_rss()
+    for i in range(repeat):
+        # Sans la mémoire de la recherche précédente, chaque recherche est complète
+        engine.refinement_cache.clear()
+        query = SearchQuery(NAME_QUERIES[i % len(NAME_QUERIES)], "fichier", NAME_EXTENSIONS)
+        with timer(samples):
+            consume(engine.search(query))
+    engine.close()
+    results["search_names.warm"] = summarize(samples, entries, peak_rss_kb())
+    return results
+
+#------------------------------------------------------------------------------------------------#
+
+def bench_search_content(tree, index_dir, repeat, cold_repeat, workers, documents):
+    """ Rechercher dans le contenu : à froid (extraction de tous les documents) puis à chaud (index du contenu). """
+    results = {}
+    query = SearchQuery(CONTENT_TERM, "fichier", content_extensions(), None)
+    samples = []
+    reset_peak_rss()
+    for _ in range(cold_repeat):
+        engine = SearchEngine(tree, index_dir=index_dir, max_workers=workers)
+        if os.path.exists(engine.content_index.index_path):
+            os.remove(engine.content_index.index_path)
+        with timer(samples):
+            matches = consume(engine.search(query))
+        engine.close()
+    results["search_content.cold"] = summarize(samples, documents, peak_rss_kb())
+    results["search_content.cold"]["matches"] = matches
+
+    samples = []
+    reset_peak_rss()
+    engine = SearchEngine(tree, index_dir=index_dir, max_workers=workers)
+    for _ in range(repeat):
+        engine.refinement_cache.clear()
+        with timer(samples):
+            consume(engine.search(query))
+    engine.close()
+    results["search_content.warm"] = summarize(samples, documents, peak_rss_kb())
+    return results
+
+#------------------------------------------------------------------------------------------------#
+
+def sample_files(tree, extension, count, seed):
+    """ Choisir de façon reproductible des fichiers d'une extension donnée dans l'arborescence. """
+    paths = sorted(os.path.join(root, name) for root, _, files in os.walk(tree) for name in files if name.endswith(extension))
+    return random.Random(seed).sample(paths, min(count, len(paths)))
+
+#------------------------------------------------------------------------------------------------#
+
+def bench_file_contains(tree, samples_count, seed):
+    """ Lire directement des fichiers texte à la recherche du terme (recherche sans index du contenu). """
+    samples = []
+    reset_peak_rss()
+    for path in sample_files(tree, ".txt", samples_count, seed):
+        with timer(samples):
+            file_contains(path, CONTENT_TERM)
+    if not samples:
+        return {}
+    return {"file_contains": summarize(samples, 1, peak_rss_kb())}
+
+#------------------------------------------------------------------------------------------------#
+
+def bench_previews(tree, samples_count, seed):
+    """ Mesurer le temps d'ouverture des prévisualisations, sur un affichage virtuel si nécessaire. """
+    with virtual_display() as display:
+        if display is None:
+            return {"preview": {"skipped": "aucun affichage disponible (installer Xvfb)"}}
+        import tkinter as tk
+        from searching_tool import preview
+        root = tk.Tk()
+        root.withdraw()
+        results = {}
+        try:
+            for extension, function_name in PREVIEWS.items():
+                function = getattr(preview, function_name)
+                samples = []
+                errors = 0
+                reset_peak_rss()
+                for path in sample_files(tree, extension, samples_count, seed):
+                    try:
+                        with timer(samples):
+                            function(root, path)
+                            # La prévisualisation n'est visible qu'une fois les tâches d'affichage traitées
+                            root.update()
+                    except Exception as e:
+                        errors += 1
+                        print(f"Erreur lors de la prévisualisation de {path}: {e}", file=sys.stderr)
+                    for window in root.winfo_children():
+                        window.destroy()
+                if samples:
+                    results[f"preview{extension}"] = summarize(samples, 1, peak_rss_kb())
+                    results[f"preview{extension}"]["errors"] = errors
+        finally:
+            root.destroy()
+        return results
+
+#------------------------------------------------------------------------------------------------#
+
+def bench_startup(repeat):
+    """ Mesurer le démarrage : import des modules dans un interpréteur neuf (dossier du dépôt comme répertoire courant). """
+    repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+    for name, module in STARTUP_IMPORTS.items():
+        command = [sys.executable, "-c", f"import {module}" if module else "pass"]
+        samples = []
+        try:
+            for _ in range(repeat):
+                with timer(samples):
+                    subprocess.run(command, cwd=repository, check=True, capture_output=True)
+        except subprocess.CalledProcessError as e:
+            results[name] = {"skipped": e.stderr.decode("utf-8", errors="replace").strip().splitlines()[-1]}
+            continue
+        results[name] = summarize(samples)
+    return results
+
+#------------------------------------------------------------------------------------------------#
+
+def git_revision():
+    """ Obtenir la révision git du dépôt, ou None. """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+#------------------------------------------------------------------------------------------------#
+
+def compare(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Comparer les médianes d'un rapport à celles d'une référence.
+
+    Returns:
+    list: Les noms des mesures en régression (médiane plus lente de plus de tolerance).
+    """
+    regressions = []
+    print(f"{'mesure':<24}{'référence (ms)':>16}{'actuel (ms)':>14}{'ratio':>8}")
+    for name, current in report["results"].items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or "p50_ms" not in current or "p50_ms" not in previous:
+            continue
+        ratio = current["p50_ms"] / previous["p50_ms"] if previous["p50_ms"] else float("inf")
+        regression = ratio > 1 + tolerance and current["p50_ms"] - previous["p50_ms"] > NOISE_FLOOR_MS
+        if regression:
+            regressions.append(name)
+        flag = "  RÉGRESSION" if regression else ""
+        print(f"{name:<24}{previous['p50_ms']:>16.3f}{current['p50_ms']:>14.3f}{ratio:>8.2f}{flag}")
+    if baseline.get("tree") != report.get("tree"):
+        print("Attention : l'arborescence de référence est différente, la comparaison est indicative.")
+    return regressions
+
+#------------------------------------------------------------------------------------------------#
+
+def parse_args(argv=None):
+    """ Lire les arguments de la ligne de commande. """
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run", description="Mesurer les performances de la recherche sur une arborescence synthétique.")
+    parser.add_argument("--size", choices=sorted(PRESETS), default="small", help="La taille prédéfinie de l'arborescence.")
+    parser.add_argument("--depth", type=int, help="La profondeur de l'arborescence.")
+    parser.add_argument("--fanout", type=int, help="Le nombre de sous-dossiers par dossier.")
+    parser.add_argument("--files-per-dir", type=int, help="Le nombre de fichiers par dossier.")
+    parser.add_argument("--seed", type=int, help="La graine du générateur.")
+    parser.add_argument("--repeat", type=int, default=20, help="Le nombre de mesures à chaud.")
+    parser.add_argument("--cold-repeat", type=int, default=3, help="Le nombre de mesures à froid.")
+    parser.add_argument("--samples", type=int, default=20, help="Le nombre de fichiers lus ou prévisualisés par type.")
+    parser.add_argument("--workers", type=int, default=None, help="Le nombre de processus d'extraction.")
+    parser.add_argument("--no-preview", action="store_true", help="Ne pas mesurer les prévisualisations.")
+    parser.add_argument("--workdir", help="Le dossier de travail (par défaut : un dossier temporaire supprimé à la fin).")
+    parser.add_argument("-o", "--output", default="benchmark.json", help="Le fichier JSON du rapport.")
+    parser.add_argument("--compare", help="Un rapport de référence auquel comparer les résultats.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="L'écart de médiane toléré (0.2 : 20 %%).")
+    return parser.parse_args(argv)
+
+#------------------------------------------------------------------------------------------------#
+
+def main(argv=None):
+    """ Générer l'arborescence, exécuter les mesures, écrire le rapport et le comparer à la référence. """
+    args = parse_args(argv)
+    spec = PRESETS[args.size]
+    spec = spec._replace(**{field: getattr(args, field) for field in ("depth", "fanout", "files_per_dir", "seed") if getattr(args, field) is not None})
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="smart-file-search-bench-")
+    tree = os.path.join(workdir, "tree")
+    index_dir = os.path.join(workdir, "index")
+    try:
+        shutil.rmtree(tree, ignore_errors=True)
+        start = time.perf_counter()
+        tree_stats = generate_tree(tree, spec)
+        print(f"Arborescence générée : {tree_stats['files']} fichiers, {tree_stats['directories']} dossiers ({time.perf_counter() - start:.1f} s)", file=sys.stderr)
+        documents = sum(tree_stats["by_extension"].get(ext, 0) for ext in content_extensions())
+
+        results = bench_startup(min(args.repeat, 10))
+        results.update(bench_list_all(tree, index_dir, args.repeat, args.cold_repeat, args.workers))
+        results.update(bench_search_names(tree, index_dir, args.repeat, args.cold_repeat, args.workers, tree_stats["files"]))
+        results.update(bench_search_content(tree, index_dir, args.repeat, args.cold_repeat, args.workers, documents))
+        results.update(bench_file_contains(tree, args.samples, spec.seed))
+        if not args.no_preview:
+            results.update(bench_previews(tree, args.samples, spec.seed))
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            # Pic mémoire des processus d'extraction (le plus gros d'entre eux)
+            "children_peak_rss_kb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+        },
+        "spec": spec._asdict(),
+        "tree": tree_stats,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"Rapport écrit dans {args.output}", file=sys.stderr)
+
+    for name, summary in results.items():
+        print(f"{name:<24} {json.dumps(summary, ensure_ascii=False)}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.tolerance):
+            return 1
+    return 0
+
+#------------------------------------------------------------------------------------------------#
+
+if __name__ == "__main__":
+    sys.exit(main())
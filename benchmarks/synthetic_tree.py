@@ -0,0 +1,207 @@
+import os
+import io
+import zlib
+import struct
+import random
+import zipfile
+from collections import namedtuple
+
+#------------------------------------------------------------------------------------------------#
+
+# Description d'une arborescence synthétique : profondeur, nombre de sous-dossiers par dossier,
+# nombre de fichiers par dossier, proportions des extensions et graine du générateur pseudo-aléatoire
+TreeSpec = namedtuple("TreeSpec", ["depth", "fanout", "files_per_dir", "mix", "seed"])
+
+# Proportions par défaut des types de fichiers
+DEFAULT_MIX = {
+    ".txt": 25,
+    ".pdf": 5,
+    ".docx": 5,
+    ".png": 8,
+    ".jpg": 7,
+    ".py": 20,
+    ".js": 10,
+    ".csv": 10,
+    ".mp4": 2,
+    ".bin": 8,
+}
+
+# Tailles prédéfinies (nombre de fichiers approximatif : 1 700, 23 000, 370 000)
+PRESETS = {
+    "small": TreeSpec(depth=3, fanout=4, files_per_dir=20, mix=DEFAULT_MIX, seed=1),
+    "medium": TreeSpec(depth=4, fanout=5, files_per_dir=30, mix=DEFAULT_MIX, seed=1),
+    "large": TreeSpec(depth=5, fanout=6, files_per_dir=40, mix=DEFAULT_MIX, seed=1),
+}
+
+# Terme placé dans certains noms de fichiers et dans le contenu de certains documents
+NAME_TERM = "rapport"
+CONTENT_TERM = "aiguille"
+
+# Proportion des documents dont le contenu contient CONTENT_TERM
+CONTENT_TERM_RATIO = 0.02
+
+# Date de référence des dates de modification (fixe pour que le classement soit reproductible)
+BASE_MTIME = 1700000000
+
+VOCABULARY = (
+    "projet budget facture réunion compte rendu analyse données client contrat annexe planning "
+    "note version brouillon final export archive photo vacances équipe mesure test résultat "
+    "serveur module fonction classe interface tableau graphique synthèse bilan stratégie"
+).split()
+
+#------------------------------------------------------------------------------------------------#
+
+def words(rng, count):
+    """ Tirer une suite de mots du vocabulaire. """
+    return [rng.choice(VOCABULARY) for _ in range(count)]
+
+#------------------------------------------------------------------------------------------------#
+
+def text_content(rng, paragraphs, with_term):
+    """ Générer un texte de quelques paragraphes, contenant éventuellement CONTENT_TERM. """
+    lines = [" ".join(words(rng, rng.randint(8, 20))) for _ in range(paragraphs)]
+    if with_term:
+        line = rng.randrange(len(lines))
+        lines[line] += " " + CONTENT_TERM
+    return lines
+
+#------------------------------------------------------------------------------------------------#
+
+def make_pdf(lines):
+    """ Construire un PDF minimal d'une page contenant les lignes données (sans dépendance). """
+    def escape(text):
+        return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    content = "BT /F1 10 Tf 14 TL 40 800 Td " + " ".join(f"({escape(line)}) ' " for line in lines) + "ET"
+    stream = content.encode("latin-1", errors="replace")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+#------------------------------------------------------------------------------------------------#
+
+def make_docx(lines):
+    """ Construire un document Word minimal contenant un paragraphe par ligne (sans dépendance). """
+    def escape(text):
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    body = "".join(f"<w:p><w:r><w:t>{escape(line)}</w:t></w:r></w:p>" for line in lines)
+    document = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                f'<w:body>{body}</w:body></w:document>')
+    content_types = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                     '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+                     '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+                     '<Default Extension="xml" ContentType="application/xml"/>'
+                     '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+                     '</Types>')
+    rels = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+            '</Relationships>')
+    out = io.BytesIO()
+    # Date fixe pour que les fichiers générés soient identiques d'une exécution à l'autre
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in (("[Content_Types].xml", content_types), ("_rels/.rels", rels), ("word/document.xml", document)):
+            archive.writestr(zipfile.ZipInfo(name, date_time=(2024, 1, 1, 0, 0, 0)), data)
+    return out.getvalue()
+
+#------------------------------------------------------------------------------------------------#
+
+def make_png(rng, width=64, height=64):
+    """ Construire une image PNG (dégradé en niveaux de gris) sans dépendance. """
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+    shift = rng.randrange(256)
+    raw = b"".join(b"\x00" + bytes((x * 4 + y + shift) % 256 for x in range(width)) for y in range(height))
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+#------------------------------------------------------------------------------------------------#
+
+def file_content(rng, extension):
+    """ Générer le contenu d'un fichier selon son extension. Retourne (octets, contient CONTENT_TERM). """
+    with_term = rng.random() < CONTENT_TERM_RATIO
+    if extension == ".txt":
+        return "\n".join(text_content(rng, rng.randint(5, 60), with_term)).encode("utf-8"), with_term
+    if extension == ".pdf":
+        return make_pdf(text_content(rng, rng.randint(5, 40), with_term)), with_term
+    if extension == ".docx":
+        return make_docx(text_content(rng, rng.randint(5, 40), with_term)), with_term
+    if extension == ".png":
+        return make_png(rng), False
+    if extension == ".py":
+        lines = [f"def {rng.choice(VOCABULARY)}_{i}(x):\n    return x + {i}\n" for i in range(rng.randint(3, 30))]
+        return "\n".join(lines).encode("utf-8"), False
+    if extension == ".csv":
+        rows = [",".join(str(rng.randint(0, 9999)) for _ in range(6)) for _ in range(rng.randint(10, 200))]
+        return "\n".join(rows).encode("utf-8"), False
+    # Images JPEG, vidéos, binaires... : seul le nom et la taille comptent
+    return rng.randbytes(rng.randint(256, 4096)), False
+
+#------------------------------------------------------------------------------------------------#
+
+def file_name(rng, index, extension):
+    """ Générer un nom de fichier ; environ un sur vingt contient NAME_TERM. """
+    parts = words(rng, rng.randint(1, 3))
+    if rng.random() < 0.05:
+        parts.insert(rng.randrange(len(parts) + 1), NAME_TERM)
+    separator = rng.choice(("_", "-", " "))
+    return separator.join(parts) + f"{separator}{index}{extension}"
+
+#------------------------------------------------------------------------------------------------#
+
+def generate_tree(root, spec):
+    """
+    Générer une arborescence synthétique déterministe : la même TreeSpec produit toujours les mêmes
+    noms, contenus et dates de modification.
+
+    Parameters:
+    root (str): Le dossier racine à créer (il ne doit pas contenir une autre arborescence).
+    spec (TreeSpec): La description de l'arborescence.
+
+    Returns:
+    dict: Les statistiques de l'arborescence (dossiers, fichiers, octets, fichiers par extension,
+          documents contenant CONTENT_TERM).
+    """
+    rng = random.Random(spec.seed)
+    extensions = sorted(spec.mix)
+    weights = [spec.mix[ext] for ext in extensions]
+    stats = {"directories": 0, "files": 0, "bytes": 0, "by_extension": {}, "content_term_files": 0}
+    stack = [(root, 0)]
+    while stack:
+        directory, depth = stack.pop()
+        os.makedirs(directory, exist_ok=True)
+        stats["directories"] += 1
+        for index in range(spec.files_per_dir):
+            extension = rng.choices(extensions, weights)[0]
+            path = os.path.join(directory, file_name(rng, index, extension))
+            data, with_term = file_content(rng, extension)
+            with open(path, "wb") as f:
+                f.write(data)
+            mtime = BASE_MTIME - rng.randrange(365 * 24 * 3600)
+            os.utime(path, (mtime, mtime))
+            stats["files"] += 1
+            stats["bytes"] += len(data)
+            stats["by_extension"][extension] = stats["by_extension"].get(extension, 0) + 1
+            stats["content_term_files"] += with_term
+        if depth < spec.depth:
+            for index in reversed(range(spec.fanout)):
+                stack.append((os.path.join(directory, f"{rng.choice(VOCABULARY)}_{depth}_{index}"), depth + 1))
+    return stats
+
+#------------------------------------------------------------------------------------------------#
@@ -1,14 +1,28 @@
 # __init__.py
 
 # Si vous voulez rendre les classes et les fonctions accessibles directement depuis le package, vous pouvez les importer ici.
-from .file_search_app import FileSearchApp
+from .engine import SearchEngine, SearchQuery, SearchResult, SearchResults
+from .multi_root import MultiRootEngine, MultiRootResults
 from .helpers import resource_path
-from .preview import (
-    preview_image,
-    preview_text,
-    preview_pdf,
-    preview_docx,
-    preview_code,
-    preview_video,
-    preview_generic,
-)
+from .backends import available_backends
+
+# L'interface graphique (Tkinter, customtkinter, PIL...) n'est importée qu'à la première utilisation :
+# le moteur et la ligne de commande restent utilisables sans affichage ni dépendances graphiques.
+_LAZY_ATTRIBUTES = {
+    "FileSearchApp": ".file_search_app",
+    "preview_image": ".preview",
+    "preview_text": ".preview",
+    "preview_pdf": ".preview",
+    "preview_docx": ".preview",
+    "preview_code": ".preview",
+    "preview_video": ".preview",
+    "preview_generic": ".preview",
+}
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        import importlib
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,69 @@
+import importlib
+import importlib.util
+import threading
+
+#------------------------------------------------------------------------------------------------#
+
+# Modules optionnels (extraction du texte et prévisualisation) et paquet pip qui les fournit.
+# Ils ne sont importés qu'à leur première utilisation : le démarrage n'en paie pas le coût.
+BACKENDS = {
+    "fitz": "PyMuPDF",
+    "docx": "python-docx",
+    "cv2": "opencv-python",
+    "PIL.Image": "pillow",
+    "PIL.ImageTk": "pillow",
+}
+
+_loaded = {}
+_lock = threading.Lock()
+
+#------------------------------------------------------------------------------------------------#
+
+class BackendUnavailable(ImportError):
+    """ Un module optionnel nécessaire n'est pas installé. """
+
+#------------------------------------------------------------------------------------------------#
+
+def load_backend(name):
+    """
+    Importer un module optionnel à sa première utilisation.
+
+    Parameters:
+    name (str): Le nom du module (clé de BACKENDS).
+
+    Returns:
+    module: Le module importé.
+
+    Raises:
+    BackendUnavailable: Si le module n'est pas installé.
+    """
+    module = _loaded.get(name)
+    if module is not None:
+        return module
+    with _lock:
+        if name not in _loaded:
+            try:
+                _loaded[name] = importlib.import_module(name)
+            except ImportError as e:
+                raise BackendUnavailable(f"{name} indisponible (installer le paquet {BACKENDS.get(name, name)}): {e}") from e
+        return _loaded[name]
+
+#------------------------------------------------------------------------------------------------#
+
+def backend_available(name):
+    """ Indiquer si un module optionnel est installé, sans l'importer. """
+    if name in _loaded:
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        # Le paquet parent (PIL pour PIL.Image) est absent
+        return False
+
+#------------------------------------------------------------------------------------------------#
+
+def available_backends():
+    """ Obtenir la disponibilité de chaque module optionnel : {nom: (paquet, disponible)}. """
+    return {name: (package, backend_available(name)) for name, package in BACKENDS.items()}
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,89 @@
+import os
+import sys
+import json
+import time
+import argparse
+from .index import INDEX_DIR
+from .backends import available_backends
+from .walker import default_excludes
+from .engine import FILE_TYPES, ALL_EXTENSIONS, RESULT_PAGE_SIZE, SearchQuery
+from .multi_root import ROOT_TIMEOUT, MultiRootEngine
+from .metrics import METRICS, write_log
+from .query_language import QuerySyntaxError, parse_query
+
+#------------------------------------------------------------------------------------------------#
+
+def parse_args(argv=None):
+    """ Lire les arguments de la ligne de commande. """
+    parser = argparse.ArgumentParser(prog="python -m searching_tool", description="Rechercher des fichiers et des dossiers sans interface graphique (une ligne JSON par résultat).")
+    parser.add_argument("search_terms", nargs="*", help="Le terme recherché, avec d'éventuels filtres : ext:pdf size>50MB modified<7d path:Projets type:dir, glob (*.log) ou re:motif (vide : lister toutes les entrées).")
+    parser.add_argument("-d", "--directory", dest="directories", action="append", help="Un répertoire de recherche (option répétable : recherche simultanée ; par défaut : le répertoire courant).")
+    parser.add_argument("--root-timeout", type=float, default=ROOT_TIMEOUT, help="Le délai (s) sans nouveau résultat d'un répertoire au-delà duquel sa recherche est abandonnée (résultats partiels).")
+    parser.add_argument("-t", "--type", dest="search_type", choices=("fichier", "dossier"), default="fichier", help="Le type d'entrée recherché.")
+    parser.add_argument("-f", "--file-type", choices=sorted(FILE_TYPES), help="Le type de fichier (par défaut : tous).")
+    parser.add_argument("-e", "--ext", dest="extensions", action="append", help="Une extension à rechercher (option répétable, remplace --file-type).")
+    parser.add_argument("-n", "--limit", type=int, default=RESULT_PAGE_SIZE, help="Le nombre maximal de résultats classés (0 : sans limite).")
+    parser.add_argument("--index-dir", default=str(INDEX_DIR), help="Le dossier des index.")
+    parser.add_argument("-x", "--exclude", dest="excludes", action="append", default=[], help="Un motif d'exclusion, syntaxe .gitignore (option répétable).")
+    parser.add_argument("--no-default-excludes", action="store_true", help="Ne pas exclure les dossiers exclus par défaut (.git, node_modules, environnements virtuels, caches...).")
+    parser.add_argument("--max-depth", type=int, help="La profondeur maximale des entrées (1 : contenu direct du répertoire).")
+    parser.add_argument("--one-file-system", action="store_true", help="Ne pas descendre dans les dossiers d'un autre système de fichiers.")
+    parser.add_argument("--no-refresh", action="store_true", help="Ne pas relire les dossiers modifiés avant la recherche.")
+    parser.add_argument("--metrics", metavar="FICHIER", help="Ajouter au fichier une ligne JSON des mesures de la recherche (durées par étape, histogrammes, dossiers et fichiers les plus lents).")
+    parser.add_argument("--backends", action="store_true", help="Afficher les modules optionnels (extraction, prévisualisation) installés, puis quitter.")
+    return parser.parse_args(argv)
+
+#------------------------------------------------------------------------------------------------#
+
+def main(argv=None):
+    """ Exécuter une recherche et écrire ses résultats sur la sortie standard, en lignes JSON. """
+    args = parse_args(argv)
+    if args.max_depth is not None and args.max_depth < 1:
+        print("--max-depth doit être supérieur ou égal à 1", file=sys.stderr)
+        return 2
+    if args.backends:
+        for name, (package, available) in available_backends().items():
+            sys.stdout.write(json.dumps({"backend": name, "package": package, "available": available}) + "\n")
+        return 0
+    search_term = " ".join(args.search_terms)
+    try:
+        parse_query(search_term)
+    except QuerySyntaxError as e:
+        print(f"Requête invalide : {e}", file=sys.stderr)
+        return 2
+    if args.extensions:
+        extensions = tuple(ext if ext.startswith(".") else "." + ext for ext in args.extensions)
+    elif args.file_type:
+        extensions = tuple(FILE_TYPES[args.file_type])
+    else:
+        extensions = ALL_EXTENSIONS
+
+    excludes = tuple(args.excludes) if args.no_default_excludes else default_excludes() + tuple(args.excludes)
+    engine = MultiRootEngine(args.directories or [os.getcwd()], index_dir=args.index_dir, root_timeout=args.root_timeout,
+                             excludes=excludes, max_depth=args.max_depth, one_file_system=args.one_file_system)
+    start = time.perf_counter()
+    try:
+        if not args.no_refresh:
+            engine.ensure_index(refresh=True)
+        query = SearchQuery(search_term, args.search_type, extensions, args.limit or None)
+        results = engine.search(query)
+        for result in results:
+            record = {"name": result.name, "path": result.path, "mtime": result.mtime, "score": result.score}
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+        for root, reason in getattr(results, "failures", {}).items():
+            print(f"{root} : {reason}", file=sys.stderr)
+        print(f"{results.total} correspondance(s)", file=sys.stderr)
+        if args.metrics:
+            write_log("search", args.metrics, roots=engine.search_directories, query=query._asdict(), total=results.total,
+                      duration_ms=round((time.perf_counter() - start) * 1000, 3), **METRICS.export())
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # Sortie fermée par le lecteur (head, grep -m...) : rien de plus à écrire
+        sys.stderr.close()
+    finally:
+        engine.close()
+    return 0
+
+#------------------------------------------------------------------------------------------------#
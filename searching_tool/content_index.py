@@ -0,0 +1,224 @@
+import os
+import re
+import sqlite3
+import threading
+from contextlib import closing
+from .index import INDEX_DIR, index_path_for
+from .extractors import EXTRACTION_WORKERS, EXTRACTION_TIMEOUT, extract_text, extract_many
+
+#------------------------------------------------------------------------------------------------#
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tokens (
+    id INTEGER PRIMARY KEY,
+    token TEXT UNIQUE NOT NULL
+);
+CREATE TABLE IF NOT EXISTS postings (
+    token_id INTEGER NOT NULL,
+    doc_id INTEGER NOT NULL,
+    PRIMARY KEY (token_id, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings (doc_id);
+"""
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+# Les mots plus longs (données encodées, hachages...) ne sont pas indexés
+MAX_TOKEN_LENGTH = 64
+
+# Les fichiers texte plus gros ne sont pas indexés mais parcourus en flux à chaque recherche
+MAX_INDEXED_TEXT_SIZE = 32 * 1024 * 1024
+
+# Nombre de documents indexés entre deux validations de la transaction
+COMMIT_EVERY = 50
+
+# Nombre maximal de paramètres par requête SQLite
+SQL_CHUNK = 500
+
+#------------------------------------------------------------------------------------------------#
+
+def tokenize(text):
+    """ Découper un texte en l'ensemble de ses mots en minuscules. """
+    return {token for token in TOKEN_PATTERN.findall(text.lower()) if len(token) <= MAX_TOKEN_LENGTH}
+
+#------------------------------------------------------------------------------------------------#
+
+def extract_tokens(path):
+    """ Extraire les mots d'un document (exécuté dans un processus d'extraction). """
+    return tokenize(extract_text(path) or "")
+
+#------------------------------------------------------------------------------------------------#
+
+def chunks(items, size=SQL_CHUNK):
+    """ Découper une liste en tranches de taille bornée. """
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+#------------------------------------------------------------------------------------------------#
+
+class ContentIndex:
+    """ Index inversé (mot -> documents) du contenu des fichiers .txt, .pdf et .docx.
+
+    Chaque document est identifié par son chemin, sa taille et sa date de modification : un document
+    inchangé n'est jamais extrait deux fois. L'index ne connaît que les mots, sans leur position : il
+    réduit une recherche aux documents candidats, dont le contenu est ensuite vérifié.
+
+    Attributes:
+    - search_directory (str): Le répertoire racine dont le contenu est indexé.
+    - index_path (str): Le chemin du fichier SQLite de l'index.
+    - max_workers (int): Le nombre de processus d'extraction (None : un par cœur).
+    - timeout (float): Le délai maximal d'extraction d'un document, en secondes.
+
+    Methods:
+    - update(paths, cancel_event): Indexer les documents nouveaux ou modifiés parmi les chemins donnés.
+    - is_indexable(path, size): Indiquer si un document doit être indexé.
+    - search(search_term): Retourner les chemins des documents pouvant contenir le terme de recherche.
+    """
+
+    def __init__(self, search_directory, index_dir=INDEX_DIR, max_workers=EXTRACTION_WORKERS, timeout=EXTRACTION_TIMEOUT):
+        self.search_directory = os.path.abspath(search_directory)
+        self.index_path = index_path_for(self.search_directory, index_dir, suffix=".content.sqlite3")
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.lock = threading.Lock()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def connect(self):
+        """ Ouvrir une connexion SQLite vers l'index (créé si nécessaire). """
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        conn = sqlite3.connect(self.index_path, timeout=30)
+        conn.executescript(SCHEMA)
+        return closing(conn)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def update(self, paths, cancel_event=None):
+        """ Indexer les documents nouveaux ou modifiés parmi les chemins donnés.
+
+        Parameters:
+        paths (list): Les chemins des documents candidats.
+        cancel_event (threading.Event): Permet d'interrompre l'indexation (le travail déjà fait est conservé).
+
+        Returns:
+        list: Les chemins des documents trop volumineux pour être indexés, à parcourir directement.
+        """
+        with self.lock, self.connect() as conn:
+            stale = {}
+            unindexed = []
+            for path, size, mtime_ns in self.stale_documents(conn, paths):
+                if self.is_indexable(path, size):
+                    stale[path] = (size, mtime_ns)
+                else:
+                    unindexed.append(path)
+            if not stale:
+                return unindexed
+            extracted = 0
+            results = extract_many(stale, task=extract_tokens, max_workers=self.max_workers, timeout=self.timeout, cancel_event=cancel_event)
+            for path, tokens, error in results:
+                if error is not None:
+                    # Le document est enregistré sans mots pour ne pas être retenté tant qu'il n'a pas changé
+                    print(f"Erreur lors de la lecture de {path}: {str(error).encode('utf-8', errors='ignore')}")
+                    tokens = set()
+                size, mtime_ns = stale[path]
+                self.store_document(conn, path, size, mtime_ns, tokens)
+                extracted += 1
+                if extracted % COMMIT_EVERY == 0:
+                    conn.commit()
+            conn.commit()
+        return unindexed
+
+    #------------------------------------------------------------------------------------------------#
+
+    @staticmethod
+    def is_indexable(path, size):
+        """ Indiquer si un document doit être indexé (les très gros fichiers texte sont parcourus en flux). """
+        return size <= MAX_INDEXED_TEXT_SIZE or not path.lower().endswith('.txt')
+
+    #------------------------------------------------------------------------------------------------#
+
+    def stale_documents(self, conn, paths):
+        """ Retourner les (chemin, taille, mtime) des documents absents de l'index ou modifiés. """
+        known = {}
+        for chunk in chunks(list(paths)):
+            placeholders = ", ".join("?" for _ in chunk)
+            for path, size, mtime_ns in conn.execute(f"SELECT path, size, mtime_ns FROM documents WHERE path IN ({placeholders})", chunk):
+                known[path] = (size, mtime_ns)
+        stale = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if known.get(path) != (st.st_size, st.st_mtime_ns):
+                stale.append((path, st.st_size, st.st_mtime_ns))
+        return stale
+
+    #------------------------------------------------------------------------------------------------#
+
+    def store_document(self, conn, path, size, mtime_ns, tokens):
+        """ Enregistrer (ou remplacer) un document et ses mots dans l'index. """
+        row = conn.execute("SELECT id FROM documents WHERE path = ?", (path,)).fetchone()
+        if row is None:
+            doc_id = conn.execute("INSERT INTO documents (path, size, mtime_ns) VALUES (?, ?, ?)", (path, size, mtime_ns)).lastrowid
+        else:
+            doc_id = row[0]
+            conn.execute("UPDATE documents SET size = ?, mtime_ns = ? WHERE id = ?", (size, mtime_ns, doc_id))
+            conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        tokens = list(tokens)
+        conn.executemany("INSERT OR IGNORE INTO tokens (token) VALUES (?)", ((token,) for token in tokens))
+        for chunk in chunks(tokens):
+            placeholders = ", ".join("?" for _ in chunk)
+            conn.execute(f"INSERT OR IGNORE INTO postings (token_id, doc_id) SELECT id, ? FROM tokens WHERE token IN ({placeholders})", [doc_id] + chunk)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def search(self, search_term):
+        """ Retourner l'ensemble des chemins des documents pouvant contenir le terme de recherche.
+
+        Un terme d'un seul mot correspond à tout mot qui le contient. Pour plusieurs mots, le premier
+        doit terminer un mot du document, le dernier en commencer un et ceux du milieu y figurer tels quels.
+        L'ordre des mots, leur voisinage et la ponctuation qui les sépare ne sont pas vérifiés : les
+        documents retournés sont des candidats, à confirmer par la lecture de leur contenu.
+
+        Returns:
+        set: Les chemins des documents candidats, ou None si le terme ne contient aucun mot (l'index ne permet pas de réduire la recherche).
+        """
+        words = TOKEN_PATTERN.findall(search_term.lower())
+        if not words:
+            return None
+        if len(words) == 1:
+            conditions = [("instr(t.token, ?) > 0", words[0])]
+        else:
+            conditions = [("t.token LIKE '%' || ? ESCAPE '\\'", self.escape_like(words[0]))]
+            conditions += [("t.token = ?", word) for word in words[1:-1]]
+            conditions.append(("t.token LIKE ? || '%' ESCAPE '\\'", self.escape_like(words[-1])))
+
+        with self.lock, self.connect() as conn:
+            documents = None
+            for condition, value in conditions:
+                rows = conn.execute(f"SELECT DISTINCT p.doc_id FROM postings p JOIN tokens t ON t.id = p.token_id WHERE {condition}", (value,))
+                matching = {doc_id for (doc_id,) in rows}
+                documents = matching if documents is None else documents & matching
+                if not documents:
+                    return set()
+            paths = set()
+            for chunk in chunks(list(documents)):
+                placeholders = ", ".join("?" for _ in chunk)
+                paths.update(path for (path,) in conn.execute(f"SELECT path FROM documents WHERE id IN ({placeholders})", chunk))
+            return paths
+
+    #------------------------------------------------------------------------------------------------#
+
+    @staticmethod
+    def escape_like(value):
+        """ Échapper les caractères spéciaux d'un motif LIKE. """
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+#------------------------------------------------------------------------------------------------#
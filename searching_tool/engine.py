@@ -0,0 +1,564 @@
+import os
+import re
+import sqlite3
+import time
+import threading
+from collections import namedtuple
+from .index import INDEX_DIR, FileIndex, entry_stat
+from .content_index import ContentIndex
+from .extractors import EXTRACTION_WORKERS, EXTRACTION_TIMEOUT, content_extensions, extract_many, file_contains
+from .watcher import InotifyWatcher
+from .refine import RefinementCache
+from .trigram import NameIndex
+from .ranking import Ranker
+from .walker import TreeWalker, default_excludes, extension_set, file_extension
+from .metrics import METRICS
+from .entry_store import EntryStore
+from .query_language import parse_query
+
+#------------------------------------------------------------------------------------------------#
+
+# Extensions proposées pour chaque type de fichier
+FILE_TYPES = {
+    "Documents": [".pdf", ".docx", ".txt"],
+    "Images": [".png", ".jpg", ".jpeg", ".gif", ".bmp"],
+    "Vidéos": [".mp4", ".avi", ".mkv", ".mov"],
+    "Code": [".py", ".cpp", ".c", ".java", ".js", ".html", ".css"],
+    "Tableurs": [".xls", ".xlsx", ".csv"],
+    "PowerPoint": [".ppt", ".pptx"]
+}
+
+# Toutes les extensions connues (type de fichier "Tous")
+ALL_EXTENSIONS = tuple(ext for exts in FILE_TYPES.values() for ext in exts)
+
+# Nombre de résultats classés retournés par défaut
+RESULT_PAGE_SIZE = 1000
+
+# Marque, dans le flux des correspondances, la fin de celles sur le nom (les suivantes portent sur le seul contenu)
+END_OF_NAMES = object()
+
+# Intervalle (s) minimal entre deux relectures des dossiers modifiés avant une recherche, sans surveillance active
+INDEX_REFRESH_INTERVAL = 30
+
+# Délai (s) de regroupement des modifications signalées par la surveillance avant de recharger la copie en mémoire de l'index
+NAME_INDEX_RELOAD_DELAY = 2
+
+#------------------------------------------------------------------------------------------------#
+
+# Une recherche : un terme vide liste toutes les entrées, par ordre alphabétique et sans limite
+SearchQuery = namedtuple("SearchQuery", ["search_term", "search_type", "extensions", "limit"],
+                         defaults=("", "fichier", ALL_EXTENSIONS, RESULT_PAGE_SIZE))
+
+class SearchResult(namedtuple("SearchResult", ["name", "location", "mtime", "score"])):
+    """ Un résultat : score vaut None pour une liste non classée.
+
+    L'emplacement est un chemin, ou une référence (EntryRef) à une entrée du magasin des noms :
+    le chemin complet n'est alors construit qu'à la lecture de path.
+    """
+
+    __slots__ = ()
+
+    @property
+    def path(self):
+        """ Le chemin complet du résultat. """
+        return os.fspath(self.location)
+
+#------------------------------------------------------------------------------------------------#
+
+class SearchResults:
+    """ Itérateur sur les résultats d'une recherche.
+
+    La recherche ne commence qu'au parcours des résultats. run(cancel_event) permet de l'interrompre
+    depuis un autre thread ; total n'est connu qu'une fois la recherche menée à son terme.
+
+    Attributes:
+    - query (SearchQuery): La recherche effectuée.
+    - total (int): Le nombre total de correspondances (avant limitation), ou None tant que la recherche n'est pas terminée.
+    - on_names_done (callable): Appelée, dans le thread qui parcourt les résultats, après la dernière correspondance sur le nom, ou None.
+
+    Methods:
+    - run(cancel_event): Générer les résultats en s'arrêtant dès que cancel_event est signalé.
+    - names_done(): Signaler que les correspondances sur le nom ont toutes été produites.
+    """
+
+    def __init__(self, engine, query):
+        self.engine = engine
+        self.query = query
+        self.total = None
+        self.on_names_done = None
+
+    #------------------------------------------------------------------------------------------------#
+
+    def names_done(self):
+        """ Signaler que les correspondances sur le nom ont toutes été produites. """
+        if self.on_names_done is not None:
+            self.on_names_done()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def __iter__(self):
+        return self.run(threading.Event())
+
+    #------------------------------------------------------------------------------------------------#
+
+    def run(self, cancel_event):
+        """ Générer les résultats en s'arrêtant dès que cancel_event est signalé. """
+        if self.query.search_term:
+            results = self.engine.iter_search_results(self.query, cancel_event, self)
+        else:
+            results = self.engine.iter_all_entries(self.query, cancel_event, self)
+        for result in results:
+            if cancel_event.is_set():
+                return
+            yield result
+
+#------------------------------------------------------------------------------------------------#
+
+class SearchEngine:
+    """ Moteur de recherche de fichiers et de dossiers, indépendant de l'interface graphique.
+
+    Le moteur regroupe l'index des noms, l'index du contenu, sa copie en mémoire et la surveillance
+    du répertoire de recherche. Il reçoit une SearchQuery et retourne un itérateur de SearchResult :
+    il peut être utilisé depuis l'application, un script ou la ligne de commande.
+
+    Attributes:
+    - search_directory (str): Le répertoire de recherche.
+    - walker (TreeWalker): Le parcours du répertoire (motifs d'exclusion, profondeur maximale, système de fichiers).
+    - file_index (FileIndex): L'index persistant des noms du répertoire de recherche.
+    - content_index (ContentIndex): L'index inversé du contenu des documents du répertoire de recherche.
+    - watch (bool): Indique si la surveillance inotify doit être démarrée avec l'index.
+    - watcher (InotifyWatcher): La surveillance inotify de l'index (Linux uniquement), ou None.
+    - index_changed (threading.Event): Signalé lorsque les modifications relevées par la surveillance sont prises en compte par la recherche.
+    - index_lock (threading.Lock): Verrou protégeant la construction et le rafraîchissement de l'index.
+    - index_status (str): Le dernier état de l'index, à afficher.
+    - last_refresh (float): L'instant (time.monotonic) de la dernière construction ou relecture de l'index, ou None.
+    - name_index (NameIndex): La copie en mémoire de l'index, ou None.
+    - name_index_thread (threading.Thread): Le thread construisant la copie en mémoire de l'index.
+    - name_index_generation (int): Incrémenté à chaque reconstruction de l'index pour écarter une copie périmée.
+    - name_index_reload (threading.Timer): Le rechargement différé de la copie en mémoire après des modifications signalées, ou None.
+    - name_index_reload_lock (threading.Lock): Verrou protégeant la programmation du rechargement différé.
+    - refinement_cache (RefinementCache): Les correspondances de la dernière recherche terminée, affinées par la suivante.
+
+    Methods:
+    - search(query): Retourner l'itérateur des résultats d'une recherche.
+    - close(): Arrêter la surveillance et libérer le moteur.
+    - ensure_index(refresh): S'assurer que l'index existe et, si demandé, qu'il est à jour.
+    """
+
+    def __init__(self, search_directory, index_dir=INDEX_DIR, watch=False, max_workers=EXTRACTION_WORKERS, timeout=EXTRACTION_TIMEOUT,
+                 excludes=None, max_depth=None, one_file_system=False, index_changed=None):
+        self.search_directory = os.path.abspath(search_directory)
+        # Sans motifs donnés : les dossiers exclus par défaut et ceux du fichier de l'utilisateur
+        excludes = default_excludes() if excludes is None else tuple(excludes)
+        self.walker = TreeWalker(self.search_directory, excludes, max_depth, one_file_system)
+        self.file_index = FileIndex(self.search_directory, index_dir, self.walker)
+        self.content_index = ContentIndex(self.search_directory, index_dir, max_workers, timeout)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.watch = watch
+        self.watcher = None
+        self.closed = False
+        # L'événement peut être partagé entre plusieurs moteurs (recherche sur plusieurs répertoires)
+        self.index_changed = index_changed if index_changed is not None else threading.Event()
+        self.index_lock = threading.Lock()
+        self.index_status = ""
+        self.last_refresh = None
+        self.name_index = None
+        self.name_index_thread = None
+        self.name_index_generation = 0
+        self.name_index_reload = None
+        self.name_index_reload_lock = threading.Lock()
+        self.refinement_cache = RefinementCache()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def search(self, query):
+        """ Retourner l'itérateur (SearchResults) des résultats d'une recherche. """
+        return SearchResults(self, query)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def close(self):
+        """ Arrêter la surveillance et libérer le moteur. """
+        self.closed = True
+        with self.name_index_reload_lock:
+            if self.name_index_reload is not None:
+                self.name_index_reload.cancel()
+                self.name_index_reload = None
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    #------------------------------------------------------------------------------------------------#
+
+    def iter_search_results(self, query, cancel_event, results):
+        """ Générer les meilleurs résultats correspondant au terme de recherche.
+
+        Si le terme affine celui de la dernière recherche terminée (mêmes filtres), seules les
+        correspondances de celle-ci sont filtrées ; sinon tout le répertoire est parcouru. Les
+        correspondances sont classées par pertinence et seules les query.limit meilleures sont
+        produites : celles sur le nom dès qu'elles sont connues, puis celles sur le seul contenu,
+        toujours moins bien classées. Une requête avec filtres (ext:, size>, modified<...) est évaluée
+        à part, sur les noms et les métadonnées de l'index. Sans surveillance active, les dossiers
+        modifiés sont relus au plus toutes les INDEX_REFRESH_INTERVAL secondes.
+        """
+        self.ensure_index(refresh=self.refresh_due())
+        parsed = parse_query(query.search_term)
+        if not parsed.is_plain():
+            yield from self.iter_filtered_results(parsed, query, cancel_event, results)
+            return
+        search_term, search_type, extensions, limit = query
+        key = RefinementCache.make_key(self.search_directory, search_type, extensions)
+        cached = self.refinement_cache.get(key, search_term)
+        previous = self.refinement_cache.lookup(key, search_term) if cached is None else None
+        if cached is not None:
+            matches = iter(cached)
+        elif previous is not None:
+            matches = self.iter_refined_results(previous, search_term, search_type, cancel_event)
+        else:
+            matches = self.iter_full_search(search_term, search_type, extensions, cancel_event)
+
+        ranker = Ranker(self.search_directory, search_term)
+        search_term_lower = search_term.lower()
+        collected = []
+        name_matches = []
+        content_matches = []
+        shown = None
+        for match in matches:
+            if match is END_OF_NAMES:
+                if shown is None:
+                    # Les correspondances sur le nom sont complètes : elles sont produites avant la lecture du contenu
+                    with METRICS.timer("search.rank"):
+                        shown = ranker.top(name_matches, limit)
+                    yield from (SearchResult(*match, ranker.score(match)) for match in shown)
+                    results.names_done()
+                continue
+            collected.append(match)
+            if shown is None and search_term_lower in match[0].lower():
+                name_matches.append(match)
+                continue
+            if shown is None:
+                # Les correspondances sur le nom sont complètes : elles sont produites sans attendre la lecture du contenu
+                with METRICS.timer("search.rank"):
+                    shown = ranker.top(name_matches, limit)
+                yield from (SearchResult(*match, ranker.score(match)) for match in shown)
+                results.names_done()
+            content_matches.append(match)
+        if shown is None:
+            with METRICS.timer("search.rank"):
+                shown = ranker.top(name_matches, limit)
+            yield from (SearchResult(*match, ranker.score(match)) for match in shown)
+            results.names_done()
+        remaining = None if limit is None else max(0, limit - len(shown))
+        with METRICS.timer("search.rank"):
+            content_shown = ranker.top(content_matches, remaining)
+        yield from (SearchResult(*match, ranker.score(match)) for match in content_shown)
+        # Seule une recherche menée à son terme peut servir de base à la suivante
+        if not cancel_event.is_set():
+            self.refinement_cache.store(key, search_term, collected)
+            results.total = len(collected)
+            METRICS.add("files_matched", len(collected))
+
+    #------------------------------------------------------------------------------------------------#
+
+    def iter_filtered_results(self, parsed, query, cancel_event, results):
+        """ Générer les meilleurs résultats d'une requête avec filtres.
+
+        Les filtres sont évalués sur la taille et la date relevées lors de l'indexation (ou du parcours,
+        sans index) : aucun fichier n'est relu. Seuls les noms sont comparés au texte, pas le contenu.
+        """
+        matcher = parsed.compile(query.search_type, query.extensions)
+        self.ensure_index()
+        trigram_index = None
+        if self.file_index.exists():
+            name_index = self.get_name_index()
+            # Les filtres portent sur la copie en mémoire : son ouverture (projection du fichier des entrées) est attendue
+            while name_index is None and self.name_index_thread.is_alive() and not cancel_event.wait(0.01):
+                name_index = self.name_index
+            if name_index is not None:
+                store, trigram_index = name_index.store, name_index.trigram_index
+            else:
+                store = self.file_index.entry_store()
+        else:
+            store = EntryStore.from_rows(self.search_directory, self.walk_rows(cancel_event))
+        if cancel_event.is_set():
+            return
+        with METRICS.timer("search.filter"):
+            ids = matcher.matching_ids(store, trigram_index)
+        matches = [(store.names[i], store.ref(i), store.mtimes[i]) for i in ids]
+        ranker = Ranker(self.search_directory, parsed.text)
+        with METRICS.timer("search.rank"):
+            shown = ranker.top(matches, query.limit)
+        yield from (SearchResult(*match, ranker.score(match)) for match in shown)
+        if not cancel_event.is_set():
+            results.total = len(matches)
+            METRICS.add("files_matched", len(matches))
+
+    #------------------------------------------------------------------------------------------------#
+
+    def iter_full_search(self, search_term, search_type, extensions, cancel_event):
+        """ Rechercher dans tout le répertoire de recherche.
+
+        Les correspondances (nom, chemin, mtime) sur le nom sont produites en premier, suivies de
+        END_OF_NAMES, puis les fichiers dont seul le contenu correspond.
+        """
+        file_index = self.file_index
+        content_index = self.content_index
+        self.ensure_index()
+
+        search_term_lower = search_term.lower()
+        search_pattern = re.compile(re.escape(search_term_lower))
+        # Extensions dont le contenu peut être parcouru (module d'extraction installé)
+        searchable = extension_set(content_extensions())
+
+        if file_index.exists():
+            # Les noms sont cherchés dans l'index de trigrammes en mémoire, ou dans SQLite tant qu'il se construit
+            names = self.get_name_index() or file_index
+            with METRICS.timer("search.names"):
+                matches = names.search_names(search_term_lower, search_type, extensions)
+            yield from matches
+            yield END_OF_NAMES
+            if search_type == "fichier":
+                with METRICS.timer("search.content"):
+                    candidates = names.non_matching_files(search_term_lower, [ext for ext in extensions if ext in searchable])
+                yield from self.iter_content_matches(content_index, candidates, search_term, cancel_event)
+        else:
+            content_candidates = []
+            wanted = extension_set(extensions)
+            for root, dirs, files in self.walker.walk(cancel_event=cancel_event):
+                if search_type == "fichier":
+                    for entry in files:
+                        extension = file_extension(entry.name)
+                        if extension in wanted:
+                            if search_pattern.search(entry.name.lower()):
+                                yield (entry.name, entry.path, entry_stat(entry)[1])
+                            elif extension in searchable:
+                                content_candidates.append((entry.name, entry.path, entry_stat(entry)[1]))
+                elif search_type == "dossier":
+                    for entry in dirs:
+                        if search_pattern.search(entry.name.lower()):
+                            yield (entry.name, entry.path, entry_stat(entry)[1])
+            if cancel_event.is_set():
+                return
+            yield END_OF_NAMES
+            # Le contenu est lu après le parcours, en parallèle, pour ne pas retarder les correspondances sur le nom
+            yield from self.iter_live_content_matches(content_candidates, search_term, cancel_event)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def iter_refined_results(self, previous, search_term, search_type, cancel_event):
+        """ Filtrer en mémoire les correspondances de la recherche précédente pour un terme plus long.
+
+        Une correspondance dont le nom ne contient plus le terme n'est conservée que si son contenu le contient.
+        """
+        search_term_lower = search_term.lower()
+        yield from (match for match in previous if search_term_lower in match[0].lower())
+        yield END_OF_NAMES
+        if search_type == "fichier":
+            searchable = extension_set(content_extensions())
+            candidates = [match for match in previous if search_term_lower not in match[0].lower() and file_extension(match[0]) in searchable]
+            if candidates:
+                yield from self.iter_content_matches(self.content_index, candidates, search_term, cancel_event)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def iter_content_matches(self, content_index, candidates, search_term, cancel_event):
+        """ Générer les documents candidats dont le contenu contient le terme de recherche.
+
+        Les documents nouveaux ou modifiés sont d'abord ajoutés à l'index du contenu. L'index écarte les
+        documents qui ne contiennent pas les mots du terme ; seuls les autres sont lus pour vérifier
+        qu'ils contiennent le terme lui-même (mots voisins, dans l'ordre, ponctuation comprise).
+        """
+        try:
+            unindexed = set(content_index.update([os.fspath(match[1]) for match in candidates], cancel_event))
+            if cancel_event.is_set():
+                return
+            with METRICS.timer("search.content"):
+                matches = content_index.search(search_term)
+        except (OSError, sqlite3.Error) as e:
+            # Index du contenu indisponible : lecture directe des documents
+            print(f"Index du contenu indisponible: {e}")
+            yield from self.iter_live_content_matches(candidates, search_term, cancel_event)
+            return
+        # Un terme sans mot (ponctuation seule) ne peut pas être cherché dans l'index : tous les documents sont lus.
+        # Les fichiers texte trop volumineux pour l'index sont parcourus en flux.
+        if matches is None:
+            to_check = candidates
+        else:
+            wanted = matches | unindexed
+            to_check = [match for match in candidates if os.fspath(match[1]) in wanted]
+        yield from self.iter_live_content_matches(to_check, search_term, cancel_event)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def iter_live_content_matches(self, candidates, search_term, cancel_event):
+        """ Lire directement les documents candidats, en parallèle, et générer ceux qui contiennent le terme. """
+        by_path = {os.fspath(match[1]): match for match in candidates}
+        results = extract_many(by_path, task=file_contains, args=(search_term,), max_workers=self.max_workers, timeout=self.timeout, cancel_event=cancel_event)
+        for path, found, error in results:
+            if error is not None:
+                print(f"Erreur lors de la lecture de {path}: {str(error).encode('utf-8', errors='ignore')}")
+            elif found:
+                yield by_path[path]
+
+    #------------------------------------------------------------------------------------------------#
+
+    def iter_all_entries(self, query, cancel_event, results):
+        """ Générer tous les fichiers ou dossiers du répertoire de recherche, par ordre alphabétique. """
+        self.ensure_index(refresh=True)
+
+        if self.file_index.exists():
+            # Les entrées compactes en mémoire ne portent qu'une référence : les chemins ne sont construits qu'à l'affichage
+            names = self.get_name_index() or self.file_index
+            with METRICS.timer("search.list"):
+                entries = names.list_entries(query.search_type, query.extensions)
+        else:
+            # Pas d'index disponible (répertoire d'index non inscriptible) : parcours direct
+            entries = self.walk_entries(query.search_type, query.extensions, cancel_event)
+        count = 0
+        for name, location, mtime in entries:
+            count += 1
+            yield SearchResult(name, location, mtime, None)
+        if not cancel_event.is_set():
+            results.total = count
+            METRICS.add("files_matched", count)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def walk_rows(self, cancel_event):
+        """ Parcourir le répertoire de recherche sans index : génère les (dossier, nom, extension, est_dossier, taille, mtime). """
+        for root, dirs, files in self.walker.walk(cancel_event=cancel_event):
+            yield from ((root, entry.name, "", True, *entry_stat(entry)) for entry in dirs)
+            yield from ((root, entry.name, file_extension(entry.name), False, *entry_stat(entry)) for entry in files)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def walk_entries(self, search_type, extensions, cancel_event):
+        """ Parcourir le répertoire de recherche sans index. """
+        wanted = extension_set(extensions)
+        for root, dirs, files in self.walker.walk(cancel_event=cancel_event):
+            if search_type == "fichier":
+                yield from ((entry.name, entry.path, entry_stat(entry)[1]) for entry in files if file_extension(entry.name) in wanted)
+            elif search_type == "dossier":
+                yield from ((entry.name, entry.path, entry_stat(entry)[1]) for entry in dirs)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def ensure_index(self, refresh=False):
+        """ S'assurer que l'index du répertoire de recherche existe et, si demandé, qu'il est à jour. """
+        file_index = self.file_index
+        with self.index_lock:
+            if not file_index.exists():
+                self.index_status = "Construction de l'index..."
+                file_index.build()
+                self.index_status = ""
+                self.last_refresh = time.monotonic()
+                self.invalidate_name_index()
+            elif refresh and self.watcher is None:
+                # Sans surveillance active, seuls les dossiers modifiés sont relus
+                self.refresh_index()
+            if self.watch and self.watcher is None and not self.closed and file_index.exists():
+                self.start_watcher()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def refresh_due(self):
+        """ Indiquer si l'index doit être relu avant une recherche : sans surveillance, au plus toutes les INDEX_REFRESH_INTERVAL secondes. """
+        return self.watcher is None and (self.last_refresh is None or time.monotonic() - self.last_refresh >= INDEX_REFRESH_INTERVAL)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def refresh_index(self):
+        """ Relire les dossiers modifiés depuis le dernier parcours. """
+        stats = self.file_index.refresh()
+        self.last_refresh = time.monotonic()
+        if stats.rescanned:
+            self.invalidate_name_index()
+            self.refinement_cache.clear()
+        self.index_status = f"Index mis à jour : {stats.rescanned} dossier(s) relu(s), {stats.skipped} inchangé(s)"
+
+    #------------------------------------------------------------------------------------------------#
+
+    def start_watcher(self):
+        """ Démarrer la surveillance inotify de l'index (Linux uniquement). """
+        if not InotifyWatcher.is_available():
+            return
+        watcher = InotifyWatcher(self.file_index, on_change=self.on_index_changed)
+        try:
+            watcher.start()
+        except OSError as e:
+            print(f"Surveillance du répertoire indisponible: {e}")
+            return
+        self.watcher = watcher
+
+    #------------------------------------------------------------------------------------------------#
+
+    def on_index_changed(self):
+        """
+        Prendre en compte une modification de l'index par la surveillance (appelé depuis son thread).
+
+        La copie en mémoire n'est pas écartée : elle continue de servir les recherches pendant que les
+        modifications des NAME_INDEX_RELOAD_DELAY secondes suivantes sont regroupées, puis elle est
+        remplacée en une fois par une copie rechargée (magasin et trigrammes). Un dossier très actif
+        (compilation, téléchargement) ne provoque ainsi qu'un rechargement par intervalle.
+        """
+        self.refinement_cache.clear()
+        with self.name_index_reload_lock:
+            if self.name_index_reload is None and not self.closed:
+                self.name_index_reload = threading.Timer(NAME_INDEX_RELOAD_DELAY, self.reload_name_index)
+                self.name_index_reload.daemon = True
+                self.name_index_reload.start()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def reload_name_index(self):
+        """ Remplacer la copie en mémoire de l'index par une copie à jour, construite entièrement avant d'être publiée (dans un thread). """
+        with self.name_index_reload_lock:
+            self.name_index_reload = None
+        # Une construction en cours lisait l'index d'avant les modifications : elle est attendue puis remplacée
+        loader = self.name_index_thread
+        if loader is not None and loader.is_alive():
+            loader.join()
+        elif self.name_index is None:
+            # Aucune copie chargée : la prochaine recherche lira l'index à jour
+            self.index_changed.set()
+            return
+        generation = self.name_index_generation
+        name_index = NameIndex.from_file_index(self.file_index)
+        if generation == self.name_index_generation and not self.closed:
+            self.name_index = name_index
+            self.refinement_cache.clear()
+        self.index_changed.set()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def invalidate_name_index(self):
+        """ Écarter la copie en mémoire de l'index après une modification. """
+        self.name_index_generation += 1
+        self.name_index = None
+
+    #------------------------------------------------------------------------------------------------#
+
+    def get_name_index(self):
+        """ Obtenir la copie en mémoire de l'index si elle est à jour, sinon lancer sa construction et retourner None. """
+        name_index = self.name_index
+        if name_index is not None:
+            return name_index
+        if self.name_index_thread is None or not self.name_index_thread.is_alive():
+            self.name_index_thread = threading.Thread(target=self.load_name_index, daemon=True)
+            self.name_index_thread.start()
+        return None
+
+    #------------------------------------------------------------------------------------------------#
+
+    def load_name_index(self):
+        """ Construire la copie en mémoire de l'index (dans un thread). """
+        generation = self.name_index_generation
+        name_index = NameIndex.from_file_index(self.file_index, build_trigrams=False)
+        # L'index a pu changer pendant la construction : la copie n'est retenue que si rien n'a bougé
+        if generation == self.name_index_generation and not self.closed:
+            # La copie sert dès son ouverture ; l'index de trigrammes l'accélère une fois construit
+            self.name_index = name_index
+            name_index.build_trigrams()
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,463 @@
+import os
+import sys
+import json
+import mmap
+import struct
+from array import array
+from bisect import bisect_right
+
+#------------------------------------------------------------------------------------------------#
+
+# Signature et version du fichier des entrées : un fichier d'une autre version est reconstruit
+STORE_MAGIC = b"SFSENTRY"
+STORE_VERSION = 2
+
+# Suffixe du fichier enregistré lorsque le fichier des entrées ne peut pas être remplacé (projeté en mémoire sous Windows)
+NEXT_SUFFIX = ".next"
+
+# Alignement des sections du fichier (les colonnes sont lues sur place, sans copie)
+SECTION_ALIGNMENT = 8
+
+# Drapeaux d'une entrée
+FLAG_DIR = 1
+
+#------------------------------------------------------------------------------------------------#
+
+def encode_name(text):
+    """ Encoder un nom pour les tampons (les noms non décodables du système sont conservés tels quels). """
+    return text.encode('utf-8', errors='surrogatepass')
+
+#------------------------------------------------------------------------------------------------#
+
+def align(offset):
+    """ Arrondir une position du fichier à l'alignement des sections. """
+    return (offset + SECTION_ALIGNMENT - 1) // SECTION_ALIGNMENT * SECTION_ALIGNMENT
+
+#------------------------------------------------------------------------------------------------#
+
+class PackedStrings:
+    """ Suite de chaînes stockées bout à bout dans un seul tampon UTF-8.
+
+    La chaîne i occupe data[offsets[i]:offsets[i + 1]] : une chaîne ne coûte que ses octets et une
+    position, au lieu d'un objet str complet. Le tampon peut être un bytes ou une projection mmap
+    du fichier des entrées ; les chaînes ne sont décodées qu'à la lecture.
+
+    Attributes:
+    - offsets (array): Les positions de début des chaînes, suivies de la fin du tampon.
+    - data (bytes): Le tampon (bytes ou mmap).
+    - base (int): La position du tampon dans data (0 pour un bytes).
+
+    Methods:
+    - find_all(text): Retourner les indices des chaînes contenant le texte.
+    """
+
+    def __init__(self, offsets, data, base=0):
+        self.offsets = offsets
+        self.data = data
+        self.base = base
+
+    #------------------------------------------------------------------------------------------------#
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    #------------------------------------------------------------------------------------------------#
+
+    def __getitem__(self, i):
+        return self.data[self.base + self.offsets[i]:self.base + self.offsets[i + 1]].decode('utf-8', errors='surrogatepass')
+
+    #------------------------------------------------------------------------------------------------#
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    #------------------------------------------------------------------------------------------------#
+
+    def find_all(self, text):
+        """ Retourner la liste triée des indices des chaînes contenant le texte (recherche dans tout le tampon). """
+        needle = encode_name(text)
+        if not needle:
+            return list(range(len(self)))
+        data, base, offsets = self.data, self.base, self.offsets
+        end = base + offsets[-1]
+        found = []
+        pos = data.find(needle, base, end)
+        while pos >= 0:
+            i = bisect_right(offsets, pos - base) - 1
+            stop = base + offsets[i + 1]
+            if pos + len(needle) <= stop:
+                # Une seule occurrence suffit : la recherche reprend à la chaîne suivante
+                found.append(i)
+                pos = data.find(needle, stop, end)
+            else:
+                # Occurrence à cheval sur deux chaînes
+                pos = data.find(needle, pos + 1, end)
+        return found
+
+#------------------------------------------------------------------------------------------------#
+
+class StringsBuilder:
+    """ Construction d'un PackedStrings chaîne par chaîne. """
+
+    def __init__(self):
+        self.offsets = array('Q', [0])
+        self.data = bytearray()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def append(self, text):
+        self.data += encode_name(text)
+        self.offsets.append(len(self.data))
+
+    #------------------------------------------------------------------------------------------------#
+
+    def build(self):
+        return PackedStrings(self.offsets, bytes(self.data))
+
+#------------------------------------------------------------------------------------------------#
+
+class EntryStore:
+    """ Représentation compacte des entrées d'un index (plusieurs millions d'entrées).
+
+    Les chemins complets ne sont pas conservés : une table des dossiers (chemins relatifs à la
+    racine, stockés une seule fois) et, pour chaque entrée, l'identifiant de son dossier parent.
+    Les noms (et leur version en minuscules) sont stockés bout à bout dans des tampons UTF-8 ;
+    l'extension, le type, la taille et la date sont des colonnes array. Les chemins ne sont
+    construits qu'à la demande, pour les entrées retenues.
+
+    Le magasin peut être enregistré dans un fichier puis projeté en mémoire (mmap) : les colonnes
+    sont alors lues sur place, l'ouverture ne dépend pas du nombre d'entrées et les pages ne sont
+    chargées qu'à leur première lecture.
+
+    Attributes:
+    - root (str): Le répertoire racine.
+    - dirs (PackedStrings): Les chemins des dossiers parents, relatifs à la racine ("" pour la racine).
+    - parents (array): L'identifiant du dossier parent de chaque entrée.
+    - names (PackedStrings): Les noms des entrées.
+    - lower_names (PackedStrings): Les noms des entrées, en minuscules.
+    - extensions (list): Les extensions distinctes ; ext_ids[i] est l'indice de celle de l'entrée i.
+    - flags (array): Les drapeaux de chaque entrée (FLAG_DIR pour un dossier).
+    - sizes (array): La taille de chaque entrée.
+    - mtimes (array): La date de modification de chaque entrée.
+    - ext_order (array): Les identifiants des fichiers regroupés par extension (ext_starts délimite chaque groupe).
+    - source (list): L'état (mtime_ns, taille) du fichier SQLite dont le magasin est issu.
+
+    Methods:
+    - from_rows(root, rows, source): Construire le magasin à partir des lignes de l'index SQLite.
+    - load(path): Projeter en mémoire un magasin enregistré (ou celui enregistré à côté, s'il est plus récent).
+    - save(path): Enregistrer le magasin.
+    - path(i): Construire le chemin complet d'une entrée.
+    - ref(i): Obtenir une référence à une entrée, dont le chemin n'est construit qu'à la demande.
+    - depth(i): Obtenir la profondeur d'une entrée sous la racine.
+    - files_with_extension(extension): Obtenir les identifiants des fichiers d'une extension.
+    """
+
+    # Colonnes enregistrées dans le fichier : (nom, code de type)
+    COLUMNS = (
+        ("dir_offsets", 'Q'), ("dir_data", 'B'),
+        ("parents", 'I'),
+        ("name_offsets", 'Q'), ("name_data", 'B'),
+        ("lower_offsets", 'Q'), ("lower_data", 'B'),
+        ("ext_ids", 'I'), ("flags", 'B'), ("sizes", 'q'), ("mtimes", 'd'),
+        ("ext_order", 'I'), ("ext_starts", 'Q'),
+    )
+
+    def __init__(self, root, dirs, parents, names, lower_names, extensions, ext_ids, flags, sizes, mtimes, ext_order, ext_starts, source=None):
+        self.root = root
+        self.prefix = root if root.endswith(os.sep) else root + os.sep
+        self.dirs = dirs
+        self.parents = parents
+        self.names = names
+        self.lower_names = lower_names
+        self.extensions = extensions
+        self.extension_ids = {extension: ext_id for ext_id, extension in enumerate(extensions)}
+        self.ext_ids = ext_ids
+        self.flags = flags
+        self.sizes = sizes
+        self.mtimes = mtimes
+        self.ext_order = ext_order
+        self.ext_starts = ext_starts
+        self.source = source
+        self.mapping = None
+
+    #------------------------------------------------------------------------------------------------#
+
+    def __len__(self):
+        return len(self.parents)
+
+    #------------------------------------------------------------------------------------------------#
+
+    @classmethod
+    def from_rows(cls, root, rows, source=None):
+        """
+        Construire le magasin à partir des lignes de l'index SQLite, lues une à une.
+
+        Parameters:
+        root (str): Le répertoire racine.
+        rows (iterable): Les lignes (dossier parent, nom, extension, est_dossier, taille, mtime).
+        source (list): L'état (mtime_ns, taille) du fichier SQLite lu.
+        """
+        root = os.path.abspath(root)
+        prefix = root if root.endswith(os.sep) else root + os.sep
+        dir_ids = {}
+        dirs = StringsBuilder()
+        names = StringsBuilder()
+        lower_names = StringsBuilder()
+        extension_ids = {}
+        parents = array('I')
+        ext_ids = array('I')
+        flags = array('B')
+        sizes = array('q')
+        mtimes = array('d')
+        for parent, name, extension, is_dir, size, mtime in rows:
+            dir_id = dir_ids.get(parent)
+            if dir_id is None:
+                dir_id = dir_ids[parent] = len(dir_ids)
+                dirs.append(parent[len(prefix):] if parent.startswith(prefix) else "")
+            ext_id = extension_ids.get(extension)
+            if ext_id is None:
+                ext_id = extension_ids[extension] = len(extension_ids)
+            parents.append(dir_id)
+            names.append(name)
+            lower_names.append(name.lower())
+            ext_ids.append(ext_id)
+            flags.append(FLAG_DIR if is_dir else 0)
+            sizes.append(size or 0)
+            mtimes.append(mtime or 0.0)
+
+        # Fichiers regroupés par extension (tri par dénombrement)
+        counts = [0] * (len(extension_ids) + 1)
+        for entry_id, ext_id in enumerate(ext_ids):
+            if not flags[entry_id] & FLAG_DIR:
+                counts[ext_id + 1] += 1
+        ext_starts = array('Q', [0])
+        for count in counts[1:]:
+            ext_starts.append(ext_starts[-1] + count)
+        ext_order = array('I', bytes(4 * ext_starts[-1]))
+        positions = list(ext_starts[:-1])
+        for entry_id, ext_id in enumerate(ext_ids):
+            if not flags[entry_id] & FLAG_DIR:
+                ext_order[positions[ext_id]] = entry_id
+                positions[ext_id] += 1
+
+        return cls(root, dirs.build(), parents, names.build(), lower_names.build(), list(extension_ids), ext_ids, flags, sizes, mtimes,
+                   ext_order, ext_starts, source)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def name(self, i):
+        """ Obtenir le nom d'une entrée. """
+        return self.names[i]
+
+    #------------------------------------------------------------------------------------------------#
+
+    def is_dir(self, i):
+        """ Indiquer si une entrée est un dossier. """
+        return bool(self.flags[i] & FLAG_DIR)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def path(self, i):
+        """ Construire le chemin complet d'une entrée. """
+        directory = self.dirs[self.parents[i]]
+        if directory:
+            return self.prefix + directory + os.sep + self.names[i]
+        return self.prefix + self.names[i]
+
+    #------------------------------------------------------------------------------------------------#
+
+    def ref(self, i):
+        """ Obtenir une référence à une entrée : son chemin n'est construit qu'à la demande. """
+        return EntryRef(self, i)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def depth(self, i):
+        """ Obtenir la profondeur d'une entrée sous la racine (0 pour une entrée de la racine), sans construire son chemin. """
+        directory = self.dirs[self.parents[i]]
+        return directory.count(os.sep) + 1 if directory else 0
+
+    #------------------------------------------------------------------------------------------------#
+
+    def files_with_extension(self, extension):
+        """ Obtenir les identifiants (triés) des fichiers portant une extension. """
+        ext_id = self.extension_ids.get(extension)
+        if ext_id is None:
+            return ()
+        return self.ext_order[self.ext_starts[ext_id]:self.ext_starts[ext_id + 1]]
+
+    #------------------------------------------------------------------------------------------------#
+
+    def column_buffers(self):
+        """ Obtenir le contenu brut de chaque colonne enregistrée. """
+        def data_of(strings):
+            return memoryview(strings.data)[strings.base:strings.base + strings.offsets[-1]]
+        return {
+            "dir_offsets": self.dirs.offsets, "dir_data": data_of(self.dirs),
+            "parents": self.parents,
+            "name_offsets": self.names.offsets, "name_data": data_of(self.names),
+            "lower_offsets": self.lower_names.offsets, "lower_data": data_of(self.lower_names),
+            "ext_ids": self.ext_ids, "flags": self.flags, "sizes": self.sizes, "mtimes": self.mtimes,
+            "ext_order": self.ext_order, "ext_starts": self.ext_starts,
+        }
+
+    #------------------------------------------------------------------------------------------------#
+
+    def save(self, path):
+        """
+        Enregistrer le magasin (remplacement atomique du fichier).
+
+        Sous Windows, un fichier projeté en mémoire (par un magasin encore utilisé) ne peut pas être
+        remplacé : le magasin est alors enregistré à côté (suffixe NEXT_SUFFIX) et pris en compte par
+        l'ouverture suivante.
+        """
+        buffers = self.column_buffers()
+        sections = {}
+        offset = 0
+        for name, typecode in self.COLUMNS:
+            size = memoryview(buffers[name]).nbytes
+            sections[name] = [offset, size, typecode]
+            offset = align(offset + size)
+        header = json.dumps({
+            "version": STORE_VERSION,
+            "byteorder": sys.byteorder,
+            "root": self.root,
+            "source": self.source,
+            "extensions": self.extensions,
+            "sections": sections,
+        }, ensure_ascii=True).encode('ascii')
+        data_start = align(len(STORE_MAGIC) + 4 + len(header))
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(STORE_MAGIC + struct.pack("<I", len(header)) + header)
+            for name, typecode in self.COLUMNS:
+                f.seek(data_start + sections[name][0])
+                f.write(memoryview(buffers[name]).cast('B'))
+            f.truncate(data_start + offset)
+        try:
+            os.replace(tmp_path, path)
+        except PermissionError:
+            try:
+                os.replace(tmp_path, path + NEXT_SUFFIX)
+            except OSError:
+                os.remove(tmp_path)
+                raise
+            return
+        # Un fichier en attente plus ancien n'a plus lieu d'être
+        try:
+            os.remove(path + NEXT_SUFFIX)
+        except OSError:
+            pass
+
+    #------------------------------------------------------------------------------------------------#
+
+    @classmethod
+    def load(cls, path):
+        """
+        Projeter en mémoire un magasin enregistré, sans lire ses colonnes.
+
+        Un magasin enregistré à côté (NEXT_SUFFIX) faute d'avoir pu remplacer le fichier prend sa place
+        si celui-ci n'est plus projeté ; sinon le plus récent des deux (selon l'état de l'index source) est ouvert.
+
+        Returns:
+        EntryStore: Le magasin, ou None si le fichier est absent, d'une autre version ou d'une autre architecture.
+        """
+        next_path = path + NEXT_SUFFIX
+        if os.path.exists(next_path):
+            try:
+                os.replace(next_path, path)
+            except OSError:
+                pass
+        stores = [store for store in (cls.load_file(path), cls.load_file(next_path)) if store is not None]
+        if not stores:
+            return None
+        return max(stores, key=lambda store: store.source or [])
+
+    #------------------------------------------------------------------------------------------------#
+
+    @classmethod
+    def load_file(cls, path):
+        """ Projeter en mémoire un fichier de magasin, ou retourner None s'il est absent, d'une autre version ou d'une autre architecture. """
+        try:
+            with open(path, "rb") as f:
+                if f.read(len(STORE_MAGIC)) != STORE_MAGIC:
+                    return None
+                header_size = struct.unpack("<I", f.read(4))[0]
+                header = json.loads(f.read(header_size))
+                if header.get("version") != STORE_VERSION or header.get("byteorder") != sys.byteorder:
+                    return None
+                mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError, struct.error):
+            return None
+
+        data_start = align(len(STORE_MAGIC) + 4 + header_size)
+        view = memoryview(mapping)
+        columns = {}
+        for name, (offset, size, typecode) in header["sections"].items():
+            start = data_start + offset
+            if typecode == 'B' and name.endswith("_data"):
+                # Les tampons de noms restent dans le mmap (mmap.find y cherche sans copie)
+                columns[name] = start
+            else:
+                columns[name] = view[start:start + size].cast(typecode)
+
+        def strings(prefix):
+            return PackedStrings(columns[prefix + "_offsets"], mapping, columns[prefix + "_data"])
+
+        store = cls(header["root"], strings("dir"), columns["parents"], strings("name"), strings("lower"), header["extensions"],
+                    columns["ext_ids"], columns["flags"], columns["sizes"], columns["mtimes"], columns["ext_order"], columns["ext_starts"],
+                    header.get("source"))
+        store.mapping = mapping
+        return store
+
+#------------------------------------------------------------------------------------------------#
+
+class EntryRef:
+    """ Référence légère à une entrée d'un magasin, utilisée à la place de son chemin.
+
+    Une liste de résultats peut compter des millions d'entrées dont seules quelques-unes seront
+    affichées : le chemin complet n'est construit qu'à la lecture (os.fspath, str), au lieu d'une
+    chaîne par résultat.
+
+    Attributes:
+    - store (EntryStore): Le magasin contenant l'entrée.
+    - entry_id (int): L'identifiant de l'entrée dans le magasin.
+
+    Methods:
+    - depth(): Obtenir la profondeur de l'entrée sous la racine.
+    """
+
+    __slots__ = ("store", "entry_id")
+
+    def __init__(self, store, entry_id):
+        self.store = store
+        self.entry_id = entry_id
+
+    #------------------------------------------------------------------------------------------------#
+
+    def __fspath__(self):
+        return self.store.path(self.entry_id)
+
+    __str__ = __fspath__
+
+    def __repr__(self):
+        return f"EntryRef({self.store.path(self.entry_id)!r})"
+
+    #------------------------------------------------------------------------------------------------#
+
+    def __lt__(self, other):
+        # Comparaison des chemins : seuls les ex æquo d'un classement sont départagés ainsi
+        return os.fspath(self) < os.fspath(other)
+
+    def __gt__(self, other):
+        return os.fspath(self) > os.fspath(other)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def depth(self):
+        """ Obtenir la profondeur de l'entrée sous la racine, sans construire son chemin. """
+        return self.store.depth(self.entry_id)
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,183 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from .backends import backend_available, load_backend
+from .text_scan import text_file_contains
+from .metrics import METRICS
+
+#------------------------------------------------------------------------------------------------#
+
+def extract_txt(path):
+    """ Extraire le texte d'un fichier texte. """
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+#------------------------------------------------------------------------------------------------#
+
+def extract_pdf(path):
+    """ Extraire le texte de toutes les pages d'un fichier PDF. """
+    fitz = load_backend("fitz")  # PyMuPDF
+    with fitz.open(path) as doc:
+        return "\n".join(page.get_text() for page in doc)
+
+#------------------------------------------------------------------------------------------------#
+
+def extract_docx(path):
+    """ Extraire le texte des paragraphes d'un document Word. """
+    doc = load_backend("docx").Document(path)
+    return "\n".join(para.text for para in doc.paragraphs)
+
+#------------------------------------------------------------------------------------------------#
+
+# Nombre de processus d'extraction (None : un par cœur) et délai maximal par fichier (s)
+EXTRACTION_WORKERS = None
+EXTRACTION_TIMEOUT = 30
+
+# Fonction d'extraction du texte par extension, et module optionnel dont elle dépend
+EXTRACTORS = {
+    '.txt': (extract_txt, None),
+    '.pdf': (extract_pdf, "fitz"),
+    '.docx': (extract_docx, "docx"),
+}
+
+#------------------------------------------------------------------------------------------------#
+
+def register_extractor(extension, extractor, backend=None):
+    """
+    Ajouter (ou remplacer) la fonction d'extraction du texte d'une extension.
+
+    Parameters:
+    extension (str): L'extension, avec son point (".odt").
+    extractor (callable): La fonction (de niveau module) retournant le texte d'un chemin.
+    backend (str): Le module optionnel nécessaire (voir backends.BACKENDS), ou None.
+
+    Les processus d'extraction démarrés sans fork (Windows, macOS) ne connaissent que les
+    fonctions enregistrées à l'import d'un module : l'enregistrement doit s'y faire.
+    """
+    EXTRACTORS[extension.lower()] = (extractor, backend)
+
+#------------------------------------------------------------------------------------------------#
+
+def content_extensions():
+    """ Obtenir les extensions dont le contenu peut être extrait (module optionnel installé). """
+    return tuple(ext for ext, (_, backend) in EXTRACTORS.items() if backend is None or backend_available(backend))
+
+#------------------------------------------------------------------------------------------------#
+
+def extract_text(path):
+    """
+    Extraire le texte d'un fichier selon son extension.
+
+    Parameters:
+    path (str): Le chemin du fichier.
+
+    Returns:
+    str: Le texte extrait, ou None si l'extension n'est pas prise en charge.
+    """
+    extractor, _ = EXTRACTORS.get(os.path.splitext(path)[1].lower(), (None, None))
+    if extractor is None:
+        return None
+    return extractor(path)
+
+#------------------------------------------------------------------------------------------------#
+
+def file_contains(path, search_term):
+    """ Indiquer si le texte d'un fichier contient le terme de recherche (sans tenir compte de la casse). """
+    if path.lower().endswith('.txt'):
+        # Lecture en flux : la mémoire reste bornée même pour un fichier texte de plusieurs Go
+        return text_file_contains(path, search_term)
+    text = extract_text(path)
+    return text is not None and search_term.lower() in text.lower()
+
+#------------------------------------------------------------------------------------------------#
+
+def record_extraction(path, seconds):
+    """ Enregistrer la durée d'extraction d'un fichier (par extension) et la taille lue. """
+    METRICS.record("extract" + (os.path.splitext(path)[1].lower() or ".sans_extension"), seconds, path)
+    METRICS.add("files_extracted")
+    try:
+        METRICS.add("bytes_read", os.path.getsize(path))
+    except OSError:
+        pass
+
+#------------------------------------------------------------------------------------------------#
+
+def terminate_pool(executor):
+    """ Arrêter immédiatement les processus d'un pool (utilisé lorsqu'un fichier bloque un processus). """
+    processes = getattr(executor, "_processes", None) or {}
+    for process in list(processes.values()):
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+#------------------------------------------------------------------------------------------------#
+
+def extract_many(paths, task=extract_text, args=(), max_workers=EXTRACTION_WORKERS, timeout=EXTRACTION_TIMEOUT, cancel_event=None):
+    """
+    Appliquer une fonction d'extraction à plusieurs fichiers dans un pool de processus.
+
+    Les résultats sont produits dans l'ordre de fin de traitement. Un fichier qui dépasse le délai
+    est abandonné : les processus du pool sont alors remplacés pour qu'il ne bloque pas la suite.
+
+    Parameters:
+    paths (iterable): Les chemins des fichiers à traiter.
+    task (callable): La fonction (de niveau module) appelée avec le chemin puis args.
+    args (tuple): Les arguments supplémentaires de la fonction.
+    max_workers (int): Le nombre de processus (None : un par cœur).
+    timeout (float): Le délai maximal de traitement d'un fichier, en secondes.
+    cancel_event (threading.Event): Permet d'interrompre le traitement.
+
+    Returns:
+    generator: Des triplets (chemin, résultat, erreur) ; résultat vaut None en cas d'erreur.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    remaining = iter(paths)
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    pending = {}
+
+    def submit_next():
+        for path in remaining:
+            pending[executor.submit(task, path, *args)] = (path, time.monotonic() + timeout)
+            return
+
+    try:
+        # Au plus un fichier en cours par processus : le délai d'un fichier court dès sa soumission
+        for _ in range(max_workers):
+            submit_next()
+        while pending:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            next_deadline = min(deadline for _, deadline in pending.values())
+            done, _ = wait(pending, timeout=max(0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            for future in done:
+                path, deadline = pending.pop(future)
+                record_extraction(path, time.monotonic() - (deadline - timeout))
+                # Seule l'extraction est protégée : une erreur levée par l'appelant au yield n'est pas attribuée au fichier
+                try:
+                    result, error = future.result(), None
+                except Exception as e:
+                    result, error = None, e
+                yield path, result, error
+                submit_next()
+
+            expired = [future for future, (_, deadline) in pending.items() if deadline <= time.monotonic()]
+            if expired:
+                for future in expired:
+                    path, _ = pending.pop(future)
+                    record_extraction(path, timeout)
+                    yield path, None, TimeoutError(f"extraction interrompue après {timeout} s")
+                # Les processus bloqués sont arrêtés et les fichiers en attente soumis à un nouveau pool
+                retry = [path for path, _ in pending.values()]
+                pending.clear()
+                terminate_pool(executor)
+                executor = ProcessPoolExecutor(max_workers=max_workers)
+                for path in retry:
+                    pending[executor.submit(task, path, *args)] = (path, time.monotonic() + timeout)
+                for _ in range(max_workers - len(pending)):
+                    submit_next()
+    finally:
+        if pending:
+            terminate_pool(executor)
+        else:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+#------------------------------------------------------------------------------------------------#
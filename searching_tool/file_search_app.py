@@ -1,27 +1,61 @@
 import os
-import re
+import time
 import tkinter as tk
 from tkinter import filedialog, messagebox, Menu, ttk
 from PIL import Image
 import customtkinter as ctk  # Import de customtkinter pour l'interface graphique personnalisée
 from pathlib import Path
 from .helpers import resource_path
-from .preview import (preview_image, preview_text, preview_pdf, preview_docx, preview_code, preview_video, preview_generic)
+from .engine import FILE_TYPES, RESULT_PAGE_SIZE, SearchQuery
+from .multi_root import ROOT_TIMEOUT, MultiRootEngine, is_within
+from .worker import SearchWorker
+from .result_view import VirtualResultView
+from .preview import prepare_preview, payload_size, render_preview
+from .preview_cache import PreviewCache
+from .metrics import METRICS, format_delta, snapshot_delta, write_log
+from .query_language import QuerySyntaxError, parse_query
+
+#------------------------------------------------------------------------------------------------#
+
+# Délai (ms) sans frappe avant de lancer la recherche
+SEARCH_DEBOUNCE_MS = 150
+
+# Nombre de résultats préparés à l'avance au-dessus et au-dessous de la sélection
+PREFETCH_RADIUS = 2
+
+# Délais (s) proposés sans nouveau résultat d'un répertoire avant d'abandonner sa recherche
+ROOT_TIMEOUT_CHOICES = (15, 30, 60, 120, 300)
 
 #------------------------------------------------------------------------------------------------#
 
 class FileSearchApp:
     """ Classe principale de l'application de recherche de fichiers et de dossiers.
+
+    L'application est un client du moteur de recherche (MultiRootEngine) : elle construit les requêtes
+    à partir des filtres de l'interface et affiche les résultats transmis par le thread de recherche.
+    Plusieurs répertoires peuvent être parcourus simultanément, leurs résultats étant fusionnés.
     
     Attributes: 
     - root (tk.Tk): La fenêtre principale de l'application.
-    - search_directory (str): Le répertoire de recherche actuel.
+    - search_directories (list): Les répertoires de recherche actuels.
+    - root_timeout (float): Le délai sans nouveau résultat d'un répertoire avant d'abandonner sa recherche, en secondes.
     - search_type (tk.StringVar): Le type de recherche (fichier ou dossier).
     - file_type (tk.StringVar): Le type de fichier à rechercher.
     - selected_extensions (dict): Les extensions de fichiers sélectionnées pour chaque type de fichier.
     - extension_vars (dict): Les variables de contrôle pour les extensions de fichiers.
     - extension_menus (dict): Les menus déroulants pour les extensions de fichiers.
     - preview_window (tk.Toplevel): La fenêtre de prévisualisation actuelle.
+    - preview_cache (PreviewCache): Les prévisualisations préparées, et leur préparation à l'avance.
+    - engine (MultiRootEngine): Le moteur de recherche des répertoires de recherche.
+    - search_worker (SearchWorker): Le thread de fond exécutant les recherches.
+    - pending_search (str): L'identifiant du lancement différé de la recherche, ou None.
+    - search_text (str): Le texte du champ de recherche lors de la dernière frappe prise en compte.
+    - search_results (SearchResults): Les résultats de la recherche en cours, ou None.
+    - result_view (VirtualResultView): La liste virtualisée des résultats (result_tree est son Treeview).
+    - result_limit (int): Le nombre maximal de résultats classés affichés pour la recherche en cours.
+    - show_metrics (tk.BooleanVar): Afficher le panneau de performances (et enregistrer le journal des mesures).
+    - metrics_before (dict): Les mesures au lancement de la recherche en cours.
+    - search_started (float): L'instant du lancement de la recherche en cours.
     
     Methods:
     - __init__(root): Initialiser l'application de recherche de fichiers et de dossiers.
@@ -29,21 +63,33 @@ class FileSearchApp:
     - setup_bindings(): Configuration des bindings d'événements.
     - close_menu(event): Fermer tous les menus contextuels ouverts.
     - on_key_release(event): Action déclenchée lors de la saisie dans le champ de recherche.
+    - start_search(): Lancer la recherche correspondant au contenu du champ de recherche.
     - select_directory(): Ouvrir une boîte de dialogue pour sélectionner le répertoire de recherche.
-    - update_current_dir_label(): Mettre à jour l'étiquette du répertoire actuel.
+    - add_directory(): Ouvrir une boîte de dialogue pour ajouter un répertoire de recherche.
+    - set_search_directories(directories): Remplacer les répertoires de recherche et relancer la recherche.
+    - set_root_timeout(choice): Modifier le délai sans nouveau résultat d'un répertoire.
+    - update_current_dir_label(): Mettre à jour l'étiquette des répertoires actuels.
     - search_files(search_term): Rechercher des fichiers ou des dossiers correspondant au terme de recherche.
+    - show_more_results(): Afficher la page suivante des résultats classés.
     - list_all_files(): Lister tous les fichiers et dossiers dans le répertoire de recherche.
+    - run_query(query): Lancer une requête du moteur de recherche dans le thread de recherche.
+    - clear_results(): Vider l'arbre de résultats.
+    - on_search_batch(batch): Afficher un lot de résultats transmis par le thread de recherche.
+    - on_search_done(): Mettre à jour l'étiquette d'état à la fin d'une recherche.
+    - toggle_metrics(): Afficher ou masquer le panneau de performances.
+    - show_search_metrics(): Afficher et enregistrer les mesures de la recherche terminée.
+    - poll_index_changes(): Réafficher les résultats lorsque la surveillance a modifié l'index.
     - get_selected_extensions(file_type): Obtenir les extensions de fichiers sélectionnées pour le type de fichier donné.
-    - display_result(name, full_path, index): Afficher un résultat de recherche dans l'arbre de résultats.
     - open_selected_item(event): Ouvrir l'élément sélectionné.
     - reset_filters(): Réinitialiser tous les filtres de recherche.
     - show_help(): Afficher l'aide de l'application.
     - on_closing(): Fermer l'application proprement.
     - show_extensions_menu(selected_file_type): Afficher le menu des extensions de fichier pour le type de fichier sélectionné.
     - toggle_extension(file_type, extension, var): Activer ou désactiver une extension de fichier dans le menu des extensions.
-    - search_content_in_file(file, root, search_term): Rechercher un terme dans le contenu des fichiers.
     - preview_selected_item(event): Prévisualiser l'élément sélectionné.
-    - open_preview_window(path): Ouvrir la fenêtre de prévisualisation pour le fichier sélectionné.
+    - on_result_selected(index): Suivre au clavier la sélection dans la prévisualisation.
+    - open_preview_window(path, autoplay): Ouvrir la fenêtre de prévisualisation pour le fichier sélectionné.
+    - prefetch_neighbours(index): Préparer à l'avance les prévisualisations des résultats voisins.
     """
     
     def __init__(self, root):
@@ -54,24 +100,29 @@ class FileSearchApp:
         self.root.columnconfigure(0, weight=1)
 
         # Initialisation des variables
-        self.search_directory = str(Path.home() / "Documents")  # Répertoire de départ : dossier "Documents" de l'utilisateur
+        self.search_directories = [str(Path.home() / "Documents")]  # Répertoire de départ : dossier "Documents" de l'utilisateur
+        self.root_timeout = ROOT_TIMEOUT
         self.search_type = tk.StringVar(value="fichier")
         self.file_type = tk.StringVar(value="Tous")
-        self.selected_extensions = {
-            "Documents": [".pdf", ".docx", ".txt"],
-            "Images": [".png", ".jpg", ".jpeg", ".gif", ".bmp"],
-            "Vidéos": [".mp4", ".avi", ".mkv", ".mov"],
-            "Code": [".py", ".cpp", ".c", ".java", ".js", ".html", ".css"],
-            "Tableurs": [".xls", ".xlsx", ".csv"],
-            "PowerPoint": [".ppt", ".pptx"]
-        }
+        self.selected_extensions = {file_type: list(exts) for file_type, exts in FILE_TYPES.items()}
         self.extension_vars = {}
         self.extension_menus = {}
         self.preview_window = None
+        self.preview_cache = PreviewCache(prepare_preview, payload_size)
+        self.engine = MultiRootEngine(self.search_directories, root_timeout=self.root_timeout, watch=True)
+        self.search_worker = SearchWorker(self.root, on_batch=self.on_search_batch, on_done=self.on_search_done, batch_size=5000)
+        self.pending_search = None
+        self.search_text = ""
+        self.search_results = None
+        self.result_limit = RESULT_PAGE_SIZE
+        self.show_metrics = tk.BooleanVar(value=False)
+        self.metrics_before = METRICS.snapshot()
+        self.search_started = time.perf_counter()
 
         # Configuration de l'interface utilisateur et des bindings
         self.setup_ui()
         self.setup_bindings()
+        self.root.after(1000, self.poll_index_changes)
 
     #------------------------------------------------------------------------------------------------#
     
@@ -87,13 +138,23 @@ class FileSearchApp:
         self.frame.columnconfigure((0, 1, 2, 3), weight=1)
 
         # Étiquette pour le répertoire actuel
-        self.current_dir_label = ctk.CTkLabel(self.frame, text="Répertoire actuel : " + os.path.basename(self.search_directory), anchor='center')
+        self.current_dir_label = ctk.CTkLabel(self.frame, text="", anchor='center')
         self.current_dir_label.grid(row=0, column=1, pady=5, padx=10, sticky='ew')
+        self.update_current_dir_label()
 
         # Bouton pour sélectionner le répertoire
         self.select_dir_button = ctk.CTkButton(self.frame, text="Sélectionner Répertoire", command=self.select_directory, fg_color="#D3D3D3", hover_color="#C0C0C0", text_color="black")
         self.select_dir_button.grid(row=1, column=1, pady=5, padx=10, sticky='ew')
 
+        # Bouton pour ajouter un répertoire (recherche simultanée dans plusieurs répertoires)
+        self.add_dir_button = ctk.CTkButton(self.frame, text="Ajouter Répertoire", command=self.add_directory, fg_color="#D3D3D3", hover_color="#C0C0C0", text_color="black")
+        self.add_dir_button.grid(row=1, column=2, pady=5, padx=10, sticky='ew')
+
+        # Menu déroulant du délai sans nouveau résultat d'un répertoire (partage réseau lent ou bloqué)
+        self.root_timeout_selector = ctk.CTkOptionMenu(self.frame, values=[f"Délai : {seconds} s" for seconds in ROOT_TIMEOUT_CHOICES], command=self.set_root_timeout)
+        self.root_timeout_selector.set(f"Délai : {self.root_timeout} s")
+        self.root_timeout_selector.grid(row=1, column=3, pady=5, padx=10, sticky='ew')
+
         # Champ de saisie pour la recherche
         self.search_entry = ctk.CTkEntry(self.frame, width=400, placeholder_text="Recherche")
         self.search_entry.grid(row=2, column=1, pady=(30, 12), padx=10, sticky='ew')
@@ -112,13 +173,26 @@ class FileSearchApp:
         self.reset_button = ctk.CTkButton(self.frame, text="Réinitialiser", command=self.reset_filters, text_color="black")
         self.reset_button.grid(row=3, column=3, pady=12, padx=10, sticky='ew')
 
-        # Arbre de résultats pour afficher les fichiers trouvés
-        self.result_tree = ttk.Treeview(self.frame, columns=("Name", "Path"), show='headings', height=15)
-        self.result_tree.heading("Name", text="Nom")
-        self.result_tree.heading("Path", text="Chemin")
-        self.result_tree.column("Name", width=300, anchor="w")
-        self.result_tree.column("Path", width=500, anchor="w")
-        self.result_tree.grid(row=4, column=0, columnspan=4, pady=12, padx=10, sticky='nsew')
+        # Liste virtualisée des résultats : seules les lignes visibles sont créées dans l'arbre
+        self.result_view = VirtualResultView(self.frame, height=15, on_select=self.on_result_selected)
+        self.result_view.grid(row=4, column=0, columnspan=4, pady=12, padx=10, sticky='nsew')
+        self.result_tree = self.result_view.tree
+
+        # Étiquette d'état de l'index
+        self.status_label = ctk.CTkLabel(self.frame, text="", anchor='w', text_color="gray")
+        self.status_label.grid(row=5, column=0, columnspan=3, padx=10, sticky='ew')
+
+        # Bouton pour afficher les résultats suivants (masqué tant que tous les résultats sont affichés)
+        self.more_button = ctk.CTkButton(self.frame, text="Plus de résultats", command=self.show_more_results, fg_color="#D3D3D3", hover_color="#C0C0C0", text_color="black")
+        self.more_button.grid(row=5, column=3, padx=10, sticky='ew')
+        self.more_button.grid_remove()
+
+        # Panneau de performances (durées par étape et compteurs de la dernière recherche), masqué par défaut
+        self.metrics_checkbox = ctk.CTkCheckBox(self.frame, text="Performances", variable=self.show_metrics, command=self.toggle_metrics)
+        self.metrics_checkbox.grid(row=0, column=3, padx=10, sticky='e')
+        self.metrics_label = ctk.CTkLabel(self.frame, text="", anchor='w', justify='left', text_color="gray", font=("Courier", 12))
+        self.metrics_label.grid(row=6, column=0, columnspan=4, padx=10, sticky='ew')
+        self.metrics_label.grid_remove()
 
         # Style de l'arbre de résultats
         style = ttk.Style()
@@ -153,7 +227,23 @@ class FileSearchApp:
 
     def on_key_release(self, event):
         """ Action déclenchée lors de la saisie dans le champ de recherche. """
-        self.result_tree.delete(*self.result_tree.get_children())
+        # Les touches qui ne modifient pas le texte (flèches, Maj, Ctrl, Tab...) ne relancent pas la recherche
+        search_text = self.search_entry.get().strip()
+        if search_text == self.search_text:
+            return
+        self.search_text = search_text
+        # La recherche en cours est annulée et la nouvelle n'est lancée qu'après une pause de frappe
+        self.search_worker.cancel()
+        if self.pending_search is not None:
+            self.root.after_cancel(self.pending_search)
+        self.pending_search = self.root.after(SEARCH_DEBOUNCE_MS, self.start_search)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def start_search(self):
+        """ Lancer la recherche correspondant au contenu du champ de recherche. """
+        self.pending_search = None
+        self.result_limit = RESULT_PAGE_SIZE
         search_term = self.search_entry.get().strip()
         if search_term:
             self.search_files(search_term)
@@ -164,50 +254,76 @@ class FileSearchApp:
 
     def select_directory(self):
         """ Ouvrir une boîte de dialogue pour sélectionner le répertoire de recherche. """
-        selected_directory = filedialog.askdirectory(initialdir=self.search_directory)
+        selected_directory = filedialog.askdirectory(initialdir=self.search_directories[0])
         if selected_directory:
-            self.search_directory = selected_directory
-            self.update_current_dir_label()
-            messagebox.showinfo("Répertoire sélectionné", f"Répertoire de recherche : {self.search_directory}")
+            self.set_search_directories([selected_directory])
+            messagebox.showinfo("Répertoire sélectionné", f"Répertoire de recherche : {selected_directory}")
+
+    #------------------------------------------------------------------------------------------------#
+
+    def add_directory(self):
+        """ Ouvrir une boîte de dialogue pour ajouter un répertoire de recherche. """
+        selected_directory = filedialog.askdirectory(initialdir=self.search_directories[-1])
+        if not selected_directory:
+            return
+        # Un répertoire inclus dans un répertoire de recherche y est déjà parcouru ; un répertoire parent remplace ceux qu'il contient
+        covering = next((directory for directory in self.search_directories if is_within(os.path.abspath(selected_directory), directory)), None)
+        if covering is not None:
+            messagebox.showinfo("Répertoire déjà inclus", f"{selected_directory} est déjà parcouru avec {covering}.")
+            return
+        self.set_search_directories(self.search_directories + [selected_directory])
+
+    #------------------------------------------------------------------------------------------------#
+
+    def set_search_directories(self, directories):
+        """ Remplacer les répertoires de recherche (un moteur par répertoire) et relancer la recherche. """
+        self.search_worker.cancel()
+        self.engine.close()
+        self.engine = MultiRootEngine(directories, root_timeout=self.root_timeout, watch=True)
+        self.search_directories = self.engine.search_directories
+        self.update_current_dir_label()
+        self.start_search()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def set_root_timeout(self, choice):
+        """ Modifier le délai sans nouveau résultat d'un répertoire (pris en compte dès la recherche en cours). """
+        self.root_timeout = int(choice.split()[-2])
+        self.engine.root_timeout = self.root_timeout
 
     #------------------------------------------------------------------------------------------------#
 
     def update_current_dir_label(self):
-        """ Mettre à jour l'étiquette du répertoire actuel. """
-        self.current_dir_label.configure(text="Répertoire actuel : " + os.path.basename(self.search_directory))
+        """ Mettre à jour l'étiquette des répertoires actuels. """
+        names = ", ".join(os.path.basename(directory) or directory for directory in self.search_directories)
+        label = "Répertoire actuel : " if len(self.search_directories) == 1 else "Répertoires actuels : "
+        self.current_dir_label.configure(text=label + names)
 
     #------------------------------------------------------------------------------------------------#
 
     def search_files(self, search_term):
-        """ Rechercher des fichiers ou des dossiers correspondant au terme de recherche. """
+        """ Rechercher des fichiers ou des dossiers correspondant au terme de recherche (et à ses filtres éventuels). """
+        try:
+            parse_query(search_term)
+        except QuerySyntaxError as e:
+            self.search_worker.cancel()
+            self.result_view.clear()
+            self.status_label.configure(text=f"Requête invalide : {e}")
+            return
         search_type = self.search_type.get()
         file_type = self.file_type.get()
         extensions = self.get_selected_extensions(file_type)
 
-        search_term_lower = search_term.lower()
-        search_pattern = re.compile(re.escape(search_term_lower))
-
-        exact_matches = []
-        partial_matches = []
-
-        for root, dirs, files in os.walk(self.search_directory):
-            if search_type == "fichier":
-                for file in files:
-                    if any(file.lower().endswith(ext) for ext in extensions):
-                        if file.lower() == search_term_lower:
-                            exact_matches.append((file, os.path.join(root, file)))
-                        elif search_pattern.search(file.lower()):
-                            partial_matches.append((file, os.path.join(root, file)))
-                        elif self.search_content_in_file(file, root, search_term):
-                            partial_matches.append((file, os.path.join(root, file)))
-            elif search_type == "dossier":
-                for dir in dirs:
-                    if search_pattern.search(dir.lower()):
-                        partial_matches.append((dir, os.path.join(root, dir)))
-
-        results = sorted(exact_matches + partial_matches, key=lambda x: x[0].lower())
-        for i, (name, path) in enumerate(results):
-            self.display_result(name, path, i)
+        self.run_query(SearchQuery(search_term, search_type, tuple(extensions), self.result_limit))
+
+    #------------------------------------------------------------------------------------------------#
+
+    def show_more_results(self):
+        """ Afficher la page suivante des résultats classés (les correspondances sont reprises de la mémoire). """
+        search_term = self.search_entry.get().strip()
+        if search_term:
+            self.result_limit += RESULT_PAGE_SIZE
+            self.search_files(search_term)
 
     #------------------------------------------------------------------------------------------------#
 
@@ -217,20 +333,85 @@ class FileSearchApp:
         file_type = self.file_type.get()
         extensions = self.get_selected_extensions(file_type)
 
-        all_files = []
+        # La liste complète est triée par nom et n'est pas limitée (la liste des résultats est virtualisée)
+        self.run_query(SearchQuery("", search_type, tuple(extensions), None))
+
+    #------------------------------------------------------------------------------------------------#
+
+    def run_query(self, query):
+        """ Lancer une requête du moteur de recherche dans le thread de recherche. """
+        self.clear_results()
+        self.metrics_before = METRICS.snapshot()
+        self.search_started = time.perf_counter()
+        self.search_results = self.engine.search(query)
+        self.search_worker.submit(self.search_results.run)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def clear_results(self):
+        """ Vider l'arbre de résultats. """
+        self.result_view.clear()
+        self.more_button.grid_remove()
+        self.status_label.configure(text="Recherche en cours...")
+
+    #------------------------------------------------------------------------------------------------#
+
+    def on_search_batch(self, batch):
+        """ Afficher un lot de résultats transmis par le thread de recherche. """
+        with METRICS.timer("ui.render"):
+            self.result_view.extend(result.location for result in batch)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def on_search_done(self):
+        """ Mettre à jour l'étiquette d'état à la fin d'une recherche. """
+        status = f"{len(self.result_view)} résultat(s)"
+        total = self.search_results.total if self.search_results is not None else None
+        if total is not None and total > len(self.result_view):
+            # Seuls les meilleurs résultats sont affichés : les suivants sont disponibles à la demande
+            status += f" sur {total}"
+            self.more_button.grid()
+        failures = getattr(self.search_results, "failures", None)
+        if failures:
+            # Répertoires abandonnés (inaccessibles ou trop lents) : les autres résultats sont affichés
+            status += " — " + ", ".join(f"{os.path.basename(root) or root} : {reason}" for root, reason in failures.items())
+        if self.engine.index_status:
+            status += " — " + self.engine.index_status
+        self.status_label.configure(text=status)
+        if self.show_metrics.get():
+            self.show_search_metrics()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def toggle_metrics(self):
+        """ Afficher ou masquer le panneau de performances. """
+        if self.show_metrics.get():
+            self.metrics_label.configure(text="Les mesures s'afficheront à la prochaine recherche.")
+            self.metrics_label.grid()
+        else:
+            self.metrics_label.grid_remove()
 
-        for root, dirs, files in os.walk(self.search_directory):
-            if search_type == "fichier":
-                for file in files:
-                    if any(file.lower().endswith(ext) for ext in extensions):
-                        all_files.append((file, os.path.join(root, file)))
-            elif search_type == "dossier":
-                for dir in dirs:
-                    all_files.append((dir, os.path.join(root, dir)))
+    #------------------------------------------------------------------------------------------------#
+
+    def show_search_metrics(self):
+        """ Afficher les mesures de la recherche terminée et les ajouter au journal des mesures. """
+        duration = (time.perf_counter() - self.search_started) * 1000
+        delta = snapshot_delta(self.metrics_before, METRICS.snapshot())
+        self.metrics_label.configure(text=f"Recherche {duration:.0f} ms — " + format_delta(delta))
+        query = self.search_results.query if self.search_results is not None else None
+        write_log("search", roots=self.search_directories, query=query._asdict() if query else None, duration_ms=round(duration, 3),
+                  total=self.search_results.total if self.search_results is not None else None,
+                  counters=delta["counters"], stages={stage: round(total, 3) for stage, (_, total) in delta["stages"].items()})
+
+    #------------------------------------------------------------------------------------------------#
 
-        sorted_files = sorted(all_files, key=lambda x: x[0].lower())
-        for i, (name, path) in enumerate(sorted_files):
-            self.display_result(name, path, i)
+    def poll_index_changes(self):
+        """ Réafficher les résultats lorsque la surveillance a modifié l'index. """
+        index_changed = self.engine.index_changed
+        if index_changed.is_set() and not self.search_worker.is_running() and self.pending_search is None:
+            index_changed.clear()
+            self.start_search()
+        self.root.after(1000, self.poll_index_changes)
 
     #------------------------------------------------------------------------------------------------#
 
@@ -242,32 +423,24 @@ class FileSearchApp:
 
     #------------------------------------------------------------------------------------------------#
 
-    def display_result(self, name, full_path, index):
-        """ Afficher un résultat de recherche dans l'arbre de résultats. """
-        tag = 'evenrow' if index % 2 == 0 else 'oddrow'
-        self.result_tree.insert('', 'end', values=(name, full_path), tags=(tag,))
-
-    #------------------------------------------------------------------------------------------------#
-
     def open_selected_item(self, event):
         """ Ouvrir l'élément sélectionné. """
-        selected_item = self.result_tree.focus()
-        values = self.result_tree.item(selected_item, 'values')
-        path = values[1]
-        os.startfile(path)
+        path = self.result_view.selected_path()
+        if path:
+            os.startfile(path)
 
     #------------------------------------------------------------------------------------------------#
 
     def reset_filters(self):
         """ Réinitialiser tous les filtres de recherche. """
         self.search_entry.delete(0, tk.END)
+        self.search_text = ""
         self.search_type.set("fichier")
         self.file_type.set("Tous")
         self.extension_vars.clear()
         for menu in self.extension_menus.values():
             menu.unpost()
         self.extension_menus.clear()
-        self.result_tree.delete(*self.result_tree.get_children())
         self.list_all_files()
 
     #------------------------------------------------------------------------------------------------#
@@ -278,6 +451,10 @@ class FileSearchApp:
                                     "- Filtrez et affinez votre recherche en sélectionnant un type de fichier.\n\n"
                                     "- Cliquez sur le bouton de réinitialisation pour effacer tous les filtres.\n\n"
                                     "- Cliquez sur le bouton de sélection de répertoire pour changer de répertoire de recherche.\n\n"
+                                    "- Ajoutez d'autres répertoires pour y rechercher simultanément ; le délai choisi abandonne "
+                                    "un répertoire qui ne produit plus de résultat (partage lent ou bloqué).\n\n"
+                                    "- Ajoutez des filtres au terme recherché : ext:pdf, size>50MB, modified<7d (moins de 7 jours), "
+                                    "path:Projets, type:dir, un motif comme *.log ou re:^rapport.\n\n"
                                     "- Cliquez une fois pour avoir un aperçu du fichier.\n\n"
                                     "- Double-cliquez sur un résultat pour l'ouvrir.")
 
@@ -285,6 +462,7 @@ class FileSearchApp:
 
     def on_closing(self):
         """ Fermer l'application proprement. """
+        self.engine.close()
         self.root.destroy()
         os._exit(0)
 
@@ -318,55 +496,48 @@ class FileSearchApp:
 
     #------------------------------------------------------------------------------------------------#
 
-    def search_content_in_file(self, file, root, search_term):
-        """ Rechercher un terme dans le contenu des fichiers. """
-        file_path = os.path.join(root, file)
-        try:
-            if file.lower().endswith('.txt'):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return search_term.lower() in f.read().lower()
-            elif file.lower().endswith('.pdf'):
-                with fitz.open(file_path) as doc:
-                    for page in doc:
-                        if search_term.lower() in page.get_text().lower():
-                            return True
-            elif file.lower().endswith('.docx'):
-                doc = Document(file_path)
-                for para in doc.paragraphs:
-                    if search_term.lower() in para.text.lower():
-                        return True
-        except Exception as e:
-            print(f"Erreur lors de la lecture de {file_path}: {str(e).encode('utf-8', errors='ignore')}")
-        return False
+    def preview_selected_item(self, event):
+        """ Prévisualiser l'élément sélectionné. """
+        path = self.result_view.selected_path()
+        if path:
+            self.open_preview_window(path)
+            self.prefetch_neighbours(self.result_view.selected)
 
     #------------------------------------------------------------------------------------------------#
 
-    def preview_selected_item(self, event):
-        """ Prévisualiser l'élément sélectionné. """
-        if self.preview_window:
+    def on_result_selected(self, index):
+        """ Suivre au clavier la sélection : la prévisualisation ouverte affiche le nouveau résultat. """
+        if self.preview_window is not None and self.preview_window.winfo_exists():
+            # Parcours rapide des résultats : une vidéo n'affiche que son image d'aperçu
+            self.open_preview_window(self.result_view.selected_path(), autoplay=False)
+            # La fenêtre de prévisualisation ne doit pas prendre le focus du clavier
+            self.result_tree.focus_set()
+        self.prefetch_neighbours(index)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def open_preview_window(self, path, autoplay=True):
+        """ Ouvrir la fenêtre de prévisualisation pour le fichier sélectionné (préparée une seule fois, puis mise en cache). """
+        if self.preview_window is not None and self.preview_window.winfo_exists():
             self.preview_window.destroy()
-        selected_item = self.result_tree.focus()
-        values = self.result_tree.item(selected_item, 'values')
-        path = values[1]
-        self.open_preview_window(path)
+        self.preview_window = None
+        start = time.perf_counter()
+        try:
+            payload = self.preview_cache.get(path)
+        except Exception as e:
+            print(f"Erreur lors de la prévisualisation de {path}: {str(e).encode('utf-8', errors='ignore')}")
+            return
+        self.preview_window = render_preview(self.root, payload, autoplay)
+        duration = time.perf_counter() - start
+        METRICS.record("preview.open." + payload.kind, duration, path)
+        if self.show_metrics.get():
+            self.metrics_label.configure(text=f"Aperçu ({payload.kind}) {duration * 1000:.0f} ms — {os.path.basename(path)}")
+            write_log("preview", path=path, kind=payload.kind, duration_ms=round(duration * 1000, 3))
 
     #------------------------------------------------------------------------------------------------#
 
-    def open_preview_window(self, path):
-        """ Ouvrir la fenêtre de prévisualisation pour le fichier sélectionné. """
-        if path.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp')):
-            preview_image(self.root, path)
-        elif path.lower().endswith('.txt'):
-            preview_text(self.root, path)
-        elif path.lower().endswith('.pdf'):
-            preview_pdf(self.root, path)
-        elif path.lower().endswith('.docx'):
-            preview_docx(self.root, path)
-        elif any(path.lower().endswith(ext) for ext in ('.py', '.cpp', '.c', '.java', '.js', '.html', '.css')):
-            preview_code(self.root, path)
-        elif path.lower().endswith(('.mp4', '.avi', '.mkv', '.mov')):
-            preview_video(self.root, path)
-        else:
-            preview_generic(self.root, path)
+    def prefetch_neighbours(self, index):
+        """ Préparer à l'avance les prévisualisations des résultats voisins de la sélection. """
+        self.preview_cache.prefetch(self.result_view.neighbours(index, PREFETCH_RADIUS))
 
-#------------------------------------------------------------------------------------------------#
\ No newline at end of file
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,428 @@
+import os
+import hashlib
+import sqlite3
+import time
+from collections import namedtuple
+from contextlib import closing, contextmanager
+from pathlib import Path
+from .walker import TreeWalker
+from .entry_store import EntryStore
+from .metrics import METRICS
+
+#------------------------------------------------------------------------------------------------#
+
+# Dossier où sont stockés les index (un fichier SQLite par répertoire de recherche)
+INDEX_DIR = Path.home() / ".smart_file_search" / "index"
+
+# Version du schéma : un index d'une autre version est reconstruit
+SCHEMA_VERSION = "3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    extension TEXT NOT NULL,
+    is_dir INTEGER NOT NULL,
+    size INTEGER NOT NULL DEFAULT 0,
+    mtime REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_type_ext ON entries (is_dir, extension);
+CREATE INDEX IF NOT EXISTS idx_entries_parent ON entries (parent);
+"""
+
+# Extension du fichier des entrées compactes (EntryStore), enregistré à côté de l'index SQLite
+STORE_SUFFIX = ".entries"
+
+# Statistiques d'un rafraîchissement incrémental
+RefreshStats = namedtuple("RefreshStats", ["rescanned", "skipped"])
+
+#------------------------------------------------------------------------------------------------#
+
+def index_path_for(search_directory, index_dir=INDEX_DIR, suffix=".sqlite3"):
+    """ Obtenir le chemin du fichier d'index associé à un répertoire de recherche. """
+    key = hashlib.sha1(os.path.abspath(search_directory).encode('utf-8', errors='surrogateescape')).hexdigest()
+    return os.path.join(index_dir, key + suffix)
+
+#------------------------------------------------------------------------------------------------#
+
+def make_entry(parent, name, is_dir, size=0, mtime=0.0):
+    """ Construire une ligne de la table des entrées. """
+    extension = "" if is_dir else os.path.splitext(name)[1].lower()
+    return (os.path.join(parent, name), parent, name, name.lower(), extension, int(is_dir), size, mtime)
+
+#------------------------------------------------------------------------------------------------#
+
+def stat_entry(path):
+    """ Obtenir la taille et la date de modification d'une entrée : (taille, mtime), ou (0, 0) si inaccessible. """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return 0, 0.0
+    return st.st_size, st.st_mtime
+
+#------------------------------------------------------------------------------------------------#
+
+def entry_stat(entry):
+    """ Obtenir la taille et la date de modification d'un os.DirEntry : (taille, mtime), ou (0, 0) si inaccessible. """
+    try:
+        st = entry.stat()
+    except OSError:
+        return 0, 0.0
+    return st.st_size, st.st_mtime
+
+#------------------------------------------------------------------------------------------------#
+
+def read_directory(path):
+    """ Lire le contenu d'un dossier : retourne {nom: (est_dossier, est_lien, taille, mtime, périphérique)}. """
+    listing = {}
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+                is_link = is_dir and entry.is_symlink()
+            except OSError:
+                is_dir = is_link = False
+            try:
+                st = entry.stat()
+                size, mtime, dev = st.st_size, st.st_mtime, st.st_dev
+            except OSError:
+                size, mtime, dev = 0, 0.0, None
+            listing[entry.name] = (is_dir, is_link, size, mtime, dev)
+    return listing
+
+#------------------------------------------------------------------------------------------------#
+
+class FileIndex:
+    """ Index persistant des noms de fichiers et de dossiers d'un répertoire de recherche.
+
+    L'index est stocké dans un fichier SQLite propre à chaque répertoire racine. Il est construit
+    une seule fois puis réutilisé d'un lancement à l'autre, ce qui évite de parcourir toute
+    l'arborescence à chaque frappe dans la barre de recherche.
+
+    Attributes:
+    - search_directory (str): Le répertoire racine indexé.
+    - index_path (str): Le chemin du fichier SQLite de l'index.
+    - store_path (str): Le chemin du fichier des entrées compactes, projeté en mémoire par la recherche.
+    - walker (TreeWalker): Le parcours du répertoire (exclusions, profondeur, système de fichiers).
+
+    Methods:
+    - exists(): Indiquer si un index complet existe pour ce répertoire.
+    - build(): Construire (ou reconstruire) l'index en parcourant le répertoire.
+    - list_entries(search_type, extensions): Lister les entrées du type et des extensions donnés.
+    - search_names(search_term, search_type, extensions): Rechercher les entrées dont le nom contient le terme.
+    - non_matching_files(search_term, extensions): Lister les fichiers dont le nom ne contient pas le terme.
+    - refresh(): Relire uniquement les dossiers dont la date de modification a changé.
+    - refresh_directories(paths): Relire les dossiers donnés (et leurs nouveaux sous-dossiers).
+    - transaction(conn): Regrouper des modifications dans une seule connexion et une seule validation.
+    - add_path(path, is_dir, conn): Ajouter une entrée à l'index.
+    - remove_path(path, conn): Retirer une entrée (et son contenu s'il s'agit d'un dossier) de l'index.
+    - directories(): Lister les dossiers suivis par l'index.
+    - all_entries(): Lister toutes les entrées de l'index.
+    - entry_store(): Obtenir les entrées sous forme compacte (EntryStore).
+    - update_stat(path, conn): Mettre à jour la taille et la date de modification d'un fichier.
+    """
+
+    def __init__(self, search_directory, index_dir=INDEX_DIR, walker=None):
+        self.search_directory = os.path.abspath(search_directory)
+        self.index_path = index_path_for(self.search_directory, index_dir)
+        self.store_path = index_path_for(self.search_directory, index_dir, STORE_SUFFIX)
+        self.walker = walker or TreeWalker(self.search_directory)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def connect(self, path=None):
+        """ Ouvrir une connexion SQLite vers l'index (une connexion par opération). """
+        return closing(sqlite3.connect(path or self.index_path))
+
+    #------------------------------------------------------------------------------------------------#
+
+    @contextmanager
+    def transaction(self, conn=None):
+        """ Utiliser la connexion donnée (lot d'opérations validé par l'appelant) ou en ouvrir une, validée à la fin. """
+        if conn is not None:
+            yield conn
+            return
+        with self.connect() as conn:
+            yield conn
+            conn.commit()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def exists(self):
+        """ Indiquer si un index complet, construit avec les mêmes options de parcours, existe pour ce répertoire. """
+        if not os.path.isfile(self.index_path):
+            return False
+        try:
+            with self.connect() as conn:
+                meta = dict(conn.execute("SELECT key, value FROM meta"))
+            return "built_at" in meta and meta.get("version") == SCHEMA_VERSION and meta.get("walk_options") == self.walker.options_key()
+        except sqlite3.Error:
+            return False
+
+    #------------------------------------------------------------------------------------------------#
+
+    def build(self):
+        """ Construire l'index en parcourant le répertoire. Retourne True si l'index a été créé. """
+        with METRICS.timer("index.build", self.search_directory):
+            return self.build_index()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def build_index(self):
+        """ Parcourir le répertoire et remplacer l'index. """
+        tmp_path = self.index_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            with self.connect(tmp_path) as conn:
+                conn.executescript(SCHEMA)
+                batch = []
+                dir_rows = []
+                for root, dirs, files in self.walker.walk():
+                    try:
+                        dir_rows.append((root, os.stat(root).st_mtime_ns))
+                    except OSError:
+                        pass
+                    batch.extend(make_entry(root, entry.name, True, *entry_stat(entry)) for entry in dirs)
+                    batch.extend(make_entry(root, entry.name, False, *entry_stat(entry)) for entry in files)
+                    if len(batch) >= 5000:
+                        conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+                        batch.clear()
+                conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+                conn.executemany("INSERT OR REPLACE INTO dirs VALUES (?, ?)", dir_rows)
+                conn.executemany("INSERT OR REPLACE INTO meta VALUES (?, ?)", [
+                    ("root", self.search_directory),
+                    ("version", SCHEMA_VERSION),
+                    ("walk_options", self.walker.options_key()),
+                    ("built_at", str(time.time())),
+                ])
+                conn.commit()
+            # Le remplacement atomique garantit qu'un index partiel n'est jamais utilisé
+            os.replace(tmp_path, self.index_path)
+            return True
+        except (OSError, sqlite3.Error) as e:
+            print(f"Erreur lors de la construction de l'index de {self.search_directory}: {e}")
+            return False
+
+    #------------------------------------------------------------------------------------------------#
+
+    def type_filter(self, search_type, extensions):
+        """ Construire la clause SQL filtrant le type d'entrée et les extensions. """
+        if search_type == "dossier":
+            return "is_dir = 1", []
+        extensions = sorted({ext.lower() for ext in extensions})
+        placeholders = ", ".join("?" for _ in extensions)
+        return f"is_dir = 0 AND extension IN ({placeholders})", extensions
+
+    #------------------------------------------------------------------------------------------------#
+
+    def query(self, where, params, columns="name, path"):
+        """ Exécuter une requête sur les entrées, triées par nom (colonnes par défaut : nom, chemin). """
+        with self.connect() as conn:
+            return conn.execute(f"SELECT {columns} FROM entries WHERE {where} ORDER BY name_lower", params).fetchall()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def list_entries(self, search_type, extensions):
+        """ Lister les entrées du type et des extensions donnés, triées par nom : (nom, chemin, mtime). """
+        if search_type != "dossier" and not extensions:
+            return []
+        where, params = self.type_filter(search_type, extensions)
+        return self.query(where, params, "name, path, mtime")
+
+    #------------------------------------------------------------------------------------------------#
+
+    def search_names(self, search_term, search_type, extensions):
+        """ Rechercher les entrées dont le nom contient le terme : retourne les (nom, chemin, mtime) triés par nom. """
+        if search_type != "dossier" and not extensions:
+            return []
+        where, params = self.type_filter(search_type, extensions)
+        return self.query(f"{where} AND instr(name_lower, ?) > 0", params + [search_term.lower()], "name, path, mtime")
+
+    #------------------------------------------------------------------------------------------------#
+
+    def non_matching_files(self, search_term, extensions):
+        """ Lister les fichiers des extensions données dont le nom ne contient pas le terme : (nom, chemin, mtime). """
+        if not extensions:
+            return []
+        where, params = self.type_filter("fichier", extensions)
+        return self.query(f"{where} AND instr(name_lower, ?) = 0", params + [search_term.lower()], "name, path, mtime")
+
+    #------------------------------------------------------------------------------------------------#
+
+    def refresh(self):
+        """ Relire uniquement les dossiers dont la date de modification a changé depuis le dernier parcours.
+
+        Les dossiers inchangés ne sont pas relus : seul un stat est effectué pour pouvoir descendre
+        dans leurs sous-dossiers. Retourne un RefreshStats(rescanned, skipped).
+        """
+        try:
+            with METRICS.timer("index.refresh", self.search_directory), self.connect() as conn:
+                stats = self.refresh_from(conn, [self.search_directory])
+                conn.commit()
+            return stats
+        except sqlite3.Error as e:
+            print(f"Erreur lors du rafraîchissement de l'index de {self.search_directory}: {e}")
+            return RefreshStats(0, 0)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def refresh_directories(self, paths):
+        """ Relire les dossiers donnés, quelle que soit leur date de modification. """
+        with self.connect() as conn:
+            for path in paths:
+                conn.execute("DELETE FROM dirs WHERE path = ?", (path,))
+            stats = self.refresh_from(conn, list(paths))
+            conn.commit()
+        return stats
+
+    #------------------------------------------------------------------------------------------------#
+
+    def refresh_from(self, conn, start_dirs):
+        """ Parcourir les dossiers à partir de start_dirs en ne relisant que ceux qui ont changé. """
+        known = dict(conn.execute("SELECT path, mtime_ns FROM dirs"))
+        walker = self.walker
+        rescanned = skipped = 0
+        stack = list(start_dirs)
+        while stack:
+            directory = stack.pop()
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+                if known.get(directory) == mtime_ns:
+                    skipped += 1
+                    subdirs = conn.execute("SELECT path FROM entries WHERE parent = ? AND is_dir = 1", (directory,))
+                    stack.extend(path for (path,) in subdirs if path in known)
+                    continue
+                start = time.perf_counter()
+                listing = read_directory(directory)
+                METRICS.record("walk.scandir", time.perf_counter() - start, directory)
+                METRICS.add("dirs_visited")
+                listing = {name: info for name, info in listing.items() if not walker.excluded(os.path.join(directory, name), info[0])}
+            except OSError:
+                # Dossier supprimé ou devenu inaccessible
+                if directory != self.search_directory:
+                    self.remove_tree(conn, directory)
+                continue
+
+            rescanned += 1
+            indexed = dict(conn.execute("SELECT name, is_dir FROM entries WHERE parent = ?", (directory,)))
+            for name, is_dir in indexed.items():
+                if name not in listing or listing[name][0] != bool(is_dir):
+                    self.remove_tree(conn, os.path.join(directory, name))
+            # Toutes les entrées du dossier relu sont réécrites pour mettre à jour leur taille et leur date
+            entries = [make_entry(directory, name, is_dir, size, mtime) for name, (is_dir, _, size, mtime, _) in listing.items()]
+            conn.executemany("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)", entries)
+            conn.execute("INSERT OR REPLACE INTO dirs VALUES (?, ?)", (directory, mtime_ns))
+            # Comme os.walk, on ne descend pas dans les liens symboliques vers des dossiers
+            stack.extend(os.path.join(directory, name) for name, (is_dir, is_link, _, _, dev) in listing.items()
+                         if is_dir and not is_link and walker.may_descend(os.path.join(directory, name), dev))
+        return RefreshStats(rescanned, skipped)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def remove_tree(self, conn, path):
+        """ Retirer une entrée et tout son contenu de l'index. """
+        prefix = os.path.join(path, "")
+        conn.execute("DELETE FROM entries WHERE path = ? OR substr(path, 1, ?) = ?", (path, len(prefix), prefix))
+        conn.execute("DELETE FROM dirs WHERE path = ? OR substr(path, 1, ?) = ?", (path, len(prefix), prefix))
+
+    #------------------------------------------------------------------------------------------------#
+
+    def touch_directory(self, conn, directory):
+        """ Enregistrer la date de modification actuelle d'un dossier déjà à jour dans l'index. """
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            return
+        conn.execute("UPDATE dirs SET mtime_ns = ? WHERE path = ?", (mtime_ns, directory))
+
+    #------------------------------------------------------------------------------------------------#
+
+    def add_path(self, path, is_dir, conn=None):
+        """ Ajouter une entrée à l'index (le contenu d'un nouveau dossier est indexé aussi), sauf si elle est exclue. """
+        if self.walker.excluded(path, is_dir):
+            return
+        parent, name = os.path.split(path)
+        with self.transaction(conn) as conn:
+            conn.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)", make_entry(parent, name, is_dir, *stat_entry(path)))
+            self.touch_directory(conn, parent)
+            if is_dir and not os.path.islink(path) and self.walker.may_descend(path):
+                self.refresh_from(conn, [path])
+
+    #------------------------------------------------------------------------------------------------#
+
+    def remove_path(self, path, conn=None):
+        """ Retirer une entrée (et son contenu s'il s'agit d'un dossier) de l'index. """
+        with self.transaction(conn) as conn:
+            self.remove_tree(conn, path)
+            self.touch_directory(conn, os.path.dirname(path))
+
+    #------------------------------------------------------------------------------------------------#
+
+    def directories(self):
+        """ Lister les dossiers suivis par l'index. """
+        with self.connect() as conn:
+            return [path for (path,) in conn.execute("SELECT path FROM dirs")]
+
+    #------------------------------------------------------------------------------------------------#
+
+    def all_entries(self):
+        """ Lister toutes les entrées de l'index : (nom, chemin, extension, est_dossier, taille, mtime). """
+        with self.connect() as conn:
+            return conn.execute("SELECT name, path, extension, is_dir, size, mtime FROM entries").fetchall()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def source_stamp(self):
+        """ Obtenir l'état (mtime_ns, taille) du fichier SQLite, qui change à chaque écriture. """
+        try:
+            st = os.stat(self.index_path)
+        except OSError:
+            return None
+        return [st.st_mtime_ns, st.st_size]
+
+    #------------------------------------------------------------------------------------------------#
+
+    def entry_store(self):
+        """
+        Obtenir les entrées de l'index sous forme compacte.
+
+        Le fichier des entrées est projeté en mémoire s'il correspond à l'état actuel de l'index SQLite ;
+        sinon il est reconstruit (les lignes sont lues une à une) puis enregistré pour les ouvertures suivantes.
+
+        Returns:
+        EntryStore: Les entrées de l'index.
+        """
+        source = self.source_stamp()
+        store = EntryStore.load(self.store_path)
+        if store is not None and source is not None and store.source == source and store.root == self.search_directory:
+            return store
+        with self.connect() as conn:
+            rows = conn.execute("SELECT parent, name, extension, is_dir, size, mtime FROM entries")
+            store = EntryStore.from_rows(self.search_directory, rows, source)
+        try:
+            store.save(self.store_path)
+        except OSError as e:
+            print(f"Erreur lors de l'enregistrement des entrées de {self.search_directory}: {e}")
+        return store
+
+    #------------------------------------------------------------------------------------------------#
+
+    def update_stat(self, path, conn=None):
+        """ Mettre à jour la taille et la date de modification d'un fichier modifié sur place. """
+        size, mtime = stat_entry(path)
+        with self.transaction(conn) as conn:
+            conn.execute("UPDATE entries SET size = ?, mtime = ? WHERE path = ?", (size, mtime, path))
+
+#------------------------------------------------------------------------------------------------#
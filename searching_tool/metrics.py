@@ -0,0 +1,271 @@
+import os
+import json
+import time
+import heapq
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+#------------------------------------------------------------------------------------------------#
+
+# Journal des mesures (une ligne JSON par recherche ou prévisualisation), écrit si l'enregistrement est activé
+METRICS_LOG = Path.home() / ".smart_file_search" / "metrics.jsonl"
+
+# Bornes supérieures (ms) des classes des histogrammes de durées : puissances de 2 de 0,125 ms à ~35 min
+HISTOGRAM_BOUNDS = tuple(0.125 * 2 ** i for i in range(25))
+
+# Nombre d'éléments (dossiers, fichiers) les plus lents conservés par étape
+SLOWEST_KEPT = 20
+
+# Libellés des étapes et des compteurs dans le panneau de performances
+STAGE_LABELS = {
+    "walk.scandir": "parcours",
+    "index.build": "index",
+    "index.refresh": "rafraîchissement",
+    "search.names": "noms",
+    "search.content": "contenu",
+    "search.filter": "filtres",
+    "search.rank": "tri",
+    "search.list": "liste",
+    "extract": "extraction",
+    "ui.render": "affichage",
+    "preview.open": "aperçu",
+}
+COUNTER_LABELS = {
+    "dirs_visited": "dossiers",
+    "files_matched": "correspondances",
+    "bytes_read": "octets lus",
+    "files_extracted": "extraits",
+    "rows_rendered": "lignes",
+}
+
+#------------------------------------------------------------------------------------------------#
+
+class Histogram:
+    """ Histogramme des durées d'une étape, par classes de largeur croissante (puissances de 2).
+
+    Attributes:
+    - counts (list): Le nombre de mesures de chaque classe (la dernière reçoit les dépassements).
+    - count (int): Le nombre de mesures.
+    - total (float): La somme des durées, en ms.
+    - max (float): La plus longue durée, en ms.
+
+    Methods:
+    - add(ms): Ajouter une mesure.
+    - percentile(q): Estimer un centile (borne supérieure de sa classe).
+    - to_dict(): Obtenir le résumé et les classes non vides.
+    """
+
+    def __init__(self):
+        self.counts = [0] * (len(HISTOGRAM_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    #------------------------------------------------------------------------------------------------#
+
+    def add(self, ms):
+        """ Ajouter une mesure (en ms). """
+        bucket = 0
+        while bucket < len(HISTOGRAM_BOUNDS) and ms > HISTOGRAM_BOUNDS[bucket]:
+            bucket += 1
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def percentile(self, q):
+        """ Estimer le centile q (0 à 100) : la borne supérieure de la classe qui le contient, en ms. """
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(HISTOGRAM_BOUNDS[bucket], self.max) if bucket < len(HISTOGRAM_BOUNDS) else self.max
+        return self.max
+
+    #------------------------------------------------------------------------------------------------#
+
+    def to_dict(self):
+        """ Obtenir le résumé (nombre, total, p50, p95, max) et les classes non vides {borne_ms: nombre}. """
+        buckets = {}
+        for bucket, count in enumerate(self.counts):
+            if count:
+                buckets[str(HISTOGRAM_BOUNDS[bucket]) if bucket < len(HISTOGRAM_BOUNDS) else "inf"] = count
+        return {
+            "count": self.count,
+            "total_ms": round(self.total, 3),
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "max_ms": round(self.max, 3),
+            "buckets": buckets,
+        }
+
+#------------------------------------------------------------------------------------------------#
+
+class Metrics:
+    """ Mesures des chemins critiques : durées par étape, compteurs et éléments les plus lents.
+
+    Les mesures sont agrégées en mémoire (thread-safe) et restent disponibles sous forme de
+    résumé (snapshot), d'écart entre deux résumés (pour une seule recherche) ou d'export JSON
+    complet avec les histogrammes. Les étapes peuvent être détaillées par type de fichier
+    ("extract.pdf") et retenir leurs dossiers ou fichiers les plus lents.
+
+    Attributes:
+    - histograms (dict): L'histogramme des durées de chaque étape.
+    - counters (dict): La valeur de chaque compteur.
+    - slowest (dict): Pour chaque étape, les (durée_ms, élément) les plus lents.
+    - enabled (bool): Les mesures sont ignorées lorsque False.
+
+    Methods:
+    - timer(stage, key): Mesurer la durée d'un bloc (gestionnaire de contexte).
+    - record(stage, seconds, key): Enregistrer une durée.
+    - add(counter, value): Incrémenter un compteur.
+    - snapshot(): Obtenir les totaux actuels.
+    - export(): Obtenir toutes les mesures (histogrammes, éléments les plus lents).
+    - reset(): Effacer les mesures.
+    """
+
+    def __init__(self, enabled=True):
+        self.lock = threading.Lock()
+        self.enabled = enabled
+        self.histograms = {}
+        self.counters = {}
+        self.slowest = {}
+
+    #------------------------------------------------------------------------------------------------#
+
+    @contextmanager
+    def timer(self, stage, key=None):
+        """ Mesurer la durée d'un bloc et l'enregistrer pour l'étape (et l'élément key, par exemple un dossier). """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, key)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def record(self, stage, seconds, key=None):
+        """ Enregistrer une durée (en secondes) pour une étape. """
+        if not self.enabled:
+            return
+        ms = seconds * 1000
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.add(ms)
+            if key is not None:
+                slowest = self.slowest.setdefault(stage, [])
+                if len(slowest) < SLOWEST_KEPT:
+                    heapq.heappush(slowest, (ms, key))
+                elif ms > slowest[0][0]:
+                    heapq.heapreplace(slowest, (ms, key))
+
+    #------------------------------------------------------------------------------------------------#
+
+    def add(self, counter, value=1):
+        """ Incrémenter un compteur. """
+        if not self.enabled or not value:
+            return
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    #------------------------------------------------------------------------------------------------#
+
+    def snapshot(self):
+        """ Obtenir les totaux actuels : {"counters": {nom: valeur}, "stages": {étape: (nombre, total_ms)}}. """
+        with self.lock:
+            return {
+                "counters": dict(self.counters),
+                "stages": {stage: (histogram.count, histogram.total) for stage, histogram in self.histograms.items()},
+            }
+
+    #------------------------------------------------------------------------------------------------#
+
+    def export(self):
+        """ Obtenir toutes les mesures : compteurs, histogrammes par étape et éléments les plus lents. """
+        with self.lock:
+            return {
+                "counters": dict(self.counters),
+                "stages": {stage: histogram.to_dict() for stage, histogram in sorted(self.histograms.items())},
+                "slowest": {stage: [[key, round(ms, 3)] for ms, key in sorted(items, reverse=True)]
+                            for stage, items in sorted(self.slowest.items())},
+            }
+
+    #------------------------------------------------------------------------------------------------#
+
+    def reset(self):
+        """ Effacer les mesures. """
+        with self.lock:
+            self.histograms.clear()
+            self.counters.clear()
+            self.slowest.clear()
+
+#------------------------------------------------------------------------------------------------#
+
+# Mesures du processus, alimentées par le moteur, l'extraction et l'interface
+METRICS = Metrics()
+
+#------------------------------------------------------------------------------------------------#
+
+def snapshot_delta(before, after):
+    """ Obtenir l'écart entre deux résumés : les mesures prises entre les deux (par exemple pendant une recherche). """
+    counters = {name: value - before["counters"].get(name, 0) for name, value in after["counters"].items()}
+    stages = {}
+    for stage, (count, total) in after["stages"].items():
+        previous_count, previous_total = before["stages"].get(stage, (0, 0.0))
+        if count > previous_count:
+            stages[stage] = (count - previous_count, total - previous_total)
+    return {"counters": {name: value for name, value in counters.items() if value}, "stages": stages}
+
+#------------------------------------------------------------------------------------------------#
+
+def stage_total(stages, prefix):
+    """ Additionner les durées (ms) d'une étape et de ses détails ("extract" et "extract.pdf"...). """
+    return sum(total for stage, (_, total) in stages.items() if stage == prefix or stage.startswith(prefix + "."))
+
+#------------------------------------------------------------------------------------------------#
+
+def format_delta(delta):
+    """ Formater l'écart entre deux résumés pour le panneau de performances. """
+    stages = delta["stages"]
+    parts = []
+    for stage, label in STAGE_LABELS.items():
+        total = stage_total(stages, stage)
+        if total:
+            parts.append(f"{label} {total:.0f} ms" if total >= 1 else f"{label} {total:.2f} ms")
+    counters = []
+    for counter, label in COUNTER_LABELS.items():
+        value = delta["counters"].get(counter)
+        if value:
+            counters.append(f"{format_bytes(value)} lus" if counter == "bytes_read" else f"{value} {label}")
+    return " · ".join(parts) + (" | " + ", ".join(counters) if counters else "")
+
+#------------------------------------------------------------------------------------------------#
+
+def format_bytes(size):
+    """ Formater une taille en octets (Ko, Mo, Go). """
+    for unit in ("o", "Ko", "Mo", "Go"):
+        if size < 1024 or unit == "Go":
+            return f"{size:.0f} {unit}" if unit == "o" else f"{size:.1f} {unit}"
+        size /= 1024
+
+#------------------------------------------------------------------------------------------------#
+
+def write_log(event, path=METRICS_LOG, **fields):
+    """ Ajouter une ligne JSON au journal des mesures (horodatage, événement et champs donnés). """
+    record = {"time": round(time.time(), 3), "event": event, **fields}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"Erreur lors de l'écriture du journal des mesures: {e}")
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,341 @@
+import os
+import time
+import queue
+import threading
+from collections import deque
+from .index import INDEX_DIR
+from .engine import SearchEngine
+
+#------------------------------------------------------------------------------------------------#
+
+# Délai (s) pour qu'un répertoire réponde (montage réseau bloqué, disque déconnecté...)
+ROOT_PROBE_TIMEOUT = 5
+
+# Délai (s) sans nouveau résultat d'un répertoire : au-delà, sa recherche est considérée bloquée et ses résultats partiels sont utilisés
+ROOT_TIMEOUT = 60
+
+# Délai (s) pendant lequel un répertoire resté sans réponse est ignoré avant d'être de nouveau interrogé
+ROOT_RETRY_DELAY = 30
+
+# Intervalle (s) de vérification de l'annulation et des délais
+POLL_INTERVAL = 0.1
+
+#------------------------------------------------------------------------------------------------#
+
+def is_within(path, directory):
+    """ Indiquer si un chemin absolu est le répertoire donné ou se trouve sous celui-ci. """
+    path, directory = os.path.normcase(path), os.path.normcase(directory)
+    return path == directory or path.startswith(directory.rstrip(os.sep) + os.sep)
+
+#------------------------------------------------------------------------------------------------#
+
+def normalize_roots(directories):
+    """ Obtenir les chemins absolus des répertoires de recherche, dans l'ordre donné, sans doublon ni
+    répertoire inclus dans un autre (ses entrées seraient indexées et comptées deux fois). """
+    roots = []
+    for directory in directories:
+        root = os.path.abspath(directory)
+        if any(is_within(root, other) for other in roots):
+            continue
+        roots = [other for other in roots if not is_within(other, root)]
+        roots.append(root)
+    return roots
+
+#------------------------------------------------------------------------------------------------#
+
+class MultiRootResults:
+    """ Itérateur sur les résultats fusionnés d'une recherche dans plusieurs répertoires.
+
+    Chaque répertoire est interrogé en parallèle, dans son propre thread, par son moteur. Les
+    résultats d'un répertoire arrivent classés (correspondances sur le nom, puis sur le seul
+    contenu) : ils sont fusionnés au fur et à mesure, et un résultat est produit dès qu'aucun
+    répertoire encore actif ne peut en fournir un mieux classé. Les correspondances sur le nom
+    sont ainsi affichées sans attendre la lecture du contenu des autres répertoires. Un répertoire
+    qui ne répond pas dans ROOT_PROBE_TIMEOUT, ou dont la recherche ne progresse plus (aucun
+    résultat pendant ROOT_TIMEOUT), est abandonné (ses résultats déjà reçus sont conservés) sans
+    retarder les autres ; une recherche longue qui progresse n'est jamais interrompue.
+
+    Attributes:
+    - query (SearchQuery): La recherche effectuée.
+    - total (int): Le nombre total de correspondances, ou None tant que la recherche n'est pas terminée.
+    - failures (dict): Les répertoires abandonnés, ignorés ou en erreur, avec la raison.
+
+    Methods:
+    - run(cancel_event): Générer les résultats en s'arrêtant dès que cancel_event est signalé.
+    """
+
+    def __init__(self, multi_engine, query):
+        self.multi_engine = multi_engine
+        self.query = query
+        self.total = None
+        self.failures = {}
+
+    #------------------------------------------------------------------------------------------------#
+
+    def __iter__(self):
+        return self.run(threading.Event())
+
+    #------------------------------------------------------------------------------------------------#
+
+    def sort_key(self, result):
+        """ Clé de fusion : score décroissant pour une recherche, nom pour une liste complète. """
+        if not self.query.search_term:
+            return (result.name.lower(), result.path)
+        return (-result.score, result.name.lower(), result.path)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def run(self, cancel_event):
+        """ Générer les résultats fusionnés en s'arrêtant dès que cancel_event est signalé. """
+        multi_engine = self.multi_engine
+        messages = queue.Queue()
+        # Les recherches abandonnées (délai dépassé) sont annulées dès qu'elles redonnent la main
+        roots_cancel = threading.Event()
+        pending = set()
+        for root, engine in multi_engine.engines.items():
+            reason = multi_engine.unavailable(root)
+            if reason:
+                self.failures[root] = reason
+                continue
+            pending.add(root)
+            threading.Thread(target=self.search_root, args=(root, engine, roots_cancel, messages), daemon=True).start()
+
+        start = time.monotonic()
+        probed = set()
+        # Instant du dernier message de chaque répertoire : le délai ne mesure que l'absence de progrès
+        last_progress = dict.fromkeys(pending, start)
+        # Résultats reçus et non encore produits, et borne inférieure des suivants (None : rien reçu)
+        buffers = {root: deque() for root in pending}
+        bounds = dict.fromkeys(pending)
+        phases = dict.fromkeys(pending, 0)
+        received = dict.fromkeys(pending, 0)
+        totals = {}
+        seen = set()
+        limit = self.query.limit
+        try:
+            while pending or any(buffers.values()):
+                if cancel_event.is_set():
+                    return
+                if pending:
+                    try:
+                        message = messages.get(timeout=POLL_INTERVAL)
+                    except queue.Empty:
+                        message = None
+                    # Les messages déjà arrivés sont traités ensemble avant de produire des résultats
+                    while message is not None:
+                        last_progress[message[0]] = time.monotonic()
+                        self.handle_message(message, pending, probed, buffers, bounds, phases, received, totals)
+                        try:
+                            message = messages.get_nowait()
+                        except queue.Empty:
+                            message = None
+                    now = time.monotonic()
+                    for root in list(pending):
+                        if root not in probed:
+                            if now - start > multi_engine.probe_timeout:
+                                pending.discard(root)
+                                multi_engine.mark_unreachable(root)
+                                self.failures[root] = "inaccessible (délai dépassé)"
+                        elif now - last_progress[root] > multi_engine.root_timeout:
+                            pending.discard(root)
+                            self.failures[root] = f"sans progrès depuis {multi_engine.root_timeout:g} s (résultats partiels)"
+
+                # Fusion : le meilleur résultat reçu est produit si aucun répertoire actif ne peut en fournir un meilleur
+                while limit is None or len(seen) < limit:
+                    heads = [(buffers[root][0][0], root) for root in buffers if buffers[root]]
+                    if not heads:
+                        break
+                    key, root = min(heads)
+                    if any(not buffers[other] and (bounds[other] is None or bounds[other] < key) for other in pending):
+                        break
+                    _, result = buffers[root].popleft()
+                    # Seule l'empreinte des chemins produits est conservée, pas les chemins eux-mêmes
+                    path_hash = hash(result.path)
+                    if path_hash not in seen:
+                        seen.add(path_hash)
+                        yield result
+                if limit is not None and len(seen) >= limit:
+                    # Les résultats suivants ne sont plus produits, mais les totaux restent attendus
+                    for buffer in buffers.values():
+                        buffer.clear()
+        finally:
+            roots_cancel.set()
+
+        if not cancel_event.is_set():
+            self.total = sum(total for total in totals.values() if total is not None)
+            # Les correspondances d'un répertoire abandonné ne sont connues que partiellement
+            self.total += sum(count for root, count in received.items() if root not in totals)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def handle_message(self, message, pending, probed, buffers, bounds, phases, received, totals):
+        """ Prendre en compte un message du thread d'un répertoire. """
+        root, kind, value = message
+        if root not in pending:
+            return
+        if kind == "probed":
+            probed.add(root)
+        elif kind == "result":
+            # Les correspondances sur le seul contenu sont toujours classées après celles sur le nom
+            key = (phases[root], self.sort_key(value))
+            buffers[root].append((key, value))
+            bounds[root] = key
+            received[root] += 1
+        elif kind == "names":
+            phases[root] = 1
+            bounds[root] = (1,)
+        elif kind == "done":
+            pending.discard(root)
+            totals[root] = value
+        else:
+            pending.discard(root)
+            self.failures[root] = f"erreur : {value}"
+
+    #------------------------------------------------------------------------------------------------#
+
+    def search_root(self, root, engine, cancel_event, messages):
+        """ Rechercher dans un répertoire (exécuté dans un thread par répertoire). """
+        try:
+            # Un montage bloqué l'est dès la première lecture : celle-ci sert de test d'accessibilité
+            self.multi_engine.probe(root)
+            if cancel_event.is_set():
+                return
+            messages.put((root, "probed", None))
+            results = engine.search(self.query)
+            results.on_names_done = lambda: messages.put((root, "names", None))
+            for result in results.run(cancel_event):
+                messages.put((root, "result", result))
+            messages.put((root, "done", results.total))
+        except Exception as e:
+            messages.put((root, "error", str(e).encode('utf-8', errors='ignore').decode('utf-8')))
+
+#------------------------------------------------------------------------------------------------#
+
+class MultiRootEngine:
+    """ Recherche simultanée dans plusieurs répertoires (dossiers locaux, partages, montages).
+
+    Chaque répertoire a son propre moteur (index, surveillance, mémoire des recherches). Avec un seul
+    répertoire, la recherche est celle de son moteur : les résultats sont transmis au fur et à mesure.
+    Un répertoire resté sans réponse (montage réseau bloqué) est ignoré pendant retry_delay secondes,
+    puis tant que sa dernière lecture reste bloquée : les recherches suivantes n'ajoutent pas de thread bloqué.
+
+    Attributes:
+    - search_directories (list): Les répertoires de recherche.
+    - engines (dict): Le moteur de chaque répertoire.
+    - index_changed (threading.Event): Signalé lorsque la surveillance a modifié l'index d'un des répertoires.
+    - probe_timeout (float): Le délai de réponse d'un répertoire, en secondes.
+    - root_timeout (float): Le délai sans nouveau résultat au-delà duquel la recherche d'un répertoire est abandonnée, en secondes.
+    - retry_delay (float): Le délai avant d'interroger de nouveau un répertoire resté sans réponse, en secondes.
+
+    Methods:
+    - search(query): Retourner l'itérateur des résultats d'une recherche.
+    - probe(root): Vérifier qu'un répertoire répond (première lecture).
+    - unavailable(root): Obtenir la raison pour laquelle un répertoire est ignoré, ou None.
+    - mark_unreachable(root): Ignorer un répertoire resté sans réponse pendant retry_delay secondes.
+    - ensure_index(refresh): Construire ou rafraîchir les index des répertoires en parallèle.
+    - close(): Arrêter la surveillance et libérer les moteurs.
+    """
+
+    def __init__(self, search_directories, index_dir=INDEX_DIR, probe_timeout=ROOT_PROBE_TIMEOUT, root_timeout=ROOT_TIMEOUT,
+                 retry_delay=ROOT_RETRY_DELAY, **engine_options):
+        self.search_directories = normalize_roots(search_directories)
+        self.index_changed = threading.Event()
+        self.probe_timeout = probe_timeout
+        self.root_timeout = root_timeout
+        self.retry_delay = retry_delay
+        self.probe_lock = threading.Lock()
+        # La lecture en cours de chaque répertoire (thread, début), et l'instant où un répertoire sans réponse sera de nouveau interrogé
+        self.probing = {}
+        self.retry_at = {}
+        self.engines = {root: SearchEngine(root, index_dir=index_dir, index_changed=self.index_changed, **engine_options)
+                        for root in self.search_directories}
+
+    #------------------------------------------------------------------------------------------------#
+
+    @property
+    def index_status(self):
+        """ Le dernier état des index, à afficher. """
+        return " ; ".join(engine.index_status for engine in self.engines.values() if engine.index_status)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def search(self, query):
+        """ Retourner l'itérateur des résultats d'une recherche (SearchResults ou MultiRootResults). """
+        if len(self.engines) == 1:
+            return next(iter(self.engines.values())).search(query)
+        return MultiRootResults(self, query)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def probe(self, root):
+        """ Vérifier qu'un répertoire répond en lisant sa première entrée (peut rester bloqué sur un montage inaccessible). """
+        thread = threading.current_thread()
+        with self.probe_lock:
+            self.probing[root] = (thread, time.monotonic())
+        try:
+            with os.scandir(root) as it:
+                next(it, None)
+        finally:
+            with self.probe_lock:
+                if self.probing.get(root, (None,))[0] is thread:
+                    del self.probing[root]
+        # Le répertoire répond de nouveau : il est interrogé dès la prochaine recherche
+        with self.probe_lock:
+            self.retry_at.pop(root, None)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def unavailable(self, root):
+        """ Obtenir la raison pour laquelle un répertoire est ignoré (lecture toujours bloquée, délai de nouvel essai), ou None. """
+        now = time.monotonic()
+        with self.probe_lock:
+            thread, started = self.probing.get(root, (None, now))
+            retry_at = self.retry_at.get(root)
+        if thread is not None and thread.is_alive() and now - started > self.probe_timeout:
+            return "inaccessible (toujours sans réponse)"
+        if retry_at is not None and now < retry_at:
+            return f"inaccessible (nouvel essai dans {retry_at - now:.0f} s)"
+        return None
+
+    #------------------------------------------------------------------------------------------------#
+
+    def mark_unreachable(self, root):
+        """ Ignorer un répertoire resté sans réponse pendant retry_delay secondes (et tant que sa lecture reste bloquée). """
+        with self.probe_lock:
+            self.retry_at[root] = time.monotonic() + self.retry_delay
+
+    #------------------------------------------------------------------------------------------------#
+
+    def ensure_root_index(self, root, refresh):
+        """ Construire ou rafraîchir l'index d'un répertoire s'il répond (exécuté dans un thread par répertoire). """
+        try:
+            self.probe(root)
+        except OSError:
+            return
+        self.engines[root].ensure_index(refresh)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def ensure_index(self, refresh=False):
+        """ Construire ou rafraîchir les index de tous les répertoires en parallèle (un répertoire qui dépasse root_timeout n'est pas attendu). """
+        threads = {}
+        for root in self.engines:
+            if self.unavailable(root) is None:
+                threads[root] = threading.Thread(target=self.ensure_root_index, args=(root, refresh), daemon=True)
+                threads[root].start()
+        deadline = time.monotonic() + self.root_timeout
+        for root, thread in threads.items():
+            thread.join(max(0, deadline - time.monotonic()))
+            with self.probe_lock:
+                blocked = self.probing.get(root, (None,))[0] is thread
+            if blocked:
+                self.mark_unreachable(root)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def close(self):
+        """ Arrêter la surveillance et libérer les moteurs. """
+        for engine in self.engines.values():
+            engine.close()
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,243 @@
+import queue
+import threading
+from bisect import bisect_right
+from tkinter import Canvas, Scrollbar
+from PIL import Image, ImageTk
+import fitz  # PyMuPDF
+
+#------------------------------------------------------------------------------------------------#
+
+# PyMuPDF ne supporte pas les appels simultanés depuis plusieurs threads : tous les accès sont sérialisés
+FITZ_LOCK = threading.Lock()
+
+# Largeur (pixels) du rendu des pages
+PDF_PAGE_WIDTH = 1100
+
+# Espace (pixels) entre deux pages
+PAGE_GAP = 10
+
+# Pages rendues à l'avance au-dessus et au-dessous des pages visibles
+PREFETCH_PAGES = 2
+
+# Au-delà de cette distance (en pages) des pages visibles, le rendu d'une page est libéré
+KEEP_PAGES = 6
+
+# Intervalle (ms) entre deux lectures des pages rendues par le thread de rendu
+POLL_INTERVAL = 30
+
+#------------------------------------------------------------------------------------------------#
+
+def page_sizes(doc):
+    """ Obtenir les dimensions (largeur, hauteur) de chaque page sans charger les pages. """
+    sizes = []
+    for number in range(doc.page_count):
+        rect = doc.page_cropbox(number)
+        sizes.append((rect.width, rect.height))
+    return sizes
+
+#------------------------------------------------------------------------------------------------#
+
+def render_page(doc, number, width=PDF_PAGE_WIDTH):
+    """ Rendre une page en image PIL à la largeur donnée. """
+    page = doc.load_page(number)
+    zoom = width / page.rect.width
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+    return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+#------------------------------------------------------------------------------------------------#
+
+class PdfViewer:
+    """ Visionneuse PDF paginée : seules les pages visibles (et leurs voisines) sont rendues.
+
+    La hauteur de chaque page est connue dès l'ouverture, sans la rendre : la barre de défilement
+    couvre tout le document. Les pages visibles sont rendues en priorité par un thread de fond, puis
+    leurs voisines ; les pages trop éloignées de la zone visible sont libérées. Le temps d'affichage
+    de la première page et la mémoire utilisée ne dépendent donc pas de la longueur du document.
+
+    Attributes:
+    - window (tk.Toplevel): La fenêtre de prévisualisation.
+    - canvas (tk.Canvas): Le canevas sur lequel les pages sont disposées.
+    - path (str): Le chemin du document.
+    - sizes (list): Les dimensions (largeur, hauteur) de chaque page, en points.
+    - offsets (list): La position verticale (pixels) du haut de chaque page.
+    - photos (dict): Les images Tk des pages rendues, par numéro de page.
+    - requested (set): Les pages en attente ou en cours de rendu, non encore reçues.
+
+    Methods:
+    - update_visible(): Demander le rendu des pages visibles et libérer les pages éloignées.
+    - close(): Arrêter le thread de rendu.
+    """
+
+    def __init__(self, window, path, sizes, first_page=None):
+        self.window = window
+        self.path = path
+        self.sizes = sizes
+        self.scales = [PDF_PAGE_WIDTH / width if width else 1 for width, _ in sizes]
+        self.offsets = []
+        y = 0
+        for (_, height), scale in zip(sizes, self.scales):
+            self.offsets.append(y)
+            y += int(height * scale) + PAGE_GAP
+        self.total_height = max(y - PAGE_GAP, 1)
+
+        self.canvas = Canvas(window, background="#808080", highlightthickness=0)
+        scrollbar = Scrollbar(window, command=self.on_scroll)
+        self.scrollbar = scrollbar
+        self.canvas.configure(yscrollcommand=self.on_canvas_scroll, scrollregion=(0, 0, PDF_PAGE_WIDTH, self.total_height))
+        self.canvas.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        for number, offset in enumerate(self.offsets):
+            height = int(self.sizes[number][1] * self.scales[number])
+            self.canvas.create_rectangle(0, offset, PDF_PAGE_WIDTH, offset + height, fill="white", outline="")
+
+        self.photos = {}
+        self.items = {}
+        self.requested = set()
+        self.pending = []
+        self.pending_changed = threading.Condition()
+        self.rendered = queue.Queue()
+        self.closed = False
+        self.thread = threading.Thread(target=self.run_renderer, daemon=True)
+        self.thread.start()
+
+        if first_page is not None and sizes:
+            self.show_page(0, first_page)
+
+        self.canvas.bind("<Configure>", lambda event: self.update_visible())
+        self.canvas.bind("<MouseWheel>", self.on_mousewheel)
+        self.canvas.bind("<Button-4>", lambda event: self.on_scroll("scroll", -3, "units"))
+        self.canvas.bind("<Button-5>", lambda event: self.on_scroll("scroll", 3, "units"))
+        window.bind("<Destroy>", self.on_destroy, add="+")
+        self.window.after(POLL_INTERVAL, self.poll_rendered)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def on_scroll(self, *args):
+        """ Commande de la barre de défilement. """
+        self.canvas.yview(*args)
+        self.update_visible()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def on_canvas_scroll(self, first, last):
+        """ Mettre à jour la barre de défilement lorsque le canevas défile. """
+        self.scrollbar.set(first, last)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def on_mousewheel(self, event):
+        """ Défilement à la molette (Windows et macOS). """
+        if event.delta:
+            steps = event.delta // 120 if abs(event.delta) >= 120 else (1 if event.delta > 0 else -1)
+            self.on_scroll("scroll", -3 * steps, "units")
+        return "break"
+
+    #------------------------------------------------------------------------------------------------#
+
+    def visible_pages(self):
+        """ Obtenir les numéros de la première et de la dernière page visibles. """
+        top = self.canvas.canvasy(0)
+        bottom = self.canvas.canvasy(max(self.canvas.winfo_height(), 1))
+        first = max(0, bisect_right(self.offsets, top) - 1)
+        last = max(first, min(len(self.offsets) - 1, bisect_right(self.offsets, bottom) - 1))
+        return first, last
+
+    #------------------------------------------------------------------------------------------------#
+
+    def update_visible(self):
+        """ Demander le rendu des pages visibles (puis de leurs voisines) et libérer les pages éloignées. """
+        if self.closed or not self.sizes:
+            return
+        first, last = self.visible_pages()
+        wanted = list(range(first, last + 1))
+        for distance in range(1, PREFETCH_PAGES + 1):
+            wanted.extend(number for number in (last + distance, first - distance) if 0 <= number < len(self.sizes))
+        for number in list(self.photos):
+            if number < first - KEEP_PAGES or number > last + KEEP_PAGES:
+                self.canvas.delete(self.items.pop(number))
+                del self.photos[number]
+        missing = [number for number in wanted if number not in self.photos and number not in self.requested]
+        # Les demandes précédentes encore en attente sont remplacées : seules les pages utiles sont rendues.
+        # Une page déjà prise par le thread de rendu reste demandée : elle sera affichée à son arrivée.
+        with self.pending_changed:
+            self.requested.difference_update(self.pending)
+            self.pending = missing
+            self.requested.update(missing)
+            self.pending_changed.notify()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def run_renderer(self):
+        """ Rendre les pages demandées dans le thread de fond. """
+        try:
+            with FITZ_LOCK:
+                doc = fitz.open(self.path)
+        except Exception as e:
+            print(f"Erreur lors de l'ouverture de {self.path}: {e}")
+            return
+        try:
+            while True:
+                with self.pending_changed:
+                    while not self.pending and not self.closed:
+                        self.pending_changed.wait()
+                    if self.closed:
+                        return
+                    number = self.pending.pop(0)
+                try:
+                    with FITZ_LOCK:
+                        image = render_page(doc, number)
+                except Exception as e:
+                    print(f"Erreur lors du rendu de la page {number + 1} de {self.path}: {e}")
+                    continue
+                self.rendered.put((number, image))
+        finally:
+            with FITZ_LOCK:
+                doc.close()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def poll_rendered(self):
+        """ Afficher les pages rendues par le thread de fond (exécuté dans le thread Tk). """
+        if self.closed:
+            return
+        window = None
+        while True:
+            try:
+                number, image = self.rendered.get_nowait()
+            except queue.Empty:
+                break
+            self.requested.discard(number)
+            if window is None:
+                window = self.visible_pages()
+            # Une page éloignée entre-temps (défilement rapide) n'est pas affichée
+            first, last = window
+            if number not in self.photos and first - KEEP_PAGES <= number <= last + KEEP_PAGES:
+                self.show_page(number, image)
+        self.window.after(POLL_INTERVAL, self.poll_rendered)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def show_page(self, number, image):
+        """ Placer le rendu d'une page sur le canevas. """
+        photo = ImageTk.PhotoImage(image)
+        self.photos[number] = photo
+        self.items[number] = self.canvas.create_image(0, self.offsets[number], image=photo, anchor='nw')
+
+    #------------------------------------------------------------------------------------------------#
+
+    def on_destroy(self, event):
+        """ Arrêter le thread de rendu à la fermeture de la fenêtre. """
+        if event.widget is self.window:
+            self.close()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def close(self):
+        """ Arrêter le thread de rendu et libérer les pages rendues. """
+        with self.pending_changed:
+            self.closed = True
+            self.pending = []
+            self.pending_changed.notify()
+        self.photos.clear()
+
+#------------------------------------------------------------------------------------------------#
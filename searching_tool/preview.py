@@ -1,143 +1,278 @@
+import os
+import sys
 import tkinter as tk
 from tkinter import Text, Scrollbar, Toplevel
-from PIL import Image, ImageTk
-import fitz  # PyMuPDF
-from docx import Document
-import cv2
-import io
+from collections import namedtuple
+from functools import partial
+from .backends import backend_available, load_backend
+from .text_viewer import HexSource, LineSource, TextViewer, looks_binary, read_sample
 
 #------------------------------------------------------------------------------------------------#
 
-def preview_image(root, path):
-    """ Prévisualiser une image. """
+# Une prévisualisation préparée, indépendante de Tk : elle peut être construite dans un thread de fond
+# et mise en cache. blocks contient, dans l'ordre d'affichage, des textes (str) et des images (PIL) ;
+# info contient les données propres au type (pour un PDF, les dimensions des pages ; pour un fichier
+# texte, s'il est binaire).
+PreviewPayload = namedtuple("PreviewPayload", ["kind", "path", "blocks", "info"], defaults=[None])
+
+# Type de prévisualisation selon l'extension (les autres fichiers sont prévisualisés comme du texte brut)
+PREVIEW_KINDS = {
+    **dict.fromkeys(('.png', '.jpg', '.jpeg', '.gif', '.bmp'), "image"),
+    '.txt': "text",
+    '.pdf': "pdf",
+    '.docx': "docx",
+    **dict.fromkeys(('.py', '.cpp', '.c', '.java', '.js', '.html', '.css'), "code"),
+    **dict.fromkeys(('.mp4', '.avi', '.mkv', '.mov'), "video"),
+}
+
+WINDOW_TITLES = {
+    "image": "Prévisualisation de l'image",
+    "text": "Prévisualisation du texte",
+    "pdf": "Prévisualisation du PDF",
+    "docx": "Prévisualisation du document Word",
+    "code": "Prévisualisation du code",
+    "video": "Prévisualisation de la vidéo",
+    "generic": "Prévisualisation de fichier",
+}
+
+#------------------------------------------------------------------------------------------------#
+
+def preview_kind(path):
+    """ Obtenir le type de prévisualisation d'un fichier d'après son extension.
+
+    Un fichier dont le prévisualiseur nécessite un module non installé est prévisualisé comme un fichier générique.
+    """
+    kind = PREVIEW_KINDS.get(os.path.splitext(path)[1].lower(), "generic")
+    if kind not in PREVIEWERS or not all(backend_available(name) for name in PREVIEWERS[kind][2]):
+        return "generic"
+    return kind
+
+#------------------------------------------------------------------------------------------------#
+
+def register_previewer(kind, extensions, prepare, render, backends=(), title=None):
+    """
+    Ajouter (ou remplacer) un type de prévisualisation.
+
+    Parameters:
+    kind (str): Le nom du type.
+    extensions (iterable): Les extensions prévisualisées avec ce type.
+    prepare (callable): La fonction préparant la prévisualisation d'un chemin, sans Tk (retourne un PreviewPayload).
+    render (callable): La fonction affichant une prévisualisation préparée (root, payload) et retournant la fenêtre.
+    backends (tuple): Les modules optionnels nécessaires (voir backends.BACKENDS).
+    title (str): Le titre de la fenêtre de prévisualisation.
+    """
+    PREVIEWERS[kind] = (prepare, render, tuple(backends))
+    WINDOW_TITLES[kind] = title or WINDOW_TITLES["generic"]
+    for ext in extensions:
+        PREVIEW_KINDS[ext.lower()] = kind
+
+#------------------------------------------------------------------------------------------------#
+
+def prepare_image(path):
+    """ Préparer la prévisualisation d'une image (décodée et réduite). """
+    with load_backend("PIL.Image").open(path) as img:
+        img.thumbnail((1100, 1100))  # Ajuster la taille de l'image
+        img.load()
+        return PreviewPayload("image", path, [img.copy()])
+
+#------------------------------------------------------------------------------------------------#
+
+def prepare_text(path, kind="text"):
+    """ Préparer la prévisualisation d'un fichier texte : seul son début est lu, pour détecter un fichier binaire.
+
+    Le contenu est lu par la visionneuse, au fil du défilement.
+    """
+    return PreviewPayload(kind, path, [], looks_binary(read_sample(path)))
+
+#------------------------------------------------------------------------------------------------#
+
+def prepare_pdf(path):
+    """ Préparer la prévisualisation d'un fichier PDF : dimensions des pages et rendu de la première page.
+
+    Les autres pages sont rendues à la demande par la visionneuse, au fil du défilement.
+    """
+    from .pdf_viewer import FITZ_LOCK, page_sizes, render_page
+    with FITZ_LOCK:
+        with load_backend("fitz").open(path) as doc:
+            sizes = page_sizes(doc)
+            blocks = [render_page(doc, 0)] if sizes else []
+    return PreviewPayload("pdf", path, blocks, sizes)
+
+#------------------------------------------------------------------------------------------------#
+
+def prepare_video(path):
+    """ Préparer la prévisualisation d'une vidéo : son image d'aperçu (la vidéo est décodée au fil de la lecture). """
+    from .video_player import read_poster_frame
+    poster = read_poster_frame(path)
+    return PreviewPayload("video", path, [poster] if poster is not None else [])
+
+#------------------------------------------------------------------------------------------------#
+
+def prepare_docx(path):
+    """ Préparer la prévisualisation d'un fichier Word. """
+    doc = load_backend("docx").Document(path)
+    return PreviewPayload("docx", path, ["".join(para.text + '\n' for para in doc.paragraphs)])
+
+#------------------------------------------------------------------------------------------------#
+
+def prepare_preview(path):
+    """ Préparer la prévisualisation d'un fichier selon son type (sans Tk : utilisable dans un thread). """
+    prepare, _, _ = PREVIEWERS[preview_kind(path)]
+    return prepare(path)
+
+#------------------------------------------------------------------------------------------------#
+
+def payload_size(payload):
+    """ Estimer la mémoire occupée par une prévisualisation préparée, en octets. """
+    size = 0
+    for block in payload.blocks:
+        if isinstance(block, str):
+            size += sys.getsizeof(block)
+        else:
+            size += block.width * block.height * len(block.getbands())
+    return size
+
+#------------------------------------------------------------------------------------------------#
+
+def open_window(root, kind):
+    """ Ouvrir la fenêtre de prévisualisation. """
     preview_window = Toplevel(root)
-    preview_window.title("Prévisualisation de l'image")
+    preview_window.title(WINDOW_TITLES[kind])
     preview_window.geometry("1200x1200")  # Taille plus grande pour la fenêtre de prévisualisation
-    img = Image.open(path)
-    img.thumbnail((1100, 1100))  # Ajuster la taille de l'image
-    img = ImageTk.PhotoImage(img)
+    return preview_window
+
+#------------------------------------------------------------------------------------------------#
+
+def render_preview(root, payload, autoplay=True):
+    """ Afficher une prévisualisation préparée dans une nouvelle fenêtre et retourner celle-ci.
+
+    Sans lecture automatique (autoplay=False), une vidéo n'affiche que son image d'aperçu.
+    """
+    _, render, _ = PREVIEWERS[payload.kind]
+    if payload.kind == "video":
+        return render(root, payload, autoplay)
+    return render(root, payload)
+
+#------------------------------------------------------------------------------------------------#
+
+def render_image(root, payload):
+    """ Afficher une image préparée. """
+    preview_window = open_window(root, "image")
+    img = load_backend("PIL.ImageTk").PhotoImage(payload.blocks[0])
     lbl = tk.Label(preview_window, image=img)
     lbl.image = img
     lbl.pack(expand=True, fill=tk.BOTH)
+    return preview_window
 
 #------------------------------------------------------------------------------------------------#
 
-def preview_text(root, path):
-    """ Prévisualiser un fichier texte. """
-    preview_window = Toplevel(root)
-    preview_window.title("Prévisualisation du texte")
-    preview_window.geometry("1200x1200")  # Taille plus grande pour la fenêtre de prévisualisation
-    text_widget = Text(preview_window, wrap='word', font=("Helvetica", 18))  # Police plus grande
+def render_pdf(root, payload):
+    """ Afficher un PDF dans la visionneuse paginée. """
+    from .pdf_viewer import PdfViewer
+    preview_window = open_window(root, "pdf")
+    first_page = payload.blocks[0] if payload.blocks else None
+    preview_window.viewer = PdfViewer(preview_window, payload.path, payload.info or [], first_page)
+    return preview_window
+
+#------------------------------------------------------------------------------------------------#
+
+def render_text_file(root, payload):
+    """ Afficher un fichier texte dans la visionneuse fenêtrée, ou sa vue hexadécimale s'il est binaire. """
+    preview_window = open_window(root, payload.kind)
+    if payload.info:
+        source, font = HexSource(payload.path), ("Courier", 14)
+    else:
+        source = LineSource(payload.path)
+        font = ("Courier", 18) if payload.kind == "code" else ("Helvetica", 18)  # Police plus grande
+    preview_window.viewer = TextViewer(preview_window, source, font)
+    return preview_window
+
+#------------------------------------------------------------------------------------------------#
+
+def render_text(root, payload):
+    """ Afficher un texte préparé (avec ses images éventuelles) dans une zone de texte. """
+    preview_window = open_window(root, payload.kind)
+    font = ("Helvetica", 18)  # Police plus grande
+    text_widget = Text(preview_window, wrap='word', font=font)
     scrollbar = Scrollbar(preview_window, command=text_widget.yview)
     text_widget.configure(yscrollcommand=scrollbar.set)
     text_widget.pack(side='left', fill='both', expand=True)
     scrollbar.pack(side='right', fill='y')
-    with open(path, 'r', encoding='utf-8') as file:
-        text_widget.insert('1.0', file.read())
+    text_widget.images = []
+    for block in payload.blocks:
+        if isinstance(block, str):
+            text_widget.insert('end', block)
+        else:
+            img = load_backend("PIL.ImageTk").PhotoImage(block)
+            text_widget.images.append(img)
+            text_widget.image_create('end', image=img)
+            text_widget.insert('end', '\n')
+    return preview_window
+
+#------------------------------------------------------------------------------------------------#
+
+def render_video(root, payload, autoplay=True):
+    """ Lire une vidéo dans la fenêtre de prévisualisation (ou n'afficher que son image d'aperçu). """
+    from .video_player import VideoPlayer
+    preview_window = open_window(root, "video")
+    poster = payload.blocks[0] if payload.blocks else None
+    preview_window.player = VideoPlayer(preview_window, payload.path, poster, autoplay)
+    return preview_window
+
+#------------------------------------------------------------------------------------------------#
+
+def preview_image(root, path):
+    """ Prévisualiser une image. """
+    return render_preview(root, prepare_image(path))
+
+#------------------------------------------------------------------------------------------------#
+
+def preview_text(root, path):
+    """ Prévisualiser un fichier texte. """
+    return render_preview(root, prepare_text(path))
 
 #------------------------------------------------------------------------------------------------#
 
 def preview_pdf(root, path):
     """ Prévisualiser un fichier PDF. """
-    preview_window = Toplevel(root)
-    preview_window.title("Prévisualisation du PDF")
-    preview_window.geometry("1200x1200")  # Taille plus grande pour la fenêtre de prévisualisation
-    text_widget = Text(preview_window, wrap='word', font=("Helvetica", 18))  # Police plus grande
-    scrollbar = Scrollbar(preview_window, command=text_widget.yview)
-    text_widget.configure(yscrollcommand=scrollbar.set)
-    text_widget.pack(side='left', fill='both', expand=True)
-    scrollbar.pack(side='right', fill='y')
-    with fitz.open(path) as doc:
-        for page in doc:
-            text_widget.insert('end', page.get_text())
-            extract_and_display_images_from_page(page, text_widget)
+    return render_preview(root, prepare_pdf(path))
 
 #------------------------------------------------------------------------------------------------#
 
 def preview_docx(root, path):
     """ Prévisualiser un fichier Word. """
-    preview_window = Toplevel(root)
-    preview_window.title("Prévisualisation du document Word")
-    preview_window.geometry("1200x1200")  # Taille plus grande pour la fenêtre de prévisualisation
-    text_widget = Text(preview_window, wrap='word', font=("Helvetica", 18))  # Police plus grande
-    scrollbar = Scrollbar(preview_window, command=text_widget.yview)
-    text_widget.configure(yscrollcommand=scrollbar.set)
-    text_widget.pack(side='left', fill='both', expand=True)
-    scrollbar.pack(side='right', fill='y')
-    doc = Document(path)
-    for para in doc.paragraphs:
-        text_widget.insert('end', para.text + '\n')
+    return render_preview(root, prepare_docx(path))
 
 #------------------------------------------------------------------------------------------------#
 
 def preview_code(root, path):
     """ Prévisualiser un fichier de code source. """
-    preview_window = Toplevel(root)
-    preview_window.title("Prévisualisation du code")
-    preview_window.geometry("1200x1200")  # Taille plus grande pour la fenêtre de prévisualisation
-    text_widget = Text(preview_window, wrap='word', font=("Courier", 18))  # Police de type code plus grande
-    scrollbar = Scrollbar(preview_window, command=text_widget.yview)
-    text_widget.configure(yscrollcommand=scrollbar.set)
-    text_widget.pack(side='left', fill='both', expand=True)
-    scrollbar.pack(side='right', fill='y')
-    with open(path, 'r', encoding='utf-8') as file:
-        text_widget.insert('1.0', file.read())
+    return render_preview(root, prepare_text(path, "code"))
 
 #------------------------------------------------------------------------------------------------#
 
 def preview_video(root, path):
     """ Prévisualiser un fichier vidéo. """
-    preview_window = Toplevel(root)
-    preview_window.title("Prévisualisation de la vidéo")
-    preview_window.geometry("1200x1200")  # Taille plus grande pour la fenêtre de prévisualisation
-    video_label = tk.Label(preview_window)
-    video_label.pack(expand=True, fill=tk.BOTH)
-    cap = cv2.VideoCapture(path)
-
-    def show_frame():
-        ret, frame = cap.read()
-        if ret:
-            cv2image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA)
-            img = Image.fromarray(cv2image)
-            imgtk = ImageTk.PhotoImage(image=img)
-            video_label.imgtk = imgtk
-            video_label.configure(image=imgtk)
-            video_label.after(10, show_frame)
-        else:
-            cap.release()
-            video_label.imgtk = None
-
-    show_frame()
+    return render_preview(root, prepare_video(path))
 
 #------------------------------------------------------------------------------------------------#
 
 def preview_generic(root, path):
     """ Prévisualiser un fichier générique. """
-    preview_window = Toplevel(root)
-    preview_window.title("Prévisualisation de fichier")
-    preview_window.geometry("1200x1200")  # Taille plus grande pour la fenêtre de prévisualisation
-    text_widget = Text(preview_window, wrap='word', font=("Helvetica", 18))  # Police plus grande
-    scrollbar = Scrollbar(preview_window, command=text_widget.yview)
-    text_widget.configure(yscrollcommand=scrollbar.set)
-    text_widget.pack(side='left', fill='both', expand=True)
-    scrollbar.pack(side='right', fill='y')
-    with open(path, 'r', encoding='utf-8', errors='ignore') as file:
-        text_widget.insert('1.0', file.read())
-
-#------------------------------------------------------------------------------------------------#
-
-def extract_and_display_images_from_page(page, text_widget):
-    """ Extraire et afficher les images d'une page PDF. """
-    images = page.get_images(full=True)
-    for img_index, img in enumerate(images):
-        xref = img[0]
-        base_image = fitz.Pixmap(page.parent, xref)
-        if base_image.alpha:
-            base_image = fitz.Pixmap(fitz.csRGB, base_image)
-        img = Image.open(io.BytesIO(base_image.tobytes()))
-        img.thumbnail((300, 300))  # Ajuster la taille des images extraites
-        img = ImageTk.PhotoImage(img)
-        text_widget.image_create('end', image=img)
-        text_widget.insert('end', '\n')
-
-#------------------------------------------------------------------------------------------------#
\ No newline at end of file
+    return render_preview(root, prepare_text(path, "generic"))
+
+#------------------------------------------------------------------------------------------------#
+
+# Fonctions de préparation et d'affichage par type, et modules optionnels nécessaires. Les modules
+# (et les visionneuses qui en dépendent) ne sont importés qu'à la première prévisualisation du type.
+PREVIEWERS = {
+    "image": (prepare_image, render_image, ("PIL.Image", "PIL.ImageTk")),
+    "text": (prepare_text, render_text_file, ()),
+    "code": (partial(prepare_text, kind="code"), render_text_file, ()),
+    "generic": (partial(prepare_text, kind="generic"), render_text_file, ()),
+    "pdf": (prepare_pdf, render_pdf, ("fitz", "PIL.Image", "PIL.ImageTk")),
+    "docx": (prepare_docx, render_text, ("docx",)),
+    "video": (prepare_video, render_video, ("cv2", "PIL.Image", "PIL.ImageTk")),
+}
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,147 @@
+import os
+import threading
+from collections import OrderedDict
+
+#------------------------------------------------------------------------------------------------#
+
+# Mémoire maximale occupée par les prévisualisations préparées
+PREVIEW_CACHE_BYTES = 128 * 1024 * 1024
+
+# Les fichiers plus gros ne sont préparés qu'à l'ouverture de leur prévisualisation
+PREFETCH_MAX_FILE_SIZE = 16 * 1024 * 1024
+
+#------------------------------------------------------------------------------------------------#
+
+def cache_key(path):
+    """ Obtenir la clé (chemin, mtime, taille) d'un fichier, ou None s'il est inaccessible. """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (path, st.st_mtime_ns, st.st_size)
+
+#------------------------------------------------------------------------------------------------#
+
+class PreviewCache:
+    """ Cache LRU, borné en mémoire, des prévisualisations préparées.
+
+    Une prévisualisation est identifiée par (chemin, mtime, taille) : un fichier modifié est
+    simplement préparé de nouveau. Les entrées les moins récemment utilisées sont écartées dès que
+    la taille estimée du cache dépasse max_bytes. Un thread de fond prépare à l'avance les fichiers
+    voisins de la sélection, pour que le parcours des résultats au clavier soit immédiat.
+
+    Attributes:
+    - prepare (callable): Fonction préparant la prévisualisation d'un chemin (sans Tk).
+    - measure (callable): Fonction estimant la taille en octets d'une prévisualisation.
+    - max_bytes (int): La mémoire maximale occupée par les prévisualisations.
+    - size (int): La mémoire actuellement occupée (estimation).
+
+    Methods:
+    - get(path): Obtenir la prévisualisation d'un fichier, en la préparant si nécessaire.
+    - prefetch(paths): Préparer à l'avance, dans un thread, les prévisualisations de fichiers.
+    - clear(): Vider le cache et annuler la préparation à l'avance.
+    """
+
+    def __init__(self, prepare, measure, max_bytes=PREVIEW_CACHE_BYTES):
+        self.prepare = prepare
+        self.measure = measure
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        # Les préparations sont sérialisées (PyMuPDF n'est pas utilisable depuis plusieurs threads à la fois)
+        self.prepare_lock = threading.Lock()
+        self.pending = []
+        self.pending_changed = threading.Condition(self.lock)
+        self.thread = None
+
+    #------------------------------------------------------------------------------------------------#
+
+    def lookup(self, key):
+        """ Obtenir une entrée du cache et la marquer comme la plus récemment utilisée, ou None. """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                return entry[0]
+            return None
+
+    #------------------------------------------------------------------------------------------------#
+
+    def store(self, key, payload):
+        """ Ajouter une entrée au cache en écartant les moins récemment utilisées si nécessaire. """
+        size = self.measure(payload)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self.entries[key] = (payload, size)
+            self.size += size
+            while self.size > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.size -= evicted_size
+
+    #------------------------------------------------------------------------------------------------#
+
+    def get(self, path):
+        """ Obtenir la prévisualisation d'un fichier, en la préparant si elle n'est pas dans le cache. """
+        key = cache_key(path)
+        if key is None:
+            return self.prepare(path)
+        payload = self.lookup(key)
+        if payload is not None:
+            return payload
+        with self.prepare_lock:
+            # Le fichier a pu être préparé à l'avance pendant l'attente du verrou
+            payload = self.lookup(key)
+            if payload is None:
+                payload = self.prepare(path)
+                self.store(key, payload)
+        return payload
+
+    #------------------------------------------------------------------------------------------------#
+
+    def prefetch(self, paths):
+        """ Préparer à l'avance, dans un thread, les prévisualisations de fichiers (remplace la demande précédente). """
+        with self.lock:
+            self.pending = [path for path in paths if path]
+            self.pending_changed.notify()
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run_prefetch, daemon=True)
+                self.thread.start()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def run_prefetch(self):
+        """ Préparer les fichiers demandés, un par un, dans le thread de fond. """
+        while True:
+            with self.lock:
+                while not self.pending:
+                    # Le thread s'arrête après une minute d'inactivité
+                    if not self.pending_changed.wait(timeout=60) and not self.pending:
+                        self.thread = None
+                        return
+                path = self.pending.pop(0)
+            key = cache_key(path)
+            if key is None or key[2] > PREFETCH_MAX_FILE_SIZE or self.lookup(key) is not None:
+                continue
+            try:
+                with self.prepare_lock:
+                    if self.lookup(key) is None:
+                        self.store(key, self.prepare(path))
+            except Exception as e:
+                # Le fichier sera préparé (et l'erreur signalée) à l'ouverture de la prévisualisation
+                print(f"Erreur lors de la préparation de {path}: {e}")
+
+    #------------------------------------------------------------------------------------------------#
+
+    def clear(self):
+        """ Vider le cache et annuler la préparation à l'avance. """
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+            self.pending = []
+
+#------------------------------------------------------------------------------------------------#
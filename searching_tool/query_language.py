@@ -0,0 +1,270 @@
+import re
+import time
+import shlex
+import fnmatch
+import operator
+from datetime import datetime, timedelta
+from .entry_store import FLAG_DIR
+
+#------------------------------------------------------------------------------------------------#
+
+# Un filtre : clé, opérateur et valeur (ext:pdf, size>50MB, modified<7d, path:Projets, type:dir, re:^rapport)
+FILTER_PATTERN = re.compile(r"^(ext|size|modified|path|type|re)(>=|<=|:|>|<|=)(.+)$", re.IGNORECASE)
+
+# Unités de taille (puissances de 1024), en minuscules
+SIZE_UNITS = {
+    "": 1, "b": 1, "o": 1,
+    "k": 1024, "kb": 1024, "ko": 1024,
+    "m": 1024 ** 2, "mb": 1024 ** 2, "mo": 1024 ** 2,
+    "g": 1024 ** 3, "gb": 1024 ** 3, "go": 1024 ** 3,
+    "t": 1024 ** 4, "tb": 1024 ** 4, "to": 1024 ** 4,
+}
+
+# Unités de durée (en secondes) pour les dates relatives : modified<7d (modifié il y a moins de 7 jours)
+DURATION_UNITS = {
+    "s": 1, "min": 60, "h": 3600,
+    "d": 86400, "j": 86400,
+    "w": 7 * 86400, "sem": 7 * 86400,
+    "mo": 30 * 86400, "mois": 30 * 86400,
+    "y": 365 * 86400, "a": 365 * 86400,
+}
+
+# Valeurs acceptées pour type:
+TYPE_VALUES = {"dir": "dossier", "dossier": "dossier", "folder": "dossier", "file": "fichier", "fichier": "fichier"}
+
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "=": operator.eq, ":": operator.eq}
+
+# Opérateur inverse, pour passer d'un âge (modified<7d) à une date (mtime > maintenant - 7 jours)
+REVERSED = {">": "<", ">=": "<=", "<": ">", "<=": ">="}
+
+#------------------------------------------------------------------------------------------------#
+
+class QuerySyntaxError(ValueError):
+    """ La requête contient un filtre invalide. """
+
+#------------------------------------------------------------------------------------------------#
+
+def parse_size(text):
+    """ Convertir une taille ("50MB", "1.5g", "200ko", "4096") en octets. """
+    match = re.fullmatch(r"(\d+(?:[.,]\d+)?)\s*([a-z]*)", text.strip().lower())
+    if match is None or match.group(2) not in SIZE_UNITS:
+        raise QuerySyntaxError(f"taille invalide : {text}")
+    return int(float(match.group(1).replace(",", ".")) * SIZE_UNITS[match.group(2)])
+
+#------------------------------------------------------------------------------------------------#
+
+def parse_modified(op, text, now=None):
+    """
+    Convertir un filtre de date en comparaisons sur la date de modification.
+
+    Une durée ("7d", "3h", "2w") est un âge : modified<7d retient les entrées modifiées il y a moins
+    de 7 jours. Une date ("2024-05-01", "2024-05-01T12:00") se compare telle quelle : modified<2024-05-01
+    retient les entrées modifiées avant ce jour, modified:2024-05-01 celles modifiées ce jour-là.
+
+    Returns:
+    list: Les comparaisons (opérateur, horodatage) à satisfaire.
+    """
+    now = time.time() if now is None else now
+    match = re.fullmatch(r"(\d+(?:[.,]\d+)?)\s*([a-z]+)", text.strip().lower())
+    if match is not None and match.group(2) in DURATION_UNITS:
+        if op not in REVERSED:
+            raise QuerySyntaxError(f"une durée se compare avec <, <=, > ou >= : modified{op}{text}")
+        threshold = now - float(match.group(1).replace(",", ".")) * DURATION_UNITS[match.group(2)]
+        return [(OPERATORS[REVERSED[op]], threshold)]
+    try:
+        moment = datetime.fromisoformat(text.strip())
+    except ValueError:
+        raise QuerySyntaxError(f"date ou durée invalide : {text}") from None
+    if op in ("=", ":"):
+        # Toute la journée (ou la minute, si l'heure est donnée)
+        length = timedelta(days=1) if len(text.strip()) <= 10 else timedelta(minutes=1)
+        return [(operator.ge, moment.timestamp()), (operator.lt, (moment + length).timestamp())]
+    return [(OPERATORS[op], moment.timestamp())]
+
+#------------------------------------------------------------------------------------------------#
+
+def split_terms(text):
+    """ Découper une requête en termes (les guillemets regroupent un terme contenant des espaces). """
+    lexer = shlex.shlex(text, posix=True)
+    lexer.whitespace_split = True
+    # Les barres obliques inverses sont conservées (expressions régulières, chemins Windows)
+    lexer.escape = ""
+    try:
+        return list(lexer)
+    except ValueError:
+        # Guillemet non fermé (apostrophe dans un nom) : découpage sur les espaces
+        return text.split()
+
+#------------------------------------------------------------------------------------------------#
+
+def is_glob(term):
+    """ Indiquer si un terme est un motif glob : il contient * ou ? (des crochets seuls, fréquents dans les noms, restent du texte). """
+    return any(char in term for char in "*?")
+
+#------------------------------------------------------------------------------------------------#
+
+class ParsedQuery:
+    """ Requête avec filtres, analysée.
+
+    Les termes sans filtre forment le texte recherché dans les noms (comme une recherche simple) ;
+    un terme contenant * ou ? est un motif glob sur le nom entier, où [...] désigne alors un ensemble
+    de caractères ; un terme avec des crochets seuls ([DRAFT], [1080p]) reste du texte. Les filtres :
+    - ext:pdf,docx : les extensions (remplacent celles des cases à cocher) ;
+    - size>50MB, size<=1k : la taille ;
+    - modified<7d (modifié il y a moins de 7 jours), modified>2024-01-01 : la date de modification ;
+    - path:Projets : le chemin du dossier contenant l'entrée contient le texte ;
+    - type:dir ou type:file : le type d'entrée ;
+    - re:^rapport_\\d+ : une expression régulière sur le nom.
+    La casse est ignorée partout.
+
+    Attributes:
+    - text (str): Le texte recherché dans les noms (en minuscules), éventuellement vide.
+    - search_type (str): "fichier" ou "dossier" si type: est donné, sinon None.
+    - extensions (tuple): Les extensions de ext:, sinon None.
+    - comparisons (list): Les comparaisons (colonne, opérateur, valeur) sur "sizes" et "mtimes".
+    - paths (list): Les textes que doit contenir le chemin du dossier, en minuscules.
+    - patterns (list): Les tests compilés sur le nom (match d'un glob, search d'une expression re:).
+
+    Methods:
+    - is_plain(): Indiquer si la requête n'est qu'un texte (recherche simple).
+    - compile(search_type, extensions): Obtenir le QueryMatcher de la requête.
+    """
+
+    def __init__(self, text="", search_type=None, extensions=None, comparisons=None, paths=None, patterns=None):
+        self.text = text
+        self.search_type = search_type
+        self.extensions = extensions
+        self.comparisons = comparisons or []
+        self.paths = paths or []
+        self.patterns = patterns or []
+
+    #------------------------------------------------------------------------------------------------#
+
+    def is_plain(self):
+        """ Indiquer si la requête n'est qu'un texte, sans filtre ni motif. """
+        return self.search_type is None and self.extensions is None and not (self.comparisons or self.paths or self.patterns)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def compile(self, search_type, extensions):
+        """ Obtenir le QueryMatcher de la requête (type et extensions par défaut : ceux de l'interface). """
+        return QueryMatcher(self, self.search_type or search_type, self.extensions if self.extensions is not None else extensions)
+
+#------------------------------------------------------------------------------------------------#
+
+def parse_query(search_term, now=None):
+    """
+    Analyser une requête avec filtres.
+
+    Raises:
+    QuerySyntaxError: Si un filtre est invalide.
+    """
+    words = []
+    parsed = ParsedQuery()
+    for term in split_terms(search_term):
+        match = FILTER_PATTERN.match(term)
+        if match is None:
+            if is_glob(term):
+                # Un glob porte sur le nom entier
+                parsed.patterns.append(re.compile(fnmatch.translate(term), re.IGNORECASE).match)
+            else:
+                words.append(term)
+            continue
+        key, op, value = match.group(1).lower(), match.group(2), match.group(3)
+        if key in ("ext", "path", "type", "re") and op not in (":", "="):
+            raise QuerySyntaxError(f"le filtre {key} s'écrit {key}:valeur")
+        if key == "ext":
+            extensions = tuple("." + ext.lower().lstrip(".") for ext in value.split(",") if ext.strip("."))
+            parsed.extensions = (parsed.extensions or ()) + extensions
+        elif key == "size":
+            parsed.comparisons.append(("sizes", OPERATORS[op], parse_size(value)))
+        elif key == "modified":
+            parsed.comparisons.extend(("mtimes", compare, threshold) for compare, threshold in parse_modified(op, value, now))
+        elif key == "path":
+            parsed.paths.append(value.lower())
+        elif key == "type":
+            if value.lower() not in TYPE_VALUES:
+                raise QuerySyntaxError(f"type inconnu : {value} (dir ou file)")
+            parsed.search_type = TYPE_VALUES[value.lower()]
+        else:
+            try:
+                parsed.patterns.append(re.compile(value, re.IGNORECASE).search)
+            except re.error as e:
+                raise QuerySyntaxError(f"expression régulière invalide : {value} ({e})") from None
+    parsed.text = " ".join(words).lower()
+    return parsed
+
+#------------------------------------------------------------------------------------------------#
+
+class QueryMatcher:
+    """ Évaluation d'une requête avec filtres sur les colonnes d'un EntryStore.
+
+    La taille et la date sont celles relevées lors du parcours ou de l'indexation : aucune entrée
+    n'est relue sur le disque. Les candidats sont d'abord obtenus par l'accès le plus sélectif
+    (index de trigrammes ou tampon des noms pour le texte, groupes d'extension sinon), puis les
+    filtres sont appliqués du moins coûteux au plus coûteux : type et extension (entiers), taille
+    et date (nombres), dossier (ensemble précalculé sur la table des dossiers), puis motifs sur le
+    nom, qui nécessitent de le décoder.
+
+    Attributes:
+    - query (ParsedQuery): La requête analysée.
+    - search_type (str): Le type d'entrée recherché ("fichier" ou "dossier").
+    - extensions (tuple): Les extensions recherchées (fichiers seulement).
+
+    Methods:
+    - matching_ids(store, trigram_index): Retourner les identifiants des entrées satisfaisant la requête.
+    """
+
+    def __init__(self, query, search_type, extensions):
+        self.query = query
+        self.search_type = search_type
+        self.extensions = tuple({ext.lower() for ext in extensions})
+
+    #------------------------------------------------------------------------------------------------#
+
+    def candidates(self, store, trigram_index):
+        """ Obtenir les identifiants candidats par l'accès le plus sélectif. Retourne (candidats, extensions déjà filtrées). """
+        text = self.query.text
+        if text:
+            if trigram_index is not None and len(text) >= 3:
+                return trigram_index.search(text), False
+            return store.lower_names.find_all(text), False
+        if self.search_type == "fichier":
+            return sorted(i for ext in self.extensions for i in store.files_with_extension(ext)), True
+        return range(len(store)), False
+
+    #------------------------------------------------------------------------------------------------#
+
+    def matching_dirs(self, store):
+        """ Obtenir les identifiants des dossiers dont le chemin contient tous les textes de path:. """
+        prefix = store.prefix
+        return {dir_id for dir_id, directory in enumerate(store.dirs)
+                if all(part in (prefix + directory).lower() for part in self.query.paths)}
+
+    #------------------------------------------------------------------------------------------------#
+
+    def matching_ids(self, store, trigram_index=None):
+        """ Retourner la liste triée des identifiants des entrées de store satisfaisant la requête. """
+        ids, extensions_done = self.candidates(store, trigram_index)
+        flags = store.flags
+        if self.search_type == "dossier":
+            ids = [i for i in ids if flags[i] & FLAG_DIR]
+        elif extensions_done:
+            ids = list(ids)
+        else:
+            ext_ids = store.ext_ids
+            wanted = {store.extension_ids[ext] for ext in self.extensions if ext in store.extension_ids}
+            ids = [i for i in ids if not flags[i] & FLAG_DIR and ext_ids[i] in wanted]
+        for column, compare, value in self.query.comparisons:
+            values = getattr(store, column)
+            ids = [i for i in ids if compare(values[i], value)]
+        if self.query.paths and ids:
+            dir_ids = self.matching_dirs(store)
+            parents = store.parents
+            ids = [i for i in ids if parents[i] in dir_ids]
+        names = store.names
+        for test in self.query.patterns:
+            ids = [i for i in ids if test(names[i])]
+        return ids
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,109 @@
+import os
+import time
+import heapq
+from .entry_store import EntryRef
+
+#------------------------------------------------------------------------------------------------#
+
+# Poids des types de correspondance : l'écart entre deux types dépasse toujours les effets de la
+# profondeur et de la récence, si bien qu'une correspondance exacte reste devant un préfixe, etc.
+EXACT_MATCH = 5000
+PREFIX_MATCH = 4000
+WORD_MATCH = 3000
+SUBSTRING_MATCH = 2000
+CONTENT_MATCH = 1000
+
+# Pénalité par niveau de profondeur sous le répertoire de recherche (plafonnée)
+DEPTH_PENALTY = 10
+MAX_DEPTH = 30
+
+# Bonus maximal d'un fichier modifié à l'instant, divisé par deux à chaque demi-vie
+RECENCY_BONUS = 100
+RECENCY_HALF_LIFE = 30 * 24 * 3600
+
+#------------------------------------------------------------------------------------------------#
+
+def is_word_start(name, pos):
+    """ Indiquer si la position commence un mot du nom (après un séparateur ou une majuscule de camelCase). """
+    if pos == 0:
+        return True
+    if pos >= len(name):
+        return False
+    previous, char = name[pos - 1], name[pos]
+    return not previous.isalnum() or (previous.islower() and char.isupper())
+
+#------------------------------------------------------------------------------------------------#
+
+def match_kind(name, search_term_lower):
+    """ Retourner le poids du type de correspondance entre un nom et un terme (en minuscules). """
+    name_lower = name.lower()
+    if name_lower == search_term_lower:
+        return EXACT_MATCH
+    pos = name_lower.find(search_term_lower)
+    if pos < 0:
+        # Le nom ne contient pas le terme : seul le contenu du fichier correspond
+        return CONTENT_MATCH
+    if pos == 0:
+        return PREFIX_MATCH
+    while pos >= 0:
+        if is_word_start(name, pos):
+            return WORD_MATCH
+        pos = name_lower.find(search_term_lower, pos + 1)
+    return SUBSTRING_MATCH
+
+#------------------------------------------------------------------------------------------------#
+
+class Ranker:
+    """ Classement des résultats d'une recherche par pertinence.
+
+    Le score combine le type de correspondance (exacte, préfixe, début de mot, sous-chaîne, contenu
+    seul), la profondeur du chemin sous le répertoire de recherche et la récence de la dernière
+    modification. Seuls les K meilleurs résultats sont retenus, à l'aide d'un tas borné : le coût
+    est en O(n log K) au lieu du tri complet de toutes les correspondances.
+
+    Attributes:
+    - search_directory (str): Le répertoire de recherche, origine du calcul de la profondeur.
+    - search_term (str): Le terme de recherche, en minuscules.
+    - now (float): L'instant de référence pour la récence.
+
+    Methods:
+    - score(match): Calculer le score d'un résultat (nom, chemin, mtime).
+    - top(matches, limit): Retourner les meilleurs résultats, du plus pertinent au moins pertinent.
+    """
+
+    def __init__(self, search_directory, search_term, now=None):
+        self.search_directory = os.path.abspath(search_directory)
+        self.search_term = search_term.lower()
+        self.now = time.time() if now is None else now
+        self.base_depth = self.search_directory.rstrip(os.sep).count(os.sep)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def score(self, match):
+        """ Calculer le score d'un résultat (nom, chemin, mtime) : plus il est élevé, plus le résultat est pertinent. """
+        name, path, mtime = match
+        if isinstance(path, EntryRef):
+            depth = path.depth()
+        else:
+            depth = path.count(os.sep) - self.base_depth - 1
+        score = match_kind(name, self.search_term) - DEPTH_PENALTY * min(max(depth, 0), MAX_DEPTH)
+        if mtime:
+            age = max(0.0, self.now - mtime)
+            score += RECENCY_BONUS * 0.5 ** (age / RECENCY_HALF_LIFE)
+        return score
+
+    #------------------------------------------------------------------------------------------------#
+
+    def sort_key(self, match):
+        """ Clé de classement : score décroissant, puis nom pour départager les ex æquo. """
+        return (-self.score(match), match[0].lower(), match[1])
+
+    #------------------------------------------------------------------------------------------------#
+
+    def top(self, matches, limit):
+        """ Retourner les limit meilleurs résultats, triés du plus pertinent au moins pertinent. """
+        if limit is None:
+            return sorted(matches, key=self.sort_key)
+        return heapq.nsmallest(limit, matches, key=self.sort_key)
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,68 @@
+import threading
+
+#------------------------------------------------------------------------------------------------#
+
+class RefinementCache:
+    """ Mémoire de la dernière recherche terminée, pour affiner la suivante sans tout reparcourir.
+
+    Quand le nouveau terme contient le précédent (« rep » puis « repo »), toute correspondance du
+    nouveau terme figure déjà parmi les résultats précédents : il suffit de les filtrer en mémoire.
+    La recherche est identifiée par (répertoire, type de recherche, extensions) ; si ces filtres
+    changent ou si le terme est raccourci, la recherche complète est nécessaire.
+
+    Methods:
+    - lookup(key, search_term): Obtenir les résultats précédents si le terme les affine.
+    - get(key, search_term): Obtenir les résultats mémorisés pour la même recherche.
+    - store(key, search_term, results): Mémoriser les résultats complets d'une recherche.
+    - clear(): Oublier la dernière recherche (après une modification de l'index).
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.key = None
+        self.search_term = None
+        self.results = None
+
+    #------------------------------------------------------------------------------------------------#
+
+    @staticmethod
+    def make_key(search_directory, search_type, extensions):
+        """ Construire la clé identifiant les filtres d'une recherche. """
+        return (search_directory, search_type, tuple(sorted(ext.lower() for ext in extensions)))
+
+    #------------------------------------------------------------------------------------------------#
+
+    def lookup(self, key, search_term):
+        """ Obtenir les résultats précédents si le nouveau terme contient le précédent, sinon None. """
+        search_term = search_term.lower()
+        with self.lock:
+            if self.results is None or key != self.key or self.search_term not in search_term:
+                return None
+            return self.results
+
+    #------------------------------------------------------------------------------------------------#
+
+    def get(self, key, search_term):
+        """ Obtenir les résultats mémorisés si la recherche est exactement la même, sinon None. """
+        with self.lock:
+            if self.results is None or key != self.key or self.search_term != search_term.lower():
+                return None
+            return self.results
+
+    #------------------------------------------------------------------------------------------------#
+
+    def store(self, key, search_term, results):
+        """ Mémoriser les résultats complets d'une recherche (jamais ceux d'une recherche annulée). """
+        with self.lock:
+            self.key = key
+            self.search_term = search_term.lower()
+            self.results = results
+
+    #------------------------------------------------------------------------------------------------#
+
+    def clear(self):
+        """ Oublier la dernière recherche. """
+        with self.lock:
+            self.key = self.search_term = self.results = None
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,258 @@
+import os
+from tkinter import ttk
+from .metrics import METRICS
+
+#------------------------------------------------------------------------------------------------#
+
+class VirtualResultView:
+    """ Liste de résultats virtualisée : seules les lignes visibles existent dans le Treeview.
+
+    Les résultats sont conservés dans une simple liste d'emplacements : des chemins, ou des références
+    (EntryRef) aux entrées du magasin des noms, dont le chemin n'est construit que pour les lignes
+    affichées, la sélection et les voisins préchargés (le nom est déduit du chemin à l'affichage).
+    Le Treeview ne contient qu'autant de lignes que la hauteur visible en permet : le défilement se
+    contente de réaffecter les valeurs de ces lignes, ce qui permet d'afficher des millions de
+    résultats sans ralentir l'interface.
+
+    Attributes:
+    - frame (ttk.Frame): Le cadre contenant l'arbre et la barre de défilement.
+    - tree (ttk.Treeview): L'arbre affichant la fenêtre visible des résultats.
+    - scrollbar (ttk.Scrollbar): La barre de défilement verticale.
+    - locations (list): Les emplacements (chemins ou EntryRef) de tous les résultats.
+    - top (int): L'indice du premier résultat visible.
+    - selected (int): L'indice du résultat sélectionné, ou None.
+    - on_select (callable): Fonction appelée avec l'indice du résultat sélectionné au clavier, ou None.
+
+    Methods:
+    - grid(**kwargs): Placer la liste dans son parent.
+    - clear(): Vider la liste des résultats.
+    - extend(locations): Ajouter des résultats à la fin de la liste.
+    - path(index): Obtenir le chemin d'un résultat.
+    - selected_path(): Obtenir le chemin du résultat sélectionné.
+    - select(index): Sélectionner un résultat et le rendre visible.
+    - neighbours(index, radius): Obtenir les chemins des résultats voisins d'un résultat.
+    - scroll_to(top): Faire défiler la liste jusqu'au résultat donné.
+    """
+
+    def __init__(self, master, height=15, on_select=None):
+        self.frame = ttk.Frame(master)
+        self.frame.rowconfigure(0, weight=1)
+        self.frame.columnconfigure(0, weight=1)
+
+        self.tree = ttk.Treeview(self.frame, columns=("Name", "Path"), show='headings', height=height, selectmode='browse')
+        self.tree.heading("Name", text="Nom")
+        self.tree.heading("Path", text="Chemin")
+        self.tree.column("Name", width=300, anchor="w")
+        self.tree.column("Path", width=500, anchor="w")
+        self.tree.grid(row=0, column=0, sticky='nsew')
+
+        self.scrollbar = ttk.Scrollbar(self.frame, orient='vertical', command=self.yview)
+        self.scrollbar.grid(row=0, column=1, sticky='ns')
+
+        self.locations = []
+        self.top = 0
+        self.selected = None
+        self.on_select = on_select
+        self.row_ids = []
+        self.rendering = False
+        self.set_row_count(height)
+
+        self.tree.bind("<Configure>", self.on_configure)
+        self.tree.bind("<<TreeviewSelect>>", self.on_tree_select)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(3))
+        self.tree.bind("<Up>", lambda event: self.move_selection(-1))
+        self.tree.bind("<Down>", lambda event: self.move_selection(1))
+        self.tree.bind("<Prior>", lambda event: self.move_selection(-len(self.row_ids)))
+        self.tree.bind("<Next>", lambda event: self.move_selection(len(self.row_ids)))
+        self.tree.bind("<Home>", lambda event: self.move_selection(-len(self.locations)))
+        self.tree.bind("<End>", lambda event: self.move_selection(len(self.locations)))
+
+    #------------------------------------------------------------------------------------------------#
+
+    def grid(self, **kwargs):
+        """ Placer la liste dans son parent. """
+        self.frame.grid(**kwargs)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def __len__(self):
+        return len(self.locations)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def clear(self):
+        """ Vider la liste des résultats. """
+        self.locations = []
+        self.top = 0
+        self.selected = None
+        self.render()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def extend(self, locations):
+        """ Ajouter des résultats à la fin de la liste (seule la partie visible est redessinée). """
+        start = len(self.locations)
+        self.locations.extend(locations)
+        if start < self.top + len(self.row_ids):
+            self.render()
+        else:
+            self.update_scrollbar()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def path(self, index):
+        """ Obtenir le chemin d'un résultat (construit à la demande pour une référence). """
+        return os.fspath(self.locations[index])
+
+    #------------------------------------------------------------------------------------------------#
+
+    def selected_path(self):
+        """ Obtenir le chemin du résultat sélectionné, ou None. """
+        if self.selected is None or self.selected >= len(self.locations):
+            return None
+        return self.path(self.selected)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def select(self, index):
+        """ Sélectionner un résultat et faire défiler la liste pour le rendre visible. """
+        if not self.locations:
+            return
+        index = max(0, min(index, len(self.locations) - 1))
+        self.selected = index
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + len(self.row_ids):
+            self.top = index - len(self.row_ids) + 1
+        self.render()
+        self.tree.focus(self.row_ids[index - self.top])
+
+    #------------------------------------------------------------------------------------------------#
+
+    def move_selection(self, delta):
+        """ Déplacer la sélection au clavier. """
+        self.select((self.selected if self.selected is not None else self.top - 1) + delta)
+        if self.on_select is not None and self.selected is not None:
+            self.on_select(self.selected)
+        return "break"
+
+    #------------------------------------------------------------------------------------------------#
+
+    def neighbours(self, index, radius):
+        """ Obtenir les chemins des résultats voisins d'un résultat, du plus proche au plus éloigné. """
+        paths = []
+        for distance in range(1, radius + 1):
+            for neighbour in (index + distance, index - distance):
+                if 0 <= neighbour < len(self.locations):
+                    paths.append(self.path(neighbour))
+        return paths
+
+    #------------------------------------------------------------------------------------------------#
+
+    def scroll_to(self, top):
+        """ Faire défiler la liste pour que le résultat d'indice top soit le premier visible. """
+        top = max(0, min(int(top), len(self.locations) - len(self.row_ids)))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def scroll_by(self, delta):
+        """ Faire défiler la liste d'un nombre de lignes donné. """
+        self.scroll_to(self.top + delta)
+        return "break"
+
+    #------------------------------------------------------------------------------------------------#
+
+    def yview(self, *args):
+        """ Commande de la barre de défilement ("moveto" ou "scroll"). """
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * len(self.locations))
+        elif args[0] == "scroll":
+            step = len(self.row_ids) if args[2] == "pages" else 1
+            self.scroll_by(int(args[1]) * step)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def on_mousewheel(self, event):
+        """ Défilement à la molette (Windows et macOS). """
+        if event.delta:
+            steps = event.delta // 120 if abs(event.delta) >= 120 else (1 if event.delta > 0 else -1)
+            self.scroll_by(-3 * steps)
+        return "break"
+
+    #------------------------------------------------------------------------------------------------#
+
+    def on_configure(self, event):
+        """ Adapter le nombre de lignes à la hauteur de l'arbre. """
+        bbox = self.tree.bbox(self.row_ids[0]) if self.row_ids and self.locations else None
+        if bbox:
+            header_height, row_height = bbox[1], bbox[3]
+        else:
+            row_height = int(ttk.Style().lookup("Treeview", "rowheight") or 20)
+            header_height = row_height
+        self.set_row_count(max(1, (event.height - header_height) // row_height))
+        self.render()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def on_tree_select(self, event):
+        """ Mémoriser l'indice du résultat sélectionné à la souris. """
+        if self.rendering:
+            return
+        selection = self.tree.selection()
+        if selection and selection[0] in self.row_ids:
+            self.selected = self.top + self.row_ids.index(selection[0])
+
+    #------------------------------------------------------------------------------------------------#
+
+    def set_row_count(self, count):
+        """ Créer ou supprimer des lignes pour n'en garder que le nombre visible. """
+        while len(self.row_ids) < count:
+            iid = f"row{len(self.row_ids)}"
+            self.tree.insert('', 'end', iid=iid, values=("", ""))
+            self.row_ids.append(iid)
+        while len(self.row_ids) > count:
+            self.tree.delete(self.row_ids.pop())
+
+    #------------------------------------------------------------------------------------------------#
+
+    def render(self):
+        """ Réaffecter aux lignes visibles les valeurs des résultats correspondants. """
+        self.rendering = True
+        try:
+            self.top = max(0, min(self.top, len(self.locations) - len(self.row_ids)))
+            selection = ()
+            rendered = 0
+            for i, iid in enumerate(self.row_ids):
+                index = self.top + i
+                if index < len(self.locations):
+                    path = self.path(index)
+                    tag = 'evenrow' if index % 2 == 0 else 'oddrow'
+                    self.tree.move(iid, '', i)
+                    self.tree.item(iid, values=(os.path.basename(path) or path, path), tags=(tag,))
+                    rendered += 1
+                    if index == self.selected:
+                        selection = (iid,)
+                else:
+                    self.tree.detach(iid)
+            self.tree.selection_set(selection)
+            METRICS.add("rows_rendered", rendered)
+        finally:
+            self.rendering = False
+        self.update_scrollbar()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def update_scrollbar(self):
+        """ Mettre à jour la position et la taille du curseur de défilement. """
+        if not self.locations:
+            self.scrollbar.set(0, 1)
+            return
+        total = len(self.locations)
+        self.scrollbar.set(self.top / total, min(1.0, (self.top + len(self.row_ids)) / total))
+
+#------------------------------------------------------------------------------------------------#
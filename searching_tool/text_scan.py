@@ -0,0 +1,103 @@
+import os
+import re
+import mmap
+
+#------------------------------------------------------------------------------------------------#
+
+# Taille des blocs lus lorsque le fichier ne peut pas être projeté en mémoire
+CHUNK_SIZE = 1 << 20
+
+#------------------------------------------------------------------------------------------------#
+
+def compile_term(search_term):
+    """
+    Compiler un terme de recherche en motif binaire UTF-8 insensible à la casse.
+
+    re.IGNORECASE ne traite que l'ASCII sur des octets : chaque caractère non ASCII est donc
+    remplacé par l'alternative de ses formes minuscule et majuscule.
+
+    Returns:
+    tuple: Le motif compilé et la longueur maximale (en octets) d'une correspondance.
+    """
+    parts = []
+    max_length = 0
+    for char in search_term:
+        variants = {char.encode('utf-8'), char.lower().encode('utf-8'), char.upper().encode('utf-8')}
+        max_length += max(len(variant) for variant in variants)
+        if char.isascii():
+            parts.append(re.escape(char.encode('utf-8')))
+        else:
+            parts.append(b"(?:" + b"|".join(re.escape(variant) for variant in sorted(variants)) + b")")
+    return re.compile(b"".join(parts), re.IGNORECASE), max_length
+
+#------------------------------------------------------------------------------------------------#
+
+def iter_matches(path, search_term, chunk_size=CHUNK_SIZE):
+    """
+    Générer les positions (en octets) des occurrences d'un terme dans un fichier texte.
+
+    Le fichier est projeté en mémoire (mmap) ou, à défaut, lu par blocs de taille fixe qui se
+    chevauchent : la mémoire utilisée reste bornée quelle que soit la taille du fichier.
+
+    Parameters:
+    path (str): Le chemin du fichier.
+    search_term (str): Le terme recherché (sans tenir compte de la casse).
+    chunk_size (int): La taille des blocs lus lorsque mmap n'est pas utilisable.
+
+    Returns:
+    generator: Les positions de début de chaque occurrence.
+    """
+    if not search_term:
+        return
+    pattern, max_length = compile_term(search_term)
+    with open(path, 'rb') as f:
+        try:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            mapped = None
+        if mapped is not None:
+            with mapped:
+                for match in pattern.finditer(mapped):
+                    yield match.start()
+            return
+        yield from iter_chunk_matches(f, pattern, max_length - 1, chunk_size)
+
+#------------------------------------------------------------------------------------------------#
+
+def iter_chunk_matches(f, pattern, overlap, chunk_size=CHUNK_SIZE):
+    """ Rechercher un motif bloc par bloc en conservant un chevauchement entre deux blocs. """
+    offset = 0
+    last_end = 0
+    tail = b""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            return
+        buffer = tail + chunk
+        base = offset - len(tail)
+        # La recherche reprend après la dernière occurrence signalée, comme le ferait finditer
+        for match in pattern.finditer(buffer, max(0, last_end - base)):
+            last_end = base + match.end()
+            yield base + match.start()
+        tail = buffer[-overlap:] if overlap > 0 else b""
+        offset += len(chunk)
+
+#------------------------------------------------------------------------------------------------#
+
+def find_first(path, search_term, chunk_size=CHUNK_SIZE):
+    """ Retourner la position de la première occurrence du terme dans le fichier, ou None. """
+    matches = iter_matches(path, search_term, chunk_size)
+    try:
+        return next(matches, None)
+    finally:
+        matches.close()
+
+#------------------------------------------------------------------------------------------------#
+
+def text_file_contains(path, search_term):
+    """ Indiquer si un fichier texte contient le terme, en s'arrêtant à la première occurrence. """
+    return find_first(path, search_term) is not None
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,331 @@
+import os
+import mmap
+from array import array
+from bisect import bisect_left
+from tkinter import Text, Scrollbar
+import tkinter.font as tkfont
+
+#------------------------------------------------------------------------------------------------#
+
+# Taille des blocs de l'index des lignes : le nombre de lignes est mémorisé au début de chaque bloc
+INDEX_BLOCK_SIZE = 64 * 1024
+
+# Nombre de blocs indexés à chaque étape de l'indexation de fond (entre deux événements Tk)
+INDEX_BLOCKS_PER_STEP = 64
+
+# Taille de l'échantillon lu pour distinguer un fichier texte d'un fichier binaire
+BINARY_SAMPLE_SIZE = 8192
+
+# Proportion maximale d'octets de contrôle dans l'échantillon d'un fichier texte
+BINARY_CONTROL_RATIO = 0.3
+
+# Les lignes plus longues (fichiers minifiés...) sont tronquées à l'affichage
+MAX_LINE_BYTES = 10000
+
+# Nombre d'octets par ligne de la vue hexadécimale
+HEX_ROW_BYTES = 16
+
+# Octets de contrôle courants dans un fichier texte (tabulation, retours à la ligne, saut de page, échappement)
+TEXT_CONTROL_BYTES = frozenset(b"\t\n\r\f\b\x1b")
+
+#------------------------------------------------------------------------------------------------#
+
+def looks_binary(sample):
+    """ Indiquer si un échantillon d'octets provient d'un fichier binaire plutôt que d'un fichier texte. """
+    if not sample:
+        return False
+    if b"\x00" in sample:
+        return True
+    control = sum(1 for byte in sample if byte < 32 and byte not in TEXT_CONTROL_BYTES)
+    return control / len(sample) > BINARY_CONTROL_RATIO
+
+#------------------------------------------------------------------------------------------------#
+
+def read_sample(path, size=BINARY_SAMPLE_SIZE):
+    """ Lire le début d'un fichier. """
+    with open(path, 'rb') as f:
+        return f.read(size)
+
+#------------------------------------------------------------------------------------------------#
+
+def map_file(path):
+    """ Projeter un fichier en mémoire en lecture seule (un fichier vide donne des octets vides). """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+#------------------------------------------------------------------------------------------------#
+
+class LineSource:
+    """ Lignes d'un fichier texte projeté en mémoire, indexées au fur et à mesure.
+
+    L'index mémorise le nombre de retours à la ligne précédant chaque bloc de INDEX_BLOCK_SIZE
+    octets : il est construit par blocs (en arrière-plan ou à la demande) et reste petit même pour
+    un fichier de plusieurs Go. La position d'une ligne est retrouvée dans son bloc.
+
+    Attributes:
+    - data (mmap.mmap | bytes): Le contenu du fichier.
+    - size (int): La taille du fichier en octets.
+    - block_lines (array): Le nombre de retours à la ligne avant chaque bloc indexé.
+    - scanned (int): Le nombre d'octets déjà indexés.
+
+    Methods:
+    - index_step(blocks): Indexer quelques blocs supplémentaires ; retourne False une fois terminé.
+    - line_count(): Obtenir le nombre de lignes (estimé tant que l'index est incomplet).
+    - lines(start, count): Obtenir des lignes décodées.
+    - close(): Libérer la projection du fichier.
+    """
+
+    def __init__(self, path):
+        self.data = map_file(path)
+        self.size = len(self.data)
+        self.block_lines = array('Q', [0])
+        self.scanned = 0
+
+    #------------------------------------------------------------------------------------------------#
+
+    def index_step(self, blocks=INDEX_BLOCKS_PER_STEP):
+        """ Indexer quelques blocs supplémentaires ; retourne False lorsque tout le fichier est indexé. """
+        for _ in range(blocks):
+            if self.scanned >= self.size:
+                return False
+            end = min(self.scanned + INDEX_BLOCK_SIZE, self.size)
+            self.block_lines.append(self.block_lines[-1] + self.data[self.scanned:end].count(b"\n"))
+            self.scanned = end
+        return self.scanned < self.size
+
+    #------------------------------------------------------------------------------------------------#
+
+    def line_count(self):
+        """ Obtenir le nombre de lignes du fichier, estimé d'après la partie indexée si nécessaire. """
+        newlines = self.block_lines[-1]
+        if self.scanned < self.size:
+            return max(newlines, newlines * self.size // max(self.scanned, 1))
+        # Une dernière ligne sans retour à la ligne compte aussi
+        return newlines + (1 if self.size and self.data[self.size - 1:self.size] != b"\n" else 0)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def line_offset(self, number):
+        """ Obtenir la position (en octets) du début d'une ligne, ou None si elle n'existe pas. """
+        if number == 0:
+            return 0
+        while self.block_lines[-1] < number and self.index_step():
+            pass
+        if self.block_lines[-1] < number:
+            return None
+        # Le bloc contenant le retour à la ligne qui termine la ligne précédente
+        block = bisect_left(self.block_lines, number) - 1
+        position = block * INDEX_BLOCK_SIZE - 1
+        for _ in range(number - self.block_lines[block]):
+            position = self.data.find(b"\n", position + 1)
+        return position + 1
+
+    #------------------------------------------------------------------------------------------------#
+
+    def lines(self, start, count):
+        """ Obtenir au plus count lignes décodées à partir de la ligne start. """
+        position = self.line_offset(start)
+        result = []
+        while position is not None and position < self.size and len(result) < count:
+            # La recherche de la fin de ligne est bornée : seuls MAX_LINE_BYTES octets sont affichés
+            end = self.data.find(b"\n", position, position + MAX_LINE_BYTES + 1)
+            if end < 0 and position + MAX_LINE_BYTES < self.size:
+                line = self.data[position:position + MAX_LINE_BYTES].decode('utf-8', errors='replace')
+                result.append(line + " … (ligne tronquée)")
+                # Le début de la ligne suivante est retrouvé par l'index des blocs, complété une seule fois
+                position = self.line_offset(start + len(result))
+                continue
+            end = self.size if end < 0 else end
+            result.append(self.data[position:end].decode('utf-8', errors='replace').rstrip("\r"))
+            position = end + 1
+        return result
+
+    #------------------------------------------------------------------------------------------------#
+
+    def close(self):
+        """ Libérer la projection du fichier. """
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+#------------------------------------------------------------------------------------------------#
+
+class HexSource:
+    """ Vue hexadécimale d'un fichier binaire projeté en mémoire, précédée d'un résumé.
+
+    Attributes:
+    - data (mmap.mmap | bytes): Le contenu du fichier.
+    - size (int): La taille du fichier en octets.
+    - header (list): Les lignes du résumé.
+
+    Methods:
+    - index_step(blocks): Sans effet (les lignes sont de longueur fixe) ; retourne False.
+    - line_count(): Obtenir le nombre de lignes de la vue.
+    - lines(start, count): Obtenir des lignes de la vue.
+    - close(): Libérer la projection du fichier.
+    """
+
+    def __init__(self, path):
+        self.data = map_file(path)
+        self.size = len(self.data)
+        size = f"{self.size:,}".replace(",", " ")
+        self.header = [f"Fichier binaire : {os.path.basename(path)}, {size} octets", ""]
+
+    #------------------------------------------------------------------------------------------------#
+
+    def index_step(self, blocks=INDEX_BLOCKS_PER_STEP):
+        """ Sans effet : les lignes de la vue hexadécimale sont de longueur fixe. """
+        return False
+
+    #------------------------------------------------------------------------------------------------#
+
+    def line_count(self):
+        """ Obtenir le nombre de lignes de la vue (résumé compris). """
+        return len(self.header) + (self.size + HEX_ROW_BYTES - 1) // HEX_ROW_BYTES
+
+    #------------------------------------------------------------------------------------------------#
+
+    def lines(self, start, count):
+        """ Obtenir au plus count lignes de la vue à partir de la ligne start. """
+        result = self.header[start:start + count]
+        row = max(0, start - len(self.header))
+        while len(result) < count and row * HEX_ROW_BYTES < self.size:
+            offset = row * HEX_ROW_BYTES
+            chunk = self.data[offset:offset + HEX_ROW_BYTES]
+            hex_part = " ".join(f"{byte:02x}" for byte in chunk)
+            text_part = "".join(chr(byte) if 32 <= byte < 127 else "." for byte in chunk)
+            result.append(f"{offset:08x}  {hex_part:<{HEX_ROW_BYTES * 3 - 1}}  |{text_part}|")
+            row += 1
+        return result
+
+    #------------------------------------------------------------------------------------------------#
+
+    def close(self):
+        """ Libérer la projection du fichier. """
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+#------------------------------------------------------------------------------------------------#
+
+class TextViewer:
+    """ Visionneuse fenêtrée : seules les lignes visibles sont insérées dans la zone de texte.
+
+    La barre de défilement verticale est gérée par la visionneuse (et non par le widget Text) :
+    elle représente la position dans le fichier entier. L'index des lignes est complété en
+    arrière-plan, entre deux événements Tk, sans bloquer l'interface.
+
+    Attributes:
+    - window (tk.Toplevel): La fenêtre de prévisualisation.
+    - source (LineSource | HexSource): Les lignes à afficher.
+    - text_widget (tk.Text): La zone de texte.
+    - first (int): Le numéro de la première ligne affichée.
+
+    Methods:
+    - refresh(): Afficher les lignes visibles à partir de la première ligne.
+    - close(): Libérer la source.
+    """
+
+    def __init__(self, window, source, font):
+        self.window = window
+        self.source = source
+        self.first = 0
+        self.closed = False
+        self.line_height = max(1, tkfont.Font(font=font).metrics("linespace"))
+
+        self.text_widget = Text(window, wrap='none', font=font)
+        self.scrollbar = Scrollbar(window, command=self.on_scroll)
+        xscrollbar = Scrollbar(window, orient='horizontal', command=self.text_widget.xview)
+        self.text_widget.configure(xscrollcommand=xscrollbar.set)
+        self.scrollbar.pack(side='right', fill='y')
+        xscrollbar.pack(side='bottom', fill='x')
+        self.text_widget.pack(side='left', fill='both', expand=True)
+
+        self.text_widget.bind("<Configure>", lambda event: self.refresh())
+        self.text_widget.bind("<MouseWheel>", self.on_mousewheel)
+        self.text_widget.bind("<Button-4>", lambda event: self.on_scroll("scroll", -3, "units"))
+        self.text_widget.bind("<Button-5>", lambda event: self.on_scroll("scroll", 3, "units"))
+        for key, args in (("<Up>", (-1, "units")), ("<Down>", (1, "units")),
+                          ("<Prior>", (-1, "pages")), ("<Next>", (1, "pages"))):
+            self.text_widget.bind(key, lambda event, args=args: self.on_scroll("scroll", *args))
+        self.text_widget.bind("<Control-Home>", lambda event: self.on_scroll("moveto", 0))
+        self.text_widget.bind("<Control-End>", lambda event: self.on_scroll("moveto", 1))
+        window.bind("<Destroy>", self.on_destroy, add="+")
+        self.refresh()
+        self.window.after(1, self.index_step)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def visible_count(self):
+        """ Obtenir le nombre de lignes que peut afficher la zone de texte. """
+        return max(1, self.text_widget.winfo_height() // self.line_height)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def on_scroll(self, command, *args):
+        """ Commande de la barre de défilement (et des touches de déplacement). """
+        visible = self.visible_count()
+        if command == "moveto":
+            self.first = int(float(args[0]) * self.source.line_count())
+        elif command == "scroll":
+            step = int(args[0])
+            self.first += step * visible if args[1] == "pages" else step
+        self.first = max(0, min(self.first, self.source.line_count() - visible))
+        self.refresh()
+        return "break"
+
+    #------------------------------------------------------------------------------------------------#
+
+    def on_mousewheel(self, event):
+        """ Défilement à la molette (Windows et macOS). """
+        if event.delta:
+            steps = event.delta // 120 if abs(event.delta) >= 120 else (1 if event.delta > 0 else -1)
+            self.on_scroll("scroll", -3 * steps, "units")
+        return "break"
+
+    #------------------------------------------------------------------------------------------------#
+
+    def refresh(self):
+        """ Afficher les lignes visibles à partir de la première ligne. """
+        if self.closed:
+            return
+        visible = self.visible_count()
+        lines = self.source.lines(self.first, visible)
+        self.text_widget.configure(state='normal')
+        self.text_widget.delete('1.0', 'end')
+        self.text_widget.insert('1.0', "\n".join(lines))
+        self.text_widget.configure(state='disabled')
+        self.update_scrollbar()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def update_scrollbar(self):
+        """ Placer la barre de défilement selon la position dans le fichier entier. """
+        total = max(self.source.line_count(), 1)
+        self.scrollbar.set(min(self.first / total, 1.0), min((self.first + self.visible_count()) / total, 1.0))
+
+    #------------------------------------------------------------------------------------------------#
+
+    def index_step(self):
+        """ Compléter l'index des lignes par petites étapes, entre deux événements Tk. """
+        if self.closed:
+            return
+        if self.source.index_step():
+            self.window.after(1, self.index_step)
+        self.update_scrollbar()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def on_destroy(self, event):
+        """ Libérer la source à la fermeture de la fenêtre. """
+        if event.widget is self.window:
+            self.close()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def close(self):
+        """ Libérer la source. """
+        self.closed = True
+        self.source.close()
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,167 @@
+from array import array
+from bisect import bisect_left
+from .entry_store import FLAG_DIR
+
+#------------------------------------------------------------------------------------------------#
+
+def trigrams(text):
+    """ Obtenir l'ensemble des trigrammes (sous-chaînes de 3 caractères) d'un texte. """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+#------------------------------------------------------------------------------------------------#
+
+def contains_sorted(values, value):
+    """ Indiquer si une liste triée contient une valeur (recherche dichotomique). """
+    i = bisect_left(values, value)
+    return i < len(values) and values[i] == value
+
+#------------------------------------------------------------------------------------------------#
+
+class TrigramIndex:
+    """ Index de trigrammes sur des noms en minuscules pour la recherche de sous-chaînes.
+
+    Chaque trigramme pointe vers la liste triée des identifiants des noms qui le contiennent. Une
+    recherche part de la plus courte de ces listes et vérifie la présence des autres trigrammes par
+    dichotomie : le coût dépend du nombre de candidats et non du nombre total de noms. Les candidats
+    sont enfin confirmés par une comparaison exacte de sous-chaîne.
+
+    Attributes:
+    - names (sequence): Les noms indexés, en minuscules (liste ou PackedStrings).
+    - postings (dict): Pour chaque trigramme, les identifiants (array triée) des noms qui le contiennent.
+
+    Methods:
+    - search(term): Retourner les identifiants des noms contenant le terme.
+    """
+
+    def __init__(self, names):
+        self.names = names
+        self.postings = {}
+        for name_id, name in enumerate(names):
+            for gram in trigrams(name):
+                ids = self.postings.get(gram)
+                if ids is None:
+                    ids = self.postings[gram] = array('I')
+                ids.append(name_id)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def search(self, term):
+        """ Retourner la liste triée des identifiants des noms contenant le terme (en minuscules). """
+        grams = trigrams(term)
+        if not grams:
+            # Terme de moins de 3 caractères : la plupart des noms sont candidats, parcours direct
+            return [name_id for name_id, name in enumerate(self.names) if term in name]
+        lists = []
+        for gram in grams:
+            ids = self.postings.get(gram)
+            if ids is None:
+                return []
+            lists.append(ids)
+        lists.sort(key=len)
+        smallest, others = lists[0], lists[1:]
+        return [name_id for name_id in smallest
+                if all(contains_sorted(ids, name_id) for ids in others) and term in self.names[name_id]]
+
+#------------------------------------------------------------------------------------------------#
+
+class NameIndex:
+    """ Copie en mémoire des entrées de l'index, avec un index de trigrammes sur les noms.
+
+    Les entrées sont conservées dans un EntryStore compact (projeté depuis le disque lorsqu'il a
+    été enregistré) : les résultats ne portent qu'une référence à leur entrée (EntryRef), dont le
+    chemin complet n'est construit qu'à l'affichage. L'index de trigrammes est construit après
+    l'ouverture ; d'ici là, les noms sont cherchés directement dans le tampon des noms en minuscules.
+
+    Attributes:
+    - store (EntryStore): Les entrées de l'index.
+    - trigram_index (TrigramIndex): L'index de trigrammes sur les noms en minuscules, ou None tant qu'il n'est pas construit.
+
+    Methods:
+    - from_file_index(file_index): Construire la copie en mémoire d'un FileIndex.
+    - build_trigrams(): Construire l'index de trigrammes.
+    - search_names(search_term, search_type, extensions): Rechercher les entrées dont le nom contient le terme.
+    - non_matching_files(search_term, extensions): Lister les fichiers dont le nom ne contient pas le terme.
+    - list_entries(search_type, extensions): Lister les entrées du type et des extensions donnés, triées par nom.
+    """
+
+    def __init__(self, store, build_trigrams=True):
+        self.store = store
+        self.trigram_index = None
+        if build_trigrams:
+            self.build_trigrams()
+
+    #------------------------------------------------------------------------------------------------#
+
+    @classmethod
+    def from_file_index(cls, file_index, build_trigrams=True):
+        """ Construire la copie en mémoire d'un FileIndex (depuis son magasin enregistré s'il est à jour). """
+        return cls(file_index.entry_store(), build_trigrams)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def build_trigrams(self):
+        """ Construire l'index de trigrammes sur les noms en minuscules. """
+        self.trigram_index = TrigramIndex(self.store.lower_names)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def match(self, entry_id):
+        """ Construire le résultat (nom, référence, mtime) d'une entrée : le chemin n'est construit qu'à la demande. """
+        store = self.store
+        return (store.names[entry_id], store.ref(entry_id), store.mtimes[entry_id])
+
+    #------------------------------------------------------------------------------------------------#
+
+    def wanted_extensions(self, extensions):
+        """ Obtenir les indices des extensions recherchées dans le magasin. """
+        extension_ids = self.store.extension_ids
+        return {extension_ids[ext] for ext in {ext.lower() for ext in extensions} if ext in extension_ids}
+
+    #------------------------------------------------------------------------------------------------#
+
+    def search_names(self, search_term, search_type, extensions):
+        """ Rechercher les entrées dont le nom contient le terme : retourne les (nom, référence, mtime). """
+        store = self.store
+        wanted = self.wanted_extensions(extensions)
+        if search_type != "dossier" and not wanted:
+            return []
+        search_term = search_term.lower()
+        trigram_index = self.trigram_index
+        if trigram_index is not None and len(search_term) >= 3:
+            ids = trigram_index.search(search_term)
+        else:
+            ids = store.lower_names.find_all(search_term)
+        flags, ext_ids = store.flags, store.ext_ids
+        if search_type == "dossier":
+            ids = [i for i in ids if flags[i] & FLAG_DIR]
+        else:
+            ids = [i for i in ids if not flags[i] & FLAG_DIR and ext_ids[i] in wanted]
+        # Pas de tri : les résultats sont classés par pertinence ensuite
+        return [self.match(i) for i in ids]
+
+    #------------------------------------------------------------------------------------------------#
+
+    def non_matching_files(self, search_term, extensions):
+        """ Lister les fichiers des extensions données dont le nom ne contient pas le terme : (nom, référence, mtime). """
+        search_term = search_term.lower()
+        lower_names = self.store.lower_names
+        return [self.match(i)
+                for ext in {ext.lower() for ext in extensions}
+                for i in self.store.files_with_extension(ext)
+                if search_term not in lower_names[i]]
+
+    #------------------------------------------------------------------------------------------------#
+
+    def list_entries(self, search_type, extensions):
+        """ Lister les entrées du type et des extensions donnés, triées par nom : génère les (nom, référence, mtime). """
+        store = self.store
+        if search_type == "dossier":
+            flags = store.flags
+            ids = [i for i in range(len(store)) if flags[i] & FLAG_DIR]
+        else:
+            ids = [i for ext in {ext.lower() for ext in extensions} for i in store.files_with_extension(ext)]
+        # Seules les clés de tri sont décodées : les chemins sont construits au fur et à mesure de l'affichage
+        ids.sort(key=store.lower_names.__getitem__)
+        return (self.match(i) for i in ids)
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,204 @@
+import queue
+import threading
+import time
+import tkinter as tk
+from PIL import Image, ImageTk
+import cv2
+
+#------------------------------------------------------------------------------------------------#
+
+# Nombre maximal d'images décodées d'avance : le décodage attend que l'affichage les consomme
+FRAME_QUEUE_SIZE = 4
+
+# Taille maximale des images avant que la fenêtre ne soit affichée
+DEFAULT_FRAME_SIZE = (1100, 1100)
+
+# Cadence utilisée lorsque le fichier n'indique pas la sienne
+DEFAULT_FPS = 25.0
+
+# Position (fraction de la durée) de l'image d'aperçu, pour éviter une première image souvent noire
+POSTER_POSITION = 0.1
+
+# Intervalle (ms) d'attente lorsque aucune image n'est encore décodée
+WAIT_INTERVAL = 5
+
+#------------------------------------------------------------------------------------------------#
+
+def fit_size(width, height, max_width, max_height):
+    """ Obtenir les dimensions d'une image réduite pour tenir dans un cadre (jamais agrandie). """
+    scale = min(max_width / width, max_height / height, 1.0)
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+#------------------------------------------------------------------------------------------------#
+
+def convert_frame(frame, max_size):
+    """ Réduire une image décodée par OpenCV (BGR) puis la convertir en image PIL. """
+    height, width = frame.shape[:2]
+    size = fit_size(width, height, *max_size)
+    if size != (width, height):
+        # La réduction précède la conversion : seuls les pixels affichés sont convertis
+        frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+    return Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+
+#------------------------------------------------------------------------------------------------#
+
+def read_poster_frame(path, max_size=DEFAULT_FRAME_SIZE):
+    """ Décoder une seule image d'une vidéo (image d'aperçu), réduite, ou None. """
+    cap = cv2.VideoCapture(path)
+    try:
+        frame_count = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        if frame_count > 1:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(frame_count * POSTER_POSITION))
+        ret, frame = cap.read()
+        if not ret:
+            # Certains formats ne permettent pas de se déplacer : la première image est utilisée
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = cap.read()
+        return convert_frame(frame, max_size) if ret else None
+    finally:
+        cap.release()
+
+#------------------------------------------------------------------------------------------------#
+
+class VideoPlayer:
+    """ Lecteur vidéo de la fenêtre de prévisualisation.
+
+    Le décodage et la réduction des images se font dans un thread de fond, qui alimente une file
+    bornée ; le thread Tk n'affiche que des images prêtes, au rythme réel de la vidéo (des images
+    sont sautées si l'affichage prend du retard). La lecture s'arrête et le fichier est libéré à la
+    fermeture de la fenêtre. Sans lecture automatique, seule l'image d'aperçu est affichée.
+
+    Attributes:
+    - window (tk.Toplevel): La fenêtre de prévisualisation.
+    - path (str): Le chemin de la vidéo.
+    - label (tk.Label): Le widget affichant les images.
+    - frames (queue.Queue): Les images décodées, en attente d'affichage.
+    - stop_event (threading.Event): Demande l'arrêt du décodage.
+
+    Methods:
+    - play(): Lancer la lecture.
+    - stop(): Arrêter la lecture et libérer le fichier.
+    """
+
+    def __init__(self, window, path, poster=None, autoplay=True):
+        self.window = window
+        self.path = path
+        self.frame_size = DEFAULT_FRAME_SIZE
+        self.frames = queue.Queue(maxsize=FRAME_QUEUE_SIZE)
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.fps = DEFAULT_FPS
+        self.start_time = None
+
+        self.play_button = tk.Button(window, text="Lire la vidéo", command=self.play)
+        self.play_button.pack(side='bottom', pady=5)
+        self.label = tk.Label(window)
+        self.label.pack(expand=True, fill=tk.BOTH)
+        self.label.bind("<Configure>", self.on_resize)
+        window.bind("<Destroy>", self.on_destroy, add="+")
+        if poster is not None:
+            self.show_image(poster)
+        if autoplay:
+            self.play()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def on_resize(self, event):
+        """ Mémoriser la taille d'affichage : les images suivantes sont réduites à cette taille. """
+        if event.width > 1 and event.height > 1:
+            self.frame_size = (event.width, event.height)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def show_image(self, image):
+        """ Afficher une image PIL. """
+        imgtk = ImageTk.PhotoImage(image=image)
+        self.label.imgtk = imgtk
+        self.label.configure(image=imgtk)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def play(self):
+        """ Lancer la lecture (décodage dans un thread de fond). """
+        if self.thread is not None:
+            return
+        self.play_button.pack_forget()
+        self.thread = threading.Thread(target=self.decode_frames, daemon=True)
+        self.thread.start()
+        self.window.after(WAIT_INTERVAL, self.show_next_frame)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def decode_frames(self):
+        """ Décoder et réduire les images dans le thread de fond. """
+        cap = cv2.VideoCapture(self.path)
+        try:
+            self.fps = cap.get(cv2.CAP_PROP_FPS) or DEFAULT_FPS
+            index = 0
+            while not self.stop_event.is_set():
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if not self.put((index, convert_frame(frame, self.frame_size))):
+                    return
+                index += 1
+            # Fin de la vidéo
+            self.put(None)
+        except Exception as e:
+            print(f"Erreur lors de la lecture de {self.path}: {str(e).encode('utf-8', errors='ignore')}")
+            self.put(None)
+        finally:
+            cap.release()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def put(self, item):
+        """ Ajouter une image à la file en attendant de la place ; retourne False si la lecture est arrêtée. """
+        while not self.stop_event.is_set():
+            try:
+                self.frames.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    #------------------------------------------------------------------------------------------------#
+
+    def show_next_frame(self):
+        """ Afficher l'image suivante à son heure (exécuté dans le thread Tk). """
+        if self.stop_event.is_set():
+            return
+        try:
+            item = self.frames.get_nowait()
+        except queue.Empty:
+            self.window.after(WAIT_INTERVAL, self.show_next_frame)
+            return
+        if item is None:
+            self.stop()
+            return
+        index, image = item
+        if self.start_time is None:
+            self.start_time = time.monotonic()
+        now = time.monotonic()
+        # En retard d'au moins une image : celle-ci est sautée si la suivante est déjà prête
+        if now > self.start_time + (index + 1) / self.fps and not self.frames.empty():
+            self.window.after_idle(self.show_next_frame)
+            return
+        self.show_image(image)
+        delay = self.start_time + (index + 1) / self.fps - time.monotonic()
+        self.window.after(max(1, int(delay * 1000)), self.show_next_frame)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def on_destroy(self, event):
+        """ Arrêter la lecture à la fermeture de la fenêtre. """
+        if event.widget is self.window:
+            self.stop()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def stop(self):
+        """ Arrêter la lecture ; le thread de décodage libère le fichier. """
+        self.stop_event.set()
+
+#------------------------------------------------------------------------------------------------#
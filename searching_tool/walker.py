@@ -0,0 +1,269 @@
+import os
+import re
+import time
+from pathlib import Path
+from .metrics import METRICS
+
+#------------------------------------------------------------------------------------------------#
+
+# Dossiers exclus par défaut (syntaxe .gitignore) : dépôts, dépendances, environnements virtuels et caches
+DEFAULT_EXCLUDES = (
+    ".git/", ".hg/", ".svn/",
+    "node_modules/", "bower_components/",
+    ".venv/", "venv/", ".tox/", ".nox/",
+    "__pycache__/", ".mypy_cache/", ".pytest_cache/", ".ruff_cache/", ".cache/", ".gradle/",
+)
+
+# Fichier de motifs d'exclusion supplémentaires de l'utilisateur (syntaxe .gitignore)
+IGNORE_FILE = Path.home() / ".smart_file_search" / "ignore"
+
+#------------------------------------------------------------------------------------------------#
+
+def read_ignore_file(path=IGNORE_FILE):
+    """ Lire les motifs d'un fichier d'exclusion (syntaxe .gitignore) ; un fichier absent n'en donne aucun. """
+    try:
+        with open(path, encoding='utf-8') as f:
+            return tuple(line.rstrip("\n") for line in f)
+    except OSError:
+        return ()
+
+#------------------------------------------------------------------------------------------------#
+
+def default_excludes():
+    """ Obtenir les motifs d'exclusion par défaut, complétés par ceux du fichier de l'utilisateur. """
+    return DEFAULT_EXCLUDES + read_ignore_file()
+
+#------------------------------------------------------------------------------------------------#
+
+def extension_set(extensions):
+    """ Précalculer l'ensemble des extensions en minuscules, pour un test d'appartenance en temps constant. """
+    return frozenset(ext.lower() for ext in extensions)
+
+#------------------------------------------------------------------------------------------------#
+
+def file_extension(name):
+    """ Obtenir l'extension d'un nom de fichier en minuscules (comme dans l'index). """
+    return os.path.splitext(name)[1].lower()
+
+#------------------------------------------------------------------------------------------------#
+
+def translate_pattern(pattern):
+    """ Traduire un motif .gitignore (sans '!', ni '/' initial ou final) en expression régulière. """
+    regex = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            regex.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            regex.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end < 0:
+                regex.append(re.escape(char))
+            else:
+                content = pattern[i + 1:end]
+                if content.startswith("!"):
+                    content = "^" + content[1:]
+                regex.append("[" + content.replace("\\", "\\\\") + "]")
+                i = end
+        elif char == "\\" and i + 1 < len(pattern):
+            i += 1
+            regex.append(re.escape(pattern[i]))
+        else:
+            regex.append(re.escape(char))
+        i += 1
+    return "".join(regex)
+
+#------------------------------------------------------------------------------------------------#
+
+class ExcludeRules:
+    """ Motifs d'exclusion au format .gitignore.
+
+    Un motif sans '/' (autre que final) s'applique au nom de l'entrée à toute profondeur ; un motif
+    contenant '/' s'applique au chemin relatif à la racine. Un '/' final restreint le motif aux
+    dossiers, un '!' initial ré-inclut les entrées correspondantes (le dernier motif qui s'applique
+    l'emporte). Sans motif '!', les motifs sont regroupés en quelques expressions régulières.
+
+    Attributes:
+    - patterns (tuple): Les motifs, dans l'ordre.
+
+    Methods:
+    - excluded(relative_path, name, is_dir): Indiquer si une entrée est exclue.
+    """
+
+    def __init__(self, patterns=()):
+        self.patterns = tuple(patterns)
+        self.rules = []
+        for pattern in self.patterns:
+            pattern = pattern.strip()
+            if not pattern or pattern.startswith("#"):
+                continue
+            negate = pattern.startswith("!")
+            if negate:
+                pattern = pattern[1:]
+            dir_only = pattern.endswith("/")
+            pattern = pattern.rstrip("/")
+            anchored = "/" in pattern
+            pattern = pattern.lstrip("/")
+            if pattern:
+                self.rules.append((re.compile(translate_pattern(pattern) + r"\Z"), negate, dir_only, anchored))
+        self.has_negation = any(negate for _, negate, _, _ in self.rules)
+        # Regroupement des motifs par cible (nom ou chemin) et par type d'entrée (tous ou dossiers seulement)
+        self.combined = {}
+        if not self.has_negation:
+            for anchored in (False, True):
+                for dir_only in (False, True):
+                    parts = [regex.pattern for regex, _, only, anch in self.rules if anch == anchored and only == dir_only]
+                    self.combined[anchored, dir_only] = re.compile("|".join(f"(?:{part})" for part in parts)) if parts else None
+
+    #------------------------------------------------------------------------------------------------#
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def excluded(self, relative_path, name, is_dir):
+        """ Indiquer si une entrée est exclue (relative_path : chemin relatif à la racine, séparé par '/'). """
+        if not self.has_negation:
+            for (anchored, dir_only), regex in self.combined.items():
+                if regex is not None and (is_dir or not dir_only) and regex.match(relative_path if anchored else name):
+                    return True
+            return False
+        result = False
+        for regex, negate, dir_only, anchored in self.rules:
+            if (is_dir or not dir_only) and regex.match(relative_path if anchored else name):
+                result = not negate
+        return result
+
+#------------------------------------------------------------------------------------------------#
+
+class TreeWalker:
+    """ Parcours d'une arborescence avec os.scandir, selon des règles d'exclusion.
+
+    Le type des entrées est lu dans les DirEntry (sans stat supplémentaire sur la plupart des
+    systèmes). Les entrées exclues ne sont ni produites ni parcourues ; la profondeur peut être
+    limitée et le parcours peut rester sur le système de fichiers de la racine. Comme os.walk,
+    le parcours ne descend pas dans les liens symboliques vers des dossiers.
+
+    Attributes:
+    - root (str): Le répertoire racine.
+    - rules (ExcludeRules): Les motifs d'exclusion.
+    - max_depth (int): La profondeur maximale des entrées (1 : contenu direct de la racine), ou None.
+    - one_file_system (bool): Ne pas descendre dans les dossiers d'un autre système de fichiers.
+
+    Methods:
+    - walk(top, cancel_event): Générer (dossier, sous-dossiers, fichiers) sous forme de DirEntry.
+    - excluded(path, is_dir): Indiquer si une entrée de l'arborescence est exclue.
+    - may_descend(path, st_dev): Indiquer si le parcours peut descendre dans un dossier.
+    - options_key(): Obtenir une description des options (un index construit avec d'autres options est reconstruit).
+    """
+
+    def __init__(self, root, excludes=DEFAULT_EXCLUDES, max_depth=None, one_file_system=False):
+        self.root = os.path.abspath(root)
+        self.rules = ExcludeRules(excludes)
+        self.max_depth = max_depth
+        self.one_file_system = one_file_system
+        self.root_dev = None
+        if one_file_system:
+            try:
+                self.root_dev = os.stat(self.root).st_dev
+            except OSError:
+                pass
+
+    #------------------------------------------------------------------------------------------------#
+
+    def relative(self, path):
+        """ Obtenir le chemin relatif à la racine, séparé par '/'. """
+        relative = path[len(self.root):].lstrip(os.sep) if path.startswith(self.root) else os.path.relpath(path, self.root)
+        return relative.replace(os.sep, "/") if os.sep != "/" else relative
+
+    #------------------------------------------------------------------------------------------------#
+
+    def depth(self, path):
+        """ Obtenir la profondeur d'un chemin (0 pour la racine). """
+        relative = self.relative(path)
+        return relative.count("/") + 1 if relative and relative != "." else 0
+
+    #------------------------------------------------------------------------------------------------#
+
+    def excluded(self, path, is_dir):
+        """ Indiquer si une entrée de l'arborescence est exclue par les motifs ou par la profondeur. """
+        if self.max_depth is not None and self.depth(path) > self.max_depth:
+            return True
+        return bool(self.rules) and self.rules.excluded(self.relative(path), os.path.basename(path), is_dir)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def may_descend(self, path, st_dev=None):
+        """ Indiquer si le parcours peut descendre dans un dossier (profondeur, système de fichiers). """
+        if self.max_depth is not None and self.depth(path) >= self.max_depth:
+            return False
+        if self.root_dev is not None and st_dev is not None and st_dev != self.root_dev:
+            return False
+        return True
+
+    #------------------------------------------------------------------------------------------------#
+
+    def options_key(self):
+        """ Obtenir une description des options de parcours. """
+        return repr((self.rules.patterns, self.max_depth, self.one_file_system))
+
+    #------------------------------------------------------------------------------------------------#
+
+    def walk(self, top=None, cancel_event=None):
+        """
+        Parcourir l'arborescence à partir de top (la racine par défaut).
+
+        Returns:
+        generator: Des triplets (chemin du dossier, sous-dossiers, fichiers), les deux listes contenant des os.DirEntry.
+        """
+        top = os.path.abspath(top) if top else self.root
+        stack = [(top, self.depth(top))]
+        rules = self.rules
+        while stack:
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            directory, depth = stack.pop()
+            relative = self.relative(directory)
+            prefix = relative + "/" if relative and relative != "." else ""
+            dirs = []
+            files = []
+            start = time.perf_counter()
+            try:
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        try:
+                            is_dir = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if rules and rules.excluded(prefix + entry.name, entry.name, is_dir):
+                            continue
+                        (dirs if is_dir else files).append(entry)
+            except OSError:
+                continue
+            METRICS.record("walk.scandir", time.perf_counter() - start, directory)
+            METRICS.add("dirs_visited")
+            yield directory, dirs, files
+            if self.max_depth is not None and depth + 1 >= self.max_depth:
+                continue
+            for entry in reversed(dirs):
+                try:
+                    if entry.is_symlink():
+                        continue
+                    if self.root_dev is not None and entry.stat(follow_symlinks=False).st_dev != self.root_dev:
+                        continue
+                except OSError:
+                    continue
+                stack.append((entry.path, depth + 1))
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,211 @@
+import os
+import sys
+import select
+import struct
+import threading
+import ctypes
+import ctypes.util
+
+#------------------------------------------------------------------------------------------------#
+
+# Constantes de <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR | IN_DONT_FOLLOW
+EVENT_HEADER = struct.Struct("iIII")
+
+_libc = None
+
+#------------------------------------------------------------------------------------------------#
+
+def load_libc():
+    """ Charger la libc et vérifier qu'elle expose l'API inotify (Linux uniquement). """
+    global _libc
+    if _libc is None and sys.platform.startswith("linux"):
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            libc.inotify_init1
+            libc.inotify_add_watch
+            libc.inotify_rm_watch
+            _libc = libc
+        except (OSError, AttributeError):
+            _libc = False
+    return _libc or None
+
+#------------------------------------------------------------------------------------------------#
+
+class InotifyWatcher:
+    """ Surveillance inotify (Linux) appliquant les créations, suppressions, déplacements et écritures à l'index.
+
+    Chaque dossier suivi par l'index reçoit une surveillance. Les événements sont lus dans un thread
+    et appliqués directement à l'index par lots (une transaction par lecture), sans reparcourir
+    l'arborescence. En cas de débordement de la file d'événements du noyau, un rafraîchissement
+    incrémental de l'index est effectué.
+
+    Attributes:
+    - file_index (FileIndex): L'index à maintenir à jour.
+    - on_change (callable): Fonction appelée (depuis le thread de surveillance) après chaque modification.
+
+    Methods:
+    - is_available(): Indiquer si inotify est disponible sur ce système.
+    - start(): Démarrer la surveillance.
+    - stop(): Arrêter la surveillance.
+    """
+
+    def __init__(self, file_index, on_change=None):
+        self.file_index = file_index
+        self.on_change = on_change
+        self.fd = None
+        self.watches = {}
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    #------------------------------------------------------------------------------------------------#
+
+    @staticmethod
+    def is_available():
+        """ Indiquer si inotify est disponible sur ce système. """
+        return load_libc() is not None
+
+    #------------------------------------------------------------------------------------------------#
+
+    def start(self):
+        """ Démarrer la surveillance de tous les dossiers de l'index. """
+        libc = load_libc()
+        if libc is None:
+            raise OSError("inotify n'est pas disponible sur ce système")
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        self.fd = fd
+        for directory in self.file_index.directories():
+            self.add_watch(directory)
+        self.thread = threading.Thread(target=self.run, name="inotify-watcher", daemon=True)
+        self.thread.start()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def stop(self):
+        """ Arrêter la surveillance et libérer le descripteur inotify. """
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+        self.watches.clear()
+
+    #------------------------------------------------------------------------------------------------#
+
+    def add_watch(self, directory):
+        """ Ajouter une surveillance sur un dossier (ignorée si la limite du noyau est atteinte). """
+        wd = load_libc().inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+        if wd >= 0:
+            self.watches[wd] = directory
+
+    #------------------------------------------------------------------------------------------------#
+
+    def add_watch_tree(self, directory):
+        """ Surveiller un dossier et tous ses sous-dossiers. """
+        # Les dossiers exclus de l'index ne sont pas surveillés
+        for root, dirs, files in self.file_index.walker.walk(directory):
+            self.add_watch(root)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def remove_watch_tree(self, directory):
+        """ Retirer les surveillances d'un dossier et de ses sous-dossiers. """
+        prefix = os.path.join(directory, "")
+        for wd, path in list(self.watches.items()):
+            if path == directory or path.startswith(prefix):
+                load_libc().inotify_rm_watch(self.fd, wd)
+                del self.watches[wd]
+
+    #------------------------------------------------------------------------------------------------#
+
+    def run(self):
+        """ Boucle de lecture des événements inotify. """
+        while not self.stop_event.is_set():
+            ready, _, _ = select.select([self.fd], [], [], 0.5)
+            if not ready:
+                continue
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            except OSError:
+                break
+            try:
+                changed = self.handle_events(self.parse_events(data))
+            except Exception as e:
+                print(f"Erreur lors de la mise à jour de l'index: {e}")
+                continue
+            if changed and self.on_change:
+                self.on_change()
+
+    #------------------------------------------------------------------------------------------------#
+
+    @staticmethod
+    def parse_events(data):
+        """ Décoder une suite de structures inotify_event : (wd, mask, cookie, nom). """
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            yield wd, mask, cookie, name
+
+    #------------------------------------------------------------------------------------------------#
+
+    def handle_events(self, events):
+        """ Appliquer un lot d'événements à l'index, dans une seule transaction. Retourne True si l'index a été modifié. """
+        changed = False
+        file_index = self.file_index
+        with file_index.connect() as conn:
+            for wd, mask, cookie, name in events:
+                if mask & IN_Q_OVERFLOW:
+                    # Des événements ont été perdus : on se rabat sur le rafraîchissement par mtime
+                    conn.commit()
+                    file_index.refresh()
+                    changed = True
+                    continue
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                    continue
+                directory = self.watches.get(wd)
+                if directory is None or not name:
+                    continue
+                path = os.path.join(directory, name)
+                is_dir = bool(mask & IN_ISDIR)
+                if file_index.walker.excluded(path, is_dir):
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    file_index.add_path(path, is_dir, conn)
+                    if is_dir:
+                        self.add_watch_tree(path)
+                    changed = True
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    file_index.remove_path(path, conn)
+                    if is_dir:
+                        self.remove_watch_tree(path)
+                    changed = True
+                elif mask & IN_CLOSE_WRITE:
+                    # Fichier modifié sur place : seules sa taille et sa date changent
+                    file_index.update_stat(path, conn)
+                    changed = True
+            conn.commit()
+        return changed
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,100 @@
+import queue
+import threading
+
+#------------------------------------------------------------------------------------------------#
+
+class SearchWorker:
+    """ Exécution des recherches dans un thread de fond avec transmission des résultats par lots.
+
+    La fonction de recherche est un générateur exécuté hors du thread Tk. Ses résultats sont placés
+    dans une file puis insérés par lots dans l'interface via root.after, de sorte que les premiers
+    résultats s'affichent sans attendre la fin de la recherche. Soumettre une nouvelle recherche
+    annule celle en cours.
+
+    Attributes:
+    - root (tk.Tk): La fenêtre principale, utilisée pour planifier les mises à jour de l'interface.
+    - on_batch (callable): Fonction appelée dans le thread Tk avec chaque lot de résultats.
+    - on_done (callable): Fonction appelée dans le thread Tk lorsque la recherche est terminée.
+    - batch_size (int): Le nombre maximal de résultats insérés par mise à jour de l'interface.
+    - poll_interval (int): L'intervalle (ms) entre deux lectures de la file de résultats.
+
+    Methods:
+    - submit(search): Lancer une recherche en annulant la précédente.
+    - cancel(): Annuler la recherche en cours.
+    - is_running(): Indiquer si une recherche est en cours.
+    """
+
+    def __init__(self, root, on_batch, on_done=None, batch_size=200, poll_interval=30):
+        self.root = root
+        self.on_batch = on_batch
+        self.on_done = on_done
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.generation = 0
+        self.cancel_event = threading.Event()
+        self.results = queue.Queue()
+        self.thread = None
+
+    #------------------------------------------------------------------------------------------------#
+
+    def submit(self, search):
+        """ Lancer une recherche en annulant la précédente.
+
+        Parameters:
+        search (callable): Fonction recevant un threading.Event d'annulation et retournant un itérable de résultats.
+        """
+        self.cancel()
+        self.generation += 1
+        self.cancel_event = threading.Event()
+        self.results = queue.Queue()
+        self.thread = threading.Thread(target=self.run, args=(search, self.cancel_event, self.results), daemon=True)
+        self.thread.start()
+        self.root.after(self.poll_interval, self.drain, self.generation)
+
+    #------------------------------------------------------------------------------------------------#
+
+    def cancel(self):
+        """ Annuler la recherche en cours (ses résultats restants sont ignorés). """
+        self.cancel_event.set()
+        self.generation += 1
+
+    #------------------------------------------------------------------------------------------------#
+
+    def is_running(self):
+        """ Indiquer si une recherche est en cours. """
+        return self.thread is not None and self.thread.is_alive() and not self.cancel_event.is_set()
+
+    #------------------------------------------------------------------------------------------------#
+
+    @staticmethod
+    def run(search, cancel_event, results):
+        """ Exécuter la recherche dans le thread de fond. """
+        try:
+            for result in search(cancel_event):
+                if cancel_event.is_set():
+                    return
+                results.put(result)
+        except Exception as e:
+            print(f"Erreur lors de la recherche: {e}")
+
+    #------------------------------------------------------------------------------------------------#
+
+    def drain(self, generation):
+        """ Transmettre à l'interface un lot de résultats (exécuté dans le thread Tk). """
+        if generation != self.generation:
+            return
+        thread = self.thread
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self.on_batch(batch)
+        if thread.is_alive() or not self.results.empty():
+            self.root.after(self.poll_interval, self.drain, generation)
+        elif self.on_done:
+            self.on_done()
+
+#------------------------------------------------------------------------------------------------#
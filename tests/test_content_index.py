@@ -0,0 +1,57 @@
+from searching_tool.content_index import ContentIndex
+from searching_tool.engine import SearchEngine, SearchQuery
+
+#------------------------------------------------------------------------------------------------#
+
+def write_documents(root, documents):
+    """ Créer les fichiers texte {nom: contenu} dans root. """
+    root.mkdir()
+    for name, text in documents.items():
+        (root / name).write_text(text)
+
+#------------------------------------------------------------------------------------------------#
+
+def content_results(tmp_path, documents, search_term):
+    """ Rechercher un terme dans le contenu des documents et retourner les noms trouvés, triés. """
+    root = tmp_path / "racine"
+    write_documents(root, documents)
+    engine = SearchEngine(str(root), index_dir=str(tmp_path / "index"), max_workers=1)
+    try:
+        return sorted(result.name for result in engine.search(SearchQuery(search_term, "fichier", (".txt",))))
+    finally:
+        engine.close()
+
+#------------------------------------------------------------------------------------------------#
+
+def test_index_returns_candidates_by_words(tmp_path):
+    """ L'index retient les documents contenant les mots du terme, sans vérifier leur voisinage. """
+    root = tmp_path / "racine"
+    write_documents(root, {"voisins.txt": "hello report", "eloignes.txt": "the report was sent. hello there", "autre.txt": "rien"})
+    index = ContentIndex(str(root), str(tmp_path / "index"), max_workers=1)
+    index.update([str(path) for path in root.iterdir()])
+    assert index.search("hello report") == {str(root / "voisins.txt"), str(root / "eloignes.txt")}
+    assert index.search("port") == {str(root / "voisins.txt"), str(root / "eloignes.txt")}
+    assert index.search("!!!") is None
+
+#------------------------------------------------------------------------------------------------#
+
+def test_words_must_be_adjacent_and_in_order(tmp_path):
+    """ Les mots du terme doivent se suivre dans le document. """
+    documents = {"voisins.txt": "hello report", "eloignes.txt": "the report was sent. hello there"}
+    assert content_results(tmp_path, documents, "hello report") == ["voisins.txt"]
+
+#------------------------------------------------------------------------------------------------#
+
+def test_punctuation_is_part_of_the_term(tmp_path):
+    """ La ponctuation entre les mots du terme est vérifiée dans le contenu. """
+    documents = {"point.txt": "fichier a.b ici", "sans_point.txt": "ab xa bq"}
+    assert content_results(tmp_path, documents, "a.b") == ["point.txt"]
+
+#------------------------------------------------------------------------------------------------#
+
+def test_punctuation_only_term_reads_documents(tmp_path):
+    """ Un terme sans mot n'est pas cherché dans l'index : les documents sont lus directement. """
+    documents = {"exclamation.txt": "vraiment !!! oui", "calme.txt": "rien à signaler"}
+    assert content_results(tmp_path, documents, "!!!") == ["exclamation.txt"]
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,101 @@
+import os
+import json
+import struct
+from searching_tool import entry_store
+from searching_tool.entry_store import NEXT_SUFFIX, STORE_MAGIC, EntryStore
+
+#------------------------------------------------------------------------------------------------#
+
+def make_store(root, source=None):
+    """ Construire un petit magasin : deux fichiers à la racine, un dossier et un fichier dans celui-ci. """
+    root = os.path.abspath(root)
+    sub = os.path.join(root, "docs")
+    rows = [
+        (root, "Rapport.PDF", ".pdf", False, 1200, 10.0),
+        (root, "notes.txt", ".txt", False, 30, 20.0),
+        (root, "docs", "", True, 0, 30.0),
+        (sub, "été.txt", ".txt", False, 5, 40.0),
+    ]
+    return EntryStore.from_rows(root, rows, source)
+
+#------------------------------------------------------------------------------------------------#
+
+def test_save_and_load_round_trip(tmp_path):
+    """ Un magasin enregistré puis projeté en mémoire restitue ses entrées. """
+    store = make_store(tmp_path, source=[1, 2])
+    path = str(tmp_path / "entries.bin")
+    store.save(path)
+    loaded = EntryStore.load(path)
+    assert loaded is not None and loaded.mapping is not None
+    assert len(loaded) == 4
+    assert [loaded.path(i) for i in range(4)] == [store.path(i) for i in range(4)]
+    assert loaded.path(3) == os.path.join(str(tmp_path), "docs", "été.txt")
+    assert list(loaded.lower_names) == ["rapport.pdf", "notes.txt", "docs", "été.txt"]
+    assert list(loaded.sizes) == [1200, 30, 0, 5] and list(loaded.mtimes) == [10.0, 20.0, 30.0, 40.0]
+    assert loaded.is_dir(2) and not loaded.is_dir(0)
+    assert list(loaded.files_with_extension(".txt")) == [1, 3]
+    assert loaded.lower_names.find_all(".txt") == [1, 3]
+    assert loaded.lower_names.find_all("été") == [3]
+    assert loaded.source == [1, 2]
+
+#------------------------------------------------------------------------------------------------#
+
+def test_entry_refs_build_paths_on_demand(tmp_path):
+    """ Une référence donne le chemin et la profondeur de son entrée. """
+    store = make_store(tmp_path)
+    ref = store.ref(3)
+    assert os.fspath(ref) == str(ref) == store.path(3)
+    assert ref.depth() == 1 and store.ref(0).depth() == 0
+    refs = [ref, store.ref(1), store.ref(0)]
+    assert [os.fspath(r) for r in sorted(refs)] == sorted(os.fspath(r) for r in refs)
+
+#------------------------------------------------------------------------------------------------#
+
+def test_other_version_is_rejected(tmp_path, monkeypatch):
+    """ Un fichier d'une autre version, tronqué ou absent n'est pas ouvert. """
+    path = str(tmp_path / "entries.bin")
+    assert EntryStore.load(path) is None
+    monkeypatch.setattr(entry_store, "STORE_VERSION", entry_store.STORE_VERSION - 1)
+    make_store(tmp_path).save(path)
+    monkeypatch.undo()
+    assert EntryStore.load(path) is None
+
+    with open(path, "wb") as f:
+        f.write(STORE_MAGIC + struct.pack("<I", 100) + b"{")
+    assert EntryStore.load(path) is None
+
+    with open(path, "rb+") as f:
+        f.write(b"AUTREFMT")
+    assert EntryStore.load(path) is None
+
+#------------------------------------------------------------------------------------------------#
+
+def test_save_beside_a_file_that_cannot_be_replaced(tmp_path, monkeypatch):
+    """ Faute de pouvoir remplacer le fichier (projeté sous Windows), le magasin est enregistré à côté. """
+    path = str(tmp_path / "entries.bin")
+    make_store(tmp_path, source=[1, 1]).save(path)
+    old = EntryStore.load(path)
+
+    replace = os.replace
+    def locked_replace(src, dst):
+        if dst == path:
+            raise PermissionError("fichier projeté")
+        replace(src, dst)
+    monkeypatch.setattr(os, "replace", locked_replace)
+
+    make_store(tmp_path, source=[2, 2]).save(path)
+    assert os.path.exists(path + NEXT_SUFFIX) and not os.path.exists(path + ".tmp")
+    # Tant que le fichier reste verrouillé, le plus récent des deux magasins est ouvert
+    assert EntryStore.load(path).source == [2, 2]
+    assert old.source == [1, 1]
+
+    # Une fois le fichier libéré, le magasin en attente prend sa place
+    monkeypatch.undo()
+    assert EntryStore.load(path).source == [2, 2]
+    assert not os.path.exists(path + NEXT_SUFFIX)
+    with open(path, "rb") as f:
+        f.read(len(STORE_MAGIC))
+        header = json.loads(f.read(struct.unpack("<I", f.read(4))[0]))
+    assert header["source"] == [2, 2]
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,95 @@
+import os
+from searching_tool.engine import SearchQuery, SearchResult
+from searching_tool.multi_root import MultiRootEngine, MultiRootResults, is_within, normalize_roots
+
+#------------------------------------------------------------------------------------------------#
+
+class FakeResults:
+    """ Résultats préparés d'un répertoire, produits dans l'ordre donné. """
+
+    def __init__(self, results):
+        self.results = results
+        self.total = None
+        self.on_names_done = None
+
+    def run(self, cancel_event):
+        for result in self.results:
+            yield result
+        if self.on_names_done is not None:
+            self.on_names_done()
+        self.total = len(self.results)
+
+#------------------------------------------------------------------------------------------------#
+
+def fake_engine(tmp_path, results_by_root):
+    """ Moteur sur plusieurs répertoires dont chaque moteur produit les résultats préparés. """
+    roots = []
+    for name, results in results_by_root.items():
+        root = tmp_path / name
+        root.mkdir()
+        roots.append(str(root))
+    engine = MultiRootEngine(roots, index_dir=str(tmp_path / "index"), watch=False)
+    for root, results in zip(roots, results_by_root.values()):
+        engine.engines[root].search = lambda query, results=results: FakeResults(results)
+    return engine
+
+#------------------------------------------------------------------------------------------------#
+
+def test_normalize_roots_drops_duplicates_and_nested_roots(tmp_path):
+    """ Un répertoire inclus dans un autre est ignoré ; un parent ajouté remplace ceux qu'il contient. """
+    a, b = str(tmp_path / "a"), str(tmp_path / "b")
+    assert normalize_roots([a, a + os.sep, os.path.join(a, "sous"), b]) == [a, b]
+    assert normalize_roots([os.path.join(a, "x"), b, os.path.join(a, "y"), a]) == [b, a]
+    assert is_within(os.path.join(a, "x"), a) and is_within(a, a)
+    assert not is_within(str(tmp_path / "ab"), a)
+
+#------------------------------------------------------------------------------------------------#
+
+def test_merge_keeps_ranking_order(tmp_path):
+    """ Les résultats classés de chaque répertoire sont fusionnés en un seul classement. """
+    engine = fake_engine(tmp_path, {
+        "a": [SearchResult("a1", "/a/a1", 0, 90), SearchResult("a2", "/a/a2", 0, 50), SearchResult("a3", "/a/a3", 0, 10)],
+        "b": [SearchResult("b1", "/b/b1", 0, 80), SearchResult("b2", "/b/b2", 0, 60)],
+    })
+    try:
+        results = engine.search(SearchQuery("x"))
+        assert isinstance(results, MultiRootResults)
+        assert [result.name for result in results] == ["a1", "b1", "b2", "a2", "a3"]
+        assert results.total == 5 and not results.failures
+    finally:
+        engine.close()
+
+#------------------------------------------------------------------------------------------------#
+
+def test_merge_deduplicates_and_respects_limit(tmp_path):
+    """ Un même chemin reçu de deux répertoires n'est produit qu'une fois ; la limite porte sur les résultats distincts. """
+    engine = fake_engine(tmp_path, {
+        "a": [SearchResult("commun", "/partage/commun", 0, 70), SearchResult("a", "/a/a", 0, 20)],
+        "b": [SearchResult("commun", "/partage/commun", 0, 70), SearchResult("b", "/b/b", 0, 30)],
+    })
+    try:
+        assert [result.path for result in engine.search(SearchQuery("x"))] == ["/partage/commun", "/b/b", "/a/a"]
+        assert [result.path for result in engine.search(SearchQuery("x", limit=2))] == ["/partage/commun", "/b/b"]
+    finally:
+        engine.close()
+
+#------------------------------------------------------------------------------------------------#
+
+def test_search_in_real_roots(tmp_path):
+    """ Recherche dans deux répertoires réels : chaque correspondance est produite une fois. """
+    roots = [tmp_path / "a", tmp_path / "b"]
+    for root in roots:
+        (root / "sous").mkdir(parents=True)
+        (root / "rapport.txt").write_text("x")
+        (root / "sous" / "rapport final.txt").write_text("x")
+    engine = MultiRootEngine([str(root) for root in roots] + [str(roots[0] / "sous")], index_dir=str(tmp_path / "index"), watch=False)
+    try:
+        assert engine.search_directories == [str(root) for root in roots]
+        results = list(engine.search(SearchQuery("rapport", "fichier", (".txt",))))
+        assert sorted(result.path for result in results) == sorted(str(root / name) for root in roots for name in ("rapport.txt", os.path.join("sous", "rapport final.txt")))
+        scores = [result.score for result in results]
+        assert scores == sorted(scores, reverse=True)
+    finally:
+        engine.close()
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,36 @@
+from searching_tool.engine import SearchEngine, SearchQuery
+from searching_tool.query_language import parse_query
+
+#------------------------------------------------------------------------------------------------#
+
+def test_brackets_alone_stay_plain_text():
+    """ Un terme avec des crochets seuls n'est pas un motif glob : la recherche reste simple. """
+    parsed = parse_query("[DRAFT]")
+    assert parsed.is_plain()
+    assert parsed.text == "[draft]"
+
+#------------------------------------------------------------------------------------------------#
+
+def test_glob_requires_wildcard():
+    """ Un terme contenant * ou ? est un motif glob sur le nom entier. """
+    parsed = parse_query("[DRAFT]*.txt")
+    assert not parsed.is_plain()
+    assert parsed.patterns[0]("D plan.txt")
+    assert not parsed.patterns[0]("[DRAFT] plan.txt")
+
+#------------------------------------------------------------------------------------------------#
+
+def test_search_finds_name_with_brackets(tmp_path):
+    """ La recherche [draft] trouve « [DRAFT] plan.txt » (sous-chaîne du nom, casse ignorée). """
+    root = tmp_path / "racine"
+    root.mkdir()
+    (root / "[DRAFT] plan.txt").write_text("brouillon")
+    (root / "plan.txt").write_text("version finale")
+    engine = SearchEngine(str(root), index_dir=str(tmp_path / "index"))
+    try:
+        results = list(engine.search(SearchQuery("[draft]")))
+    finally:
+        engine.close()
+    assert [result.name for result in results] == ["[DRAFT] plan.txt"]
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,49 @@
+import io
+from searching_tool.text_scan import compile_term, find_first, iter_chunk_matches, iter_matches
+
+#------------------------------------------------------------------------------------------------#
+
+def chunk_matches(data, search_term, chunk_size):
+    """ Rechercher un terme bloc par bloc dans des octets et retourner les positions trouvées. """
+    pattern, max_length = compile_term(search_term)
+    return list(iter_chunk_matches(io.BytesIO(data), pattern, max_length - 1, chunk_size))
+
+#------------------------------------------------------------------------------------------------#
+
+def test_match_across_chunk_boundary():
+    """ Une occurrence à cheval sur deux blocs est trouvée grâce au chevauchement. """
+    data = b"xxxxrapportyyyy"
+    for chunk_size in range(1, len(data) + 1):
+        assert chunk_matches(data, "rapport", chunk_size) == [4]
+
+#------------------------------------------------------------------------------------------------#
+
+def test_overlap_does_not_repeat_matches():
+    """ Une occurrence lue dans le chevauchement de deux blocs n'est signalée qu'une fois. """
+    data = b"abab-abab-abab"
+    assert chunk_matches(data, "abab", 3) == [0, 5, 10]
+    # Occurrences qui se recouvrent : comme finditer, la recherche reprend après la précédente
+    assert chunk_matches(b"aaaaa", "aa", 2) == [0, 2]
+
+#------------------------------------------------------------------------------------------------#
+
+def test_non_ascii_term_split_between_chunks():
+    """ Un caractère non ASCII coupé entre deux blocs est trouvé, sans tenir compte de la casse. """
+    data = "xx ÉTÉ xx".encode("utf-8")
+    for chunk_size in range(1, len(data) + 1):
+        assert chunk_matches(data, "été", chunk_size) == [3]
+
+#------------------------------------------------------------------------------------------------#
+
+def test_file_scan(tmp_path):
+    """ Les occurrences d'un fichier sont trouvées en projection mémoire ; un fichier vide n'en a aucune. """
+    path = tmp_path / "texte.txt"
+    path.write_bytes(b"Rapport annuel, rapport final")
+    assert list(iter_matches(str(path), "RAPPORT")) == [0, 16]
+    assert find_first(str(path), "final") == 24
+    assert find_first(str(path), "absent") is None
+    empty = tmp_path / "vide.txt"
+    empty.write_bytes(b"")
+    assert find_first(str(empty), "rapport") is None
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,48 @@
+from searching_tool.trigram import TrigramIndex, trigrams
+
+#------------------------------------------------------------------------------------------------#
+
+NAMES = ["rapport annuel.pdf", "rapport.txt", "apport.doc", "port.txt", "passeport.png", "notes.txt", "ab.txt"]
+
+#------------------------------------------------------------------------------------------------#
+
+def brute_force(term):
+    """ Identifiants des noms contenant le terme, par parcours complet. """
+    return [name_id for name_id, name in enumerate(NAMES) if term in name]
+
+#------------------------------------------------------------------------------------------------#
+
+def test_trigrams():
+    """ Les trigrammes sont les sous-chaînes de 3 caractères, sans doublon. """
+    assert trigrams("aaaa") == {"aaa"}
+    assert trigrams("port") == {"por", "ort"}
+    assert trigrams("ab") == set()
+
+#------------------------------------------------------------------------------------------------#
+
+def test_search_intersects_postings():
+    """ Un nom n'est retenu que s'il contient tous les trigrammes du terme. """
+    index = TrigramIndex(NAMES)
+    assert index.search("rapport") == [0, 1]
+    assert index.search("port") == [0, 1, 2, 3, 4]
+    assert index.search("rapport.t") == [1]
+    for term in ("port", "ppor", "rt.", ".txt", "eport", "zzz"):
+        assert index.search(term) == brute_force(term)
+
+#------------------------------------------------------------------------------------------------#
+
+def test_candidates_are_confirmed():
+    """ Un nom contenant tous les trigrammes sans contenir le terme est écarté. """
+    index = TrigramIndex(["abcxbcd", "abcd"])
+    # "abcxbcd" contient "abc" et "bcd" mais pas "abcd"
+    assert index.search("abcd") == [1]
+
+#------------------------------------------------------------------------------------------------#
+
+def test_short_and_unknown_terms():
+    """ Un terme de moins de 3 caractères est cherché directement ; un trigramme inconnu ne donne rien. """
+    index = TrigramIndex(NAMES)
+    assert index.search("ab") == brute_force("ab")
+    assert index.search("xyz") == []
+
+#------------------------------------------------------------------------------------------------#
@@ -0,0 +1,69 @@
+from searching_tool.walker import ExcludeRules, TreeWalker
+
+#------------------------------------------------------------------------------------------------#
+
+def walked(root, excludes):
+    """ Parcourir root avec les motifs donnés et retourner les chemins relatifs des entrées, triés. """
+    walker = TreeWalker(str(root), excludes=excludes)
+    entries = []
+    for directory, dirs, files in walker.walk():
+        entries.extend(walker.relative(entry.path) for entry in dirs + files)
+    return sorted(entries)
+
+#------------------------------------------------------------------------------------------------#
+
+def test_dir_only_pattern():
+    """ Un '/' final ne s'applique qu'aux dossiers. """
+    rules = ExcludeRules(["build/"])
+    assert rules.excluded("build", "build", True)
+    assert rules.excluded("src/build", "build", True)
+    assert not rules.excluded("build", "build", False)
+
+#------------------------------------------------------------------------------------------------#
+
+def test_negation_reincludes_entries():
+    """ Un '!' ré-inclut les entrées ; le dernier motif qui s'applique l'emporte. """
+    rules = ExcludeRules(["*.log", "!important.log"])
+    assert rules.excluded("a/debug.log", "debug.log", False)
+    assert not rules.excluded("a/important.log", "important.log", False)
+    rules = ExcludeRules(["!important.log", "*.log"])
+    assert rules.excluded("a/important.log", "important.log", False)
+
+#------------------------------------------------------------------------------------------------#
+
+def test_double_star_patterns():
+    """ '**/' couvre zéro ou plusieurs dossiers, '**' final tout le contenu d'un dossier. """
+    rules = ExcludeRules(["docs/**/brouillon.txt", "tmp/**"])
+    assert rules.excluded("docs/brouillon.txt", "brouillon.txt", False)
+    assert rules.excluded("docs/a/b/brouillon.txt", "brouillon.txt", False)
+    assert not rules.excluded("autres/docs/brouillon.txt", "brouillon.txt", False)
+    assert rules.excluded("tmp/a/b.txt", "b.txt", False)
+    assert not rules.excluded("tmp", "tmp", True)
+
+#------------------------------------------------------------------------------------------------#
+
+def test_anchored_and_name_patterns():
+    """ Un motif contenant '/' porte sur le chemin depuis la racine, les autres sur le nom à toute profondeur ;
+    les commentaires et lignes vides sont ignorés. """
+    rules = ExcludeRules(["/secret", "*.tmp", "# commentaire", ""])
+    assert rules.excluded("secret", "secret", True)
+    assert not rules.excluded("a/secret", "secret", True)
+    assert rules.excluded("a/b/c.tmp", "c.tmp", False)
+    assert not ExcludeRules(["# commentaire", "", "   "])
+
+    # Les motifs regroupés (sans '!') et évalués un à un donnent les mêmes décisions
+    grouped = ExcludeRules(["build/", "*.tmp", "docs/**/x"])
+    ordered = ExcludeRules(["build/", "*.tmp", "docs/**/x", "!jamais"])
+    for entry in [("build", "build", True), ("build", "build", False), ("a/c.tmp", "c.tmp", False), ("docs/y/x", "x", False), ("x", "x", False)]:
+        assert grouped.excluded(*entry) == ordered.excluded(*entry)
+
+#------------------------------------------------------------------------------------------------#
+
+def test_walk_skips_excluded_directories(tmp_path):
+    """ Le contenu d'un dossier exclu n'est pas parcouru, sauf ré-inclusion d'un fichier hors de ce dossier. """
+    for path in ["src/main.py", "src/build/out.o", "build/app", "notes.log", "keep.log"]:
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text("x")
+    assert walked(tmp_path, ["build/", "*.log", "!keep.log"]) == ["keep.log", "src", "src/main.py"]
+
+#------------------------------------------------------------------------------------------------#